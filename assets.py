@@ -0,0 +1,249 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Directory holding the web front end, next to this module
+WEB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web")
+
+# Module holding the front end embedded as strings, generated by `python assets.py --embed`
+EMBED_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "embedded_assets.py")
+
+# Seconds between checks of the web directory for edited files
+RELOAD_INTERVAL = 1.0
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+class Asset:
+    """One file held in memory with its encoded variants and validators"""
+
+    __slots__ = ("content_type", "bodies", "etag", "last_modified", "mtime")
+
+    def __init__(self, path, content, mtime):
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if self.content_type.startswith("text/") or self.content_type == "application/javascript":
+            self.content_type += "; charset=utf-8"
+        self.mtime = mtime
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+
+        # Encoded variants, kept only when they are actually smaller
+        self.bodies = {"identity": content}
+        if self.content_type.startswith(COMPRESSIBLE_TYPES):
+            variants = [("gzip", gzip.compress(content, 9))]
+            if brotli is not None:
+                variants.append(("br", brotli.compress(content)))
+            for coding, body in variants:
+                if len(body) < len(content):
+                    self.bodies[coding] = body
+
+    def body(self, accept_encoding):
+        """Return (content coding, body), preferring the smallest acceptable variant"""
+        for coding in ("br", "gzip"):
+            if coding in self.bodies and accepts_encoding(accept_encoding, coding):
+                return coding, self.bodies[coding]
+        return "identity", self.bodies["identity"]
+
+    def not_modified(self, if_none_match, if_modified_since):
+        """True if the request's validators say the client copy is current"""
+        if if_none_match:
+            return etag_matches(if_none_match, self.etag)
+        return if_modified_since == self.last_modified
+
+
+def accepts_encoding(accept_encoding, coding):
+    """True if an Accept-Encoding header value allows the given content coding"""
+    for entry in (accept_encoding or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        if name.strip() in (coding, "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header value matches etag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class AssetStore:
+    """The web front end served from memory
+
+    Files under `directory` are read once, on first use, together with their
+    compressed variants and ETags, and are served under `prefix`. A background
+    thread rescans the directory every RELOAD_INTERVAL seconds and swaps in
+    files whose size or mtime changed, so edits show up without a restart
+    while requests themselves never touch the disk.
+    """
+
+    def __init__(self, directory=WEB_DIR, prefix="/web", reload_interval=RELOAD_INTERVAL):
+        self.directory = directory
+        self.prefix = prefix
+        self.reload_interval = reload_interval
+        self.lock = threading.Lock()
+        self.assets = None
+        self.stats = {}
+        self.watcher = None
+
+    def load_embedded(self, files):
+        """Serve {relative path: text} from memory instead of the directory
+
+        Nothing is read from or written to disk and the watcher is not started.
+        """
+        mtime = time.time()
+        assets = {
+            f"{self.prefix}/{relative}": Asset(relative, text.encode("utf-8"), mtime)
+            for relative, text in files.items()
+        }
+        with self.lock:
+            self.assets = assets
+
+    def scan(self):
+        """Return {url path: (file path, size, mtime)} for the directory tree"""
+        found = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                # Skip hidden files, including materialize()'s temp files
+                if name.startswith("."):
+                    continue
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                relative = os.path.relpath(file_path, self.directory).replace(os.sep, "/")
+                found[f"{self.prefix}/{relative}"] = (file_path, stat.st_size, stat.st_mtime)
+        return found
+
+    def reload(self):
+        """Load new and changed files and forget deleted ones"""
+        found = self.scan()
+        assets = dict(self.assets or {})
+        for url_path, (file_path, size, mtime) in found.items():
+            if self.stats.get(url_path) == (size, mtime) and url_path in assets:
+                continue
+            try:
+                with open(file_path, "rb") as f:
+                    content = f.read()
+            except OSError:
+                continue
+            assets[url_path] = Asset(file_path, content, mtime)
+        for url_path in set(assets) - set(found):
+            del assets[url_path]
+        self.stats = {url_path: entry[1:] for url_path, entry in found.items()}
+        self.assets = assets
+
+    def ensure_loaded(self):
+        if self.assets is not None:
+            return
+        with self.lock:
+            if self.assets is None:
+                self.reload()
+                if self.reload_interval:
+                    self.watcher = threading.Thread(target=self.watch, daemon=True)
+                    self.watcher.start()
+
+    def watch(self):
+        while True:
+            time.sleep(self.reload_interval)
+            with self.lock:
+                self.reload()
+
+    def lookup(self, path):
+        """Return the Asset for a request path, or None"""
+        self.ensure_loaded()
+        if path == "/":
+            path = f"{self.prefix}/index.html"
+        elif not path.startswith(f"{self.prefix}/"):
+            path = f"{self.prefix}{path}"
+        return self.assets.get(path)
+
+
+def write_atomic(path, content):
+    """Replace path with content so readers see either the old or the new file"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        # mkstemp creates the file owner-only; match a normally created file
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def file_digest(path):
+    """Return the SHA-256 of a file, or None if it cannot be read"""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).digest()
+    except OSError:
+        return None
+
+
+def materialize(files, directory=WEB_DIR):
+    """Write {relative path: text} under directory, skipping files already identical
+
+    Changed files are replaced atomically (temp file plus rename), so a server
+    reading them never sees a partial write. Returns the paths written.
+    """
+    written = []
+    for relative, text in files.items():
+        content = text.encode("utf-8")
+        path = os.path.join(directory, *relative.split("/"))
+        if file_digest(path) == hashlib.sha256(content).digest():
+            continue
+        write_atomic(path, content)
+        written.append(path)
+    return written
+
+
+def embed(directory=WEB_DIR, module_path=EMBED_MODULE):
+    """Regenerate the embedded assets module from the files under directory"""
+    lines = [
+        '"""Front end embedded as strings; generated by `python assets.py --embed`, do not edit"""',
+        "",
+        "EMBEDDED_ASSETS = {",
+    ]
+    entries = []
+    for root, _, files in sorted(os.walk(directory)):
+        for name in sorted(files):
+            if name.startswith("."):
+                continue
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            if '"""' in text or "\\" in text or text.endswith('"'):
+                literal = repr(text)
+            else:
+                literal = f'"""{text}"""'
+            entries.append(f"    {relative!r}: {literal}")
+    lines.append(",\n".join(entries))
+    lines.append("}")
+    with open(module_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--embed"]:
+        embed()
+    else:
+        sys.exit("usage: python assets.py --embed")
@@ -0,0 +1,104 @@
+"""Count Tk calls per second made by the analog clocks
+
+Compares the old immediate-mode drawing (delete("all") and recreate every item
+each tick) against the retained-mode ClockFace for 5, 50 and 500 clocks. The
+canvas and label are recording stand-ins, so no display is needed and the
+numbers are exact call counts rather than timings.
+
+    python benchmarks/bench_clock_faces.py
+"""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widgets import ClockFace
+
+TICKS_PER_SECOND = 10
+SIMULATED_SECONDS = 60
+
+
+class RecordingWidget:
+    """Stand-in for tk.Canvas / tk.Label that counts every Tk call"""
+
+    def __init__(self):
+        self.calls = 0
+        self.next_id = 0
+
+    def _create(self, *args, **kwargs):
+        self.calls += 1
+        self.next_id += 1
+        return self.next_id
+
+    create_oval = create_line = _create
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+
+    delete = coords = config = _call
+
+
+def legacy_draw(canvas, label, hour, minute, second):
+    """The per-tick drawing ClockApp.draw_clock_faces used to do"""
+    canvas.delete("all")
+    cx, cy = 50, 50
+    radius = 45
+    canvas.create_oval(cx - radius, cy - radius, cx + radius, cy + radius)
+    canvas.create_oval(cx - radius + 10, cy - radius + 10, cx + radius - 10, cy + radius - 10)
+    for i in range(12):
+        angle = math.radians(i * 30)
+        canvas.create_line(
+            cx + (radius - 5) * math.cos(angle), cy - (radius - 5) * math.sin(angle),
+            cx + (radius - 15) * math.cos(angle), cy - (radius - 15) * math.sin(angle)
+        )
+    hour_angle = math.radians((hour % 12 + minute / 60) * 30)
+    canvas.create_line(cx, cy, cx + 25 * math.cos(hour_angle), cy - 25 * math.sin(hour_angle))
+    minute_angle = math.radians(minute * 6)
+    canvas.create_line(cx, cy, cx + 35 * math.cos(minute_angle), cy - 35 * math.sin(minute_angle))
+    second_angle = math.radians(second * 6)
+    canvas.create_line(cx, cy, cx + 40 * math.cos(second_angle), cy - 40 * math.sin(second_angle))
+    canvas.create_oval(cx - 3, cy - 3, cx + 3, cy + 3)
+    label.config(text=f"{hour:02d}:{minute:02d}:{second:02d}")
+
+
+def simulated_ticks():
+    """Yield (hour, minute, second) for every 100 ms tick of the simulated run"""
+    for tick in range(SIMULATED_SECONDS * TICKS_PER_SECOND):
+        elapsed = 12 * 3600 + 59 * 60 + 30 + tick // TICKS_PER_SECOND
+        yield elapsed // 3600 % 24, elapsed // 60 % 60, elapsed % 60
+
+
+def run_legacy(clocks):
+    widgets = [(RecordingWidget(), RecordingWidget()) for _ in range(clocks)]
+    for hour, minute, second in simulated_ticks():
+        for canvas, label in widgets:
+            legacy_draw(canvas, label, hour, minute, second)
+    return sum(canvas.calls + label.calls for canvas, label in widgets)
+
+
+def run_retained(clocks):
+    widgets = []
+    for _ in range(clocks):
+        canvas, label = RecordingWidget(), RecordingWidget()
+        face = ClockFace(canvas, "#000", "#000", "#000", "#000")
+        canvas.calls = 0  # the one-off dial build is not a per-second cost
+        widgets.append((face, canvas, label))
+    for hour, minute, second in simulated_ticks():
+        for face, canvas, label in widgets:
+            if face.set_time(hour, minute, second):
+                label.config(text=f"{hour:02d}:{minute:02d}:{second:02d}")
+    return sum(canvas.calls + label.calls for face, canvas, label in widgets)
+
+
+def main():
+    print(f"Tk calls per second at {TICKS_PER_SECOND} ticks/s over {SIMULATED_SECONDS} s")
+    print(f"{'clocks':>8} {'before':>12} {'after':>12} {'reduction':>10}")
+    for clocks in (5, 50, 500):
+        before = run_legacy(clocks) / SIMULATED_SECONDS
+        after = run_retained(clocks) / SIMULATED_SECONDS
+        print(f"{clocks:>8} {before:>12.0f} {after:>12.0f} {before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
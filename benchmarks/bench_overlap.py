@@ -0,0 +1,78 @@
+"""Time to find overlapping working hours across many cities
+
+For N synthetic cities in random zones (all of pytz's common zones, so DST
+rules of both hemispheres and half-hour offsets are in the mix) searches a
+quarter for overlaps with TimeDataAPI.find_overlaps: everyone on 09:00-17:00
+Monday to Friday, and every city on its own random hours, each needing every
+city or a quarter of them. Times are the best of a few runs with the offset
+tables already compiled. The budget applies to 200 cities on their own hours
+with a quorum of 50, which finds thousands of overlaps each naming dozens of
+cities; requiring every city of a random worldwide set finds none.
+
+    python benchmarks/bench_overlap.py [--cities 50 200 1000] [--days 91]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cities import CityRegistry  # noqa: E402
+from overlap import DAY, WorkingHours  # noqa: E402
+from server import TimeDataAPI  # noqa: E402
+from tztables import year_start  # noqa: E402
+
+BUDGET_MS = 100
+BUDGET_CITIES = 200
+
+
+def per_call_ms(function, repeat=5):
+    """Best of `repeat` single calls, in milliseconds"""
+    return min(timeit.repeat(function, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--days", type=int, default=91)
+    args = parser.parse_args()
+
+    zones = [zone for zone in pytz.common_timezones if "/" in zone]
+    start = year_start(2026)
+    stop = start + args.days * DAY
+    print(f"{args.days} days from 2026-01-01, {len(zones)} zones to pick from\n")
+    print(f"{'cities':>7} {'hours':>8} {'quorum':>7} {'overlaps':>9} {'ms':>8}")
+    over = False
+    for count in args.cities:
+        rng = random.Random(count)
+        registry = CityRegistry()
+        for i in range(count):
+            registry.add(f"City {i}", zones[rng.randrange(len(zones))])
+        time_api = TimeDataAPI(registry)
+        shared = {city: WorkingHours() for city in registry}
+        own = {city: WorkingHours(rng.randrange(0, DAY, 1800), rng.randrange(0, DAY, 1800)) for city in registry}
+        # Compile the tables outside the timings
+        time_api.find_overlaps(shared, start, stop)
+
+        for label, hours in (("shared", shared), ("own", own)):
+            for quorum in (None, count // 4):
+                overlaps = time_api.find_overlaps(hours, start, stop, quorum)
+                ms = per_call_ms(lambda: time_api.find_overlaps(hours, start, stop, quorum))
+                print(f"{count:>7} {label:>8} {quorum or 'all':>7} {len(overlaps):>9} {ms:>8.1f}")
+                if count == BUDGET_CITIES and label == "own" and quorum:
+                    budget_ms, budget_overlaps = ms, len(overlaps)
+
+    if BUDGET_CITIES in args.cities:
+        over = budget_ms > BUDGET_MS
+        print(f"\n{BUDGET_CITIES} cities on their own hours, quorum {BUDGET_CITIES // 4}: "
+              f"{budget_overlaps} overlaps in {budget_ms:.1f} ms "
+              f"(budget {BUDGET_MS} ms) {'over' if over else 'ok'}")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Requests/sec scaling of /api/time-data with the number of server processes
+
+For each process count, starts a prefork.Supervisor in a child process and
+drives it from several client processes (a single Python client would be
+GIL-bound itself), each keeping HTTP/1.1 connections busy for --duration
+seconds. Prints requests/sec, the speedup over one process and the
+per-process efficiency; near-linear scaling shows as efficiency close to
+100% until the cores run out. Clients and servers share the machine, so on
+a small host leave cores for the clients or compare at equal client load.
+
+    python benchmarks/bench_prefork.py [--processes 1 2 4] [--clients 64] [--duration 5] [--reuse-port]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest import client, percentile  # noqa: E402
+
+
+def run_supervisor(processes, reuse_port, port_queue):
+    import server
+    from prefork import Supervisor
+
+    class QuietHandler(server.AppHandler):
+        def log_message(self, format, *args):
+            pass
+
+    # Keep the supervisor's startup line out of the results table
+    sys.stdout = open(os.devnull, "w")
+    supervisor = Supervisor(host="127.0.0.1", port=0, processes=processes,
+                            handler=QuietHandler, reuse_port=reuse_port)
+    port_queue.put(supervisor.port)
+    supervisor.run()
+
+
+def run_clients(port, connections, duration, results):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client, args=("127.0.0.1", port, deadline, latencies, errors))
+        for _ in range(connections)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put((latencies, len(errors)))
+
+
+def measure(port, clients, client_processes, duration):
+    results = multiprocessing.Queue()
+    per_process = [clients // client_processes + (i < clients % client_processes) for i in range(client_processes)]
+    workers = [
+        multiprocessing.Process(target=run_clients, args=(port, connections, duration, results))
+        for connections in per_process if connections
+    ]
+    for worker in workers:
+        worker.start()
+    latencies, errors = [], 0
+    for _ in workers:
+        worker_latencies, worker_errors = results.get()
+        latencies.extend(worker_latencies)
+        errors += worker_errors
+    for worker in workers:
+        worker.join()
+    latencies.sort()
+    return len(latencies) / duration, percentile(latencies, 0.5), percentile(latencies, 0.99), errors
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    default_processes = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1))) or [1]
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, nargs="+", default=default_processes)
+    parser.add_argument("--clients", type=int, default=64, help="concurrent connections")
+    parser.add_argument("--client-processes", type=int, default=cpus)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per process count")
+    parser.add_argument("--reuse-port", action="store_true", help="one SO_REUSEPORT socket per process")
+    args = parser.parse_args()
+
+    print(f"GET /api/time-data, {args.clients} connections from {args.client_processes} "
+          f"client processes, {cpus} CPUs")
+    print(f"{'processes':>9} {'req/s':>10} {'speedup':>8} {'per proc':>9} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    baseline = None
+    for processes in args.processes:
+        port_queue = multiprocessing.Queue()
+        supervisor = multiprocessing.Process(
+            target=run_supervisor, args=(processes, args.reuse_port, port_queue), daemon=True
+        )
+        supervisor.start()
+        port = port_queue.get(timeout=10)
+        # Let every process come up before measuring
+        time.sleep(0.5)
+        try:
+            rps, p50, p99, errors = measure(port, args.clients, args.client_processes, args.duration)
+        finally:
+            supervisor.terminate()
+            supervisor.join()
+
+        baseline = baseline or rps / processes
+        speedup = rps / baseline
+        print(f"{processes:>9} {rps:>10.0f} {speedup:>7.2f}x {speedup / processes:>8.0%} "
+              f"{p50 * 1e3:>8.2f} {p99 * 1e3:>8.2f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
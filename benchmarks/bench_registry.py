@@ -0,0 +1,75 @@
+"""Memory and lookup cost of the city registry against plain dicts
+
+Builds N synthetic cities (real zone names, random positions) both as a
+cities.CityRegistry and as the {city: zone} plus {city: [lon, lat, offset]}
+dicts the registry replaced, and reports traced bytes per city (the
+registry's columns alone and in full, with its names and their index) and
+the cost of a lookup by name.
+
+    python benchmarks/bench_registry.py [--cities 1000 10000 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cities import CityRegistry, default_cities  # noqa: E402
+
+
+def traced(build):
+    """Return (result, bytes allocated while building it)"""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def build_registry(names, zones, positions):
+    registry = CityRegistry()
+    for name, zone, (lon, lat) in zip(names, zones, positions):
+        registry.add(name, zone, lon, lat)
+    return registry
+
+
+def build_dicts(names, zones, positions):
+    time_zones = dict(zip(names, zones))
+    coords = {name: [lon, lat, 0] for name, (lon, lat) in zip(names, positions)}
+    return time_zones, coords
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    known_zones = sorted(set(default_cities().values()))
+    print(f"{'cities':>8} {'dict B/city':>12} {'columns B/city':>15} {'registry B/city':>16} "
+          f"{'dict get us':>12} {'registry get us':>16}")
+    for count in args.cities:
+        rng = random.Random(count)
+        # Names and zone strings are built outside the traced region for both
+        names = [f"City {i}" for i in range(count)]
+        zones = [known_zones[rng.randrange(len(known_zones))] for _ in range(count)]
+        positions = [(rng.uniform(-180, 180), rng.uniform(-90, 90)) for _ in range(count)]
+
+        (time_zones, coords), dict_bytes = traced(lambda: build_dicts(names, zones, positions))
+        registry, registry_bytes = traced(lambda: build_registry(names, zones, positions))
+
+        probe = names[count // 2]
+        number = 200000
+        dict_us = timeit.timeit(lambda: (time_zones[probe], coords[probe]), number=number) / number * 1e6
+        registry_us = timeit.timeit(lambda: (registry[probe], registry.coords(registry.id(probe))),
+                                    number=number) / number * 1e6
+        columns = (registry.longitudes, registry.latitudes, registry.zone_ids)
+        columns_bytes = sum(column.itemsize * len(column) for column in columns)
+        print(f"{count:>8} {dict_bytes / count:>12.0f} {columns_bytes / count:>15.0f} "
+              f"{registry_bytes / count:>16.0f} {dict_us:>12.2f} {registry_us:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
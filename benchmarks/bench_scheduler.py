@@ -0,0 +1,207 @@
+"""Compare the GUI's old polling loops with the wall-clock TickScheduler
+
+Runs an hour of simulated time on a virtual event loop: timers fire a random
+0-4 ms late and every pass costs the work it does (a fixed 3 ms), which is
+what makes after(N) loops drift. The passes themselves are real: the five
+ClockApp clocks and the globe draw on recording stand-in widgets, so the
+table shows the actual Tk calls and Python CPU time per simulated second,
+split between the clock (and status bar) work and the globe animation.
+
+    old 100 ms    ClockApp before: everything redrawn every after(100)
+    old 1000 ms   ChronoEyeApp before: after(1000) after each pass
+    scheduler     1 Hz clocks plus the globe at 10 fps, one timer
+    idle          the same with the FrameGovernor idle (no recent input)
+    hidden        the same with the window unmapped
+
+    python benchmarks/bench_scheduler.py [simulated seconds]
+"""
+import heapq
+import itertools
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cities import default_cities
+from main import GLOBE_DEGREES_PER_SECOND, GLOBE_FPS, clock_city_ids
+from scheduler import FrameGovernor, TickScheduler
+from timesource import TimeSource
+from widgets import ClockFace, GlobeView
+
+PASS_COST = 0.003
+MAX_TIMER_LATENCY = 0.004
+DEFAULT_SECONDS = 3600
+
+
+class RecordingWidget:
+    """Stand-in for tk.Canvas / tk.Label that counts every Tk call"""
+
+    def __init__(self):
+        self.calls = 0
+        self.next_id = 0
+
+    def _create(self, *args, **kwargs):
+        self.calls += 1
+        self.next_id += 1
+        return self.next_id
+
+    create_oval = create_line = create_text = _create
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+
+    coords = itemconfigure = config = _call
+
+
+class VirtualLoop:
+    """after()/after_cancel() on a simulated clock with late timers and costly passes"""
+
+    def __init__(self, start):
+        self.now = start
+        self.timers = []
+        self.cancelled = set()
+        self.ids = itertools.count()
+        self.random = random.Random(1)
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, callback):
+        timer = next(self.ids)
+        due = self.now + ms / 1000 + self.random.uniform(0, MAX_TIMER_LATENCY)
+        heapq.heappush(self.timers, (due, timer, callback))
+        return timer
+
+    def after_cancel(self, timer):
+        self.cancelled.add(timer)
+
+    def run(self, until):
+        wakeups = 0
+        while self.timers and self.timers[0][0] <= until:
+            due, timer, callback = heapq.heappop(self.timers)
+            if timer in self.cancelled:
+                continue
+            self.now = max(self.now, due)
+            wakeups += 1
+            callback()
+            self.now += PASS_COST
+        return wakeups
+
+
+class Display:
+    """The ClockApp clocks and globe on recording widgets"""
+
+    def __init__(self):
+        cities = default_cities()
+        self.time_source = TimeSource()
+        self.widgets = []
+        self.cards = []
+        ids = clock_city_ids(cities)
+        for city_id in ids:
+            canvas, label = RecordingWidget(), RecordingWidget()
+            self.widgets += [canvas, label]
+            face = ClockFace(canvas, "#000", "#111", "#222", "#333")
+            self.cards.append((face, label, cities.zone(city_id)))
+        globe_canvas = RecordingWidget()
+        self.status = RecordingWidget()
+        self.widgets += [globe_canvas, self.status]
+        self.globe = GlobeView(globe_canvas, cities, ids, "#000", "#111", "#222", "#333")
+        self.shown = []
+        self.clock_cpu = 0.0
+        self.globe_cpu = 0.0
+
+    def calls(self):
+        return sum(widget.calls for widget in self.widgets)
+
+    def clocks(self, timestamp):
+        started = time.process_time()
+        instant = self.time_source.tick(timestamp)
+        for face, label, zone in self.cards:
+            now = self.time_source.local_time(zone)
+            if face.set_time(now.hour, now.minute, now.second):
+                label.config(text=now.strftime("%H:%M:%S"))
+        self.status.config(text=instant.strftime("%Y-%m-%d %H:%M:%S UTC"))
+        self.shown.append(math.floor(timestamp))
+        self.clock_cpu += time.process_time() - started
+
+    def globe_frame(self, timestamp, rotation):
+        started = time.process_time()
+        self.globe.draw(rotation)
+        self.globe_cpu += time.process_time() - started
+
+    def skipped_seconds(self):
+        """Seconds the clocks never showed"""
+        return sum(b - a - 1 for a, b in zip(self.shown, self.shown[1:]) if b - a > 1)
+
+
+def run_old_100ms(loop, display):
+    rotation = [0.0]
+
+    def update():
+        now = loop.clock()
+        display.clocks(now)
+        rotation[0] = (rotation[0] + 0.5) % 360
+        display.globe_frame(now, rotation[0])
+        loop.after(100, update)
+
+    update()
+
+
+def run_old_1000ms(loop, display):
+    def update_data():
+        display.clocks(loop.clock())
+        loop.after(1000, update_data)
+
+    update_data()
+
+
+def run_scheduler(loop, display, idle=False, visible=True):
+    scheduler = TickScheduler(loop, clock=loop.clock)
+    scheduler.every_second(display.clocks)
+    scheduler.every_frame(
+        lambda now: display.globe_frame(now, (now * GLOBE_DEGREES_PER_SECOND) % 360),
+        GLOBE_FPS
+    )
+    governor = FrameGovernor(scheduler, GLOBE_FPS, idle_after=0 if idle else float("inf"), clock=loop.clock)
+    governor.visible = visible
+    governor.refresh()
+    scheduler.start()
+    return scheduler
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SECONDS
+    start = 1_700_000_000.25
+
+    print(f"{seconds} simulated seconds, passes cost {PASS_COST * 1000:g} ms, "
+          f"timers up to {MAX_TIMER_LATENCY * 1000:g} ms late\n")
+    print(f"{'loop':<12} {'wakeups/s':>10} {'clock passes/s':>15} {'Tk calls/s':>11} "
+          f"{'clock CPU ms/s':>15} {'globe CPU ms/s':>15} {'skipped s':>10}")
+    runs = (
+        ("old 100 ms", run_old_100ms, {}),
+        ("old 1000 ms", run_old_1000ms, {}),
+        ("scheduler", run_scheduler, {}),
+        ("idle", run_scheduler, {"idle": True}),
+        ("hidden", run_scheduler, {"visible": False})
+    )
+    for name, setup, options in runs:
+        loop = VirtualLoop(start)
+        display = Display()
+        setup_calls = display.calls()
+        result = setup(loop, display, **options)
+        wakeups = loop.run(start + seconds)
+        print(f"{name:<12} {wakeups / seconds:>10.1f} {len(display.shown) / seconds:>15.1f} "
+              f"{(display.calls() - setup_calls) / seconds:>11.1f} "
+              f"{display.clock_cpu * 1000 / seconds:>15.3f} {display.globe_cpu * 1000 / seconds:>15.3f} "
+              f"{display.skipped_seconds():>10}")
+        if name == "scheduler":
+            report = result.report()
+
+    print(f"\nscheduler: {report}")
+
+
+if __name__ == "__main__":
+    main()
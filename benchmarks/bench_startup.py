@@ -0,0 +1,76 @@
+"""Startup import-time benchmark with a regression budget
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters for the
+GUI entry point and the server, keeps the best of several runs, and prints
+the heaviest imports. Exits non-zero when a module's cumulative import time
+exceeds its budget, so it can gate changes that pull heavy modules back onto
+the startup path.
+
+    python benchmarks/bench_startup.py [--runs 7] [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budgets in milliseconds, with headroom for slow hosts
+BUDGETS_MS = {
+    "main": 60,
+    "server": 120,
+}
+
+# Modules that must not be imported at startup
+FORBIDDEN = ("PIL", "bottle", "webview", "pytz")
+
+
+def import_times(module):
+    """Return {imported module: (self us, cumulative us)} for one fresh import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        runs = [import_times(module) for _ in range(args.runs)]
+        best = min(runs, key=lambda times: times[module][1])
+        total_ms = best[module][1] / 1000
+
+        status = "ok" if total_ms <= budget else "OVER BUDGET"
+        print(f"import {module}: {total_ms:.1f} ms (budget {budget} ms) {status}")
+        heaviest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+        for name, (self_us, cumulative_us) in heaviest:
+            print(f"    {self_us / 1000:>7.2f} ms self {cumulative_us / 1000:>8.2f} ms cumulative  {name}")
+
+        loaded = [name for name in FORBIDDEN if name in best]
+        if loaded:
+            print(f"    imported at startup: {', '.join(loaded)}")
+            failed = True
+        if total_ms > budget:
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
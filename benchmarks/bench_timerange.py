@@ -0,0 +1,90 @@
+"""Time and peak memory of the /api/time-range computation
+
+For N synthetic cities (real zone names) and a range of instants, compares
+TimeDataAPI.get_time_range (offsets filled per zone from the compiled
+transition tables, in chunks) with converting every city at every instant
+through pytz, and reports the peak memory traced while consuming all the
+chunks against the size of the full cities x instants matrix. The pytz loop
+is timed on a sample of the instants and scaled up.
+
+    python benchmarks/bench_timerange.py [--cities 200 2000] [--days 90] [--step 900]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cities import CityRegistry, default_cities  # noqa: E402
+from server import TimeDataAPI  # noqa: E402
+from timesource import get_timezone  # noqa: E402
+
+PYTZ_SAMPLE = 200
+
+
+def consume(time_api, start, stop, step):
+    """Walk every chunk; returns the number of cells seen"""
+    cells = 0
+    for chunk in time_api.get_time_range(start, stop, step):
+        cells += len(chunk.instants) * len(chunk.offsets)
+    return cells
+
+
+def pytz_loop(zones, start, step, count):
+    for i in range(count):
+        instant = datetime.fromtimestamp(start + i * step, timezone.utc)
+        for zone in zones:
+            instant.astimezone(zone).utcoffset()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--step", type=int, default=900)
+    args = parser.parse_args()
+
+    known_zones = sorted(set(default_cities().values()))
+    start = int(datetime(datetime.now(timezone.utc).year, 1, 1, tzinfo=timezone.utc).timestamp())
+    stop = start + args.days * 86400
+    count = -(-(stop - start) // args.step)
+    print(f"{args.days} days every {args.step} s: {count} instants\n")
+    print(f"{'cities':>7} {'cells':>10} {'range ms':>9} {'pytz ms':>10} {'speedup':>8} "
+          f"{'peak MB':>8} {'matrix MB':>10}")
+    for city_count in args.cities:
+        rng = random.Random(city_count)
+        registry = CityRegistry()
+        for i in range(city_count):
+            registry.add(f"City {i}", known_zones[rng.randrange(len(known_zones))],
+                         rng.uniform(-180, 180), rng.uniform(-90, 90))
+        time_api = TimeDataAPI(registry)
+        # Compile the tables outside the timings
+        time_api.range_tables(start, stop)
+
+        started = time.perf_counter()
+        cells = consume(time_api, start, stop, args.step)
+        range_ms = (time.perf_counter() - started) * 1000
+
+        zones = [get_timezone(zone) for zone in registry.values()]
+        sample = min(count, PYTZ_SAMPLE)
+        started = time.perf_counter()
+        pytz_loop(zones, start, args.step, sample)
+        pytz_ms = (time.perf_counter() - started) * 1000 * count / sample
+
+        tracemalloc.start()
+        consume(time_api, start, stop, args.step)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        # Offsets and local times as 8-byte integers for every cell
+        matrix = cells * 2 * 8
+
+        print(f"{city_count:>7} {cells:>10} {range_ms:>9.1f} {pytz_ms:>10.0f} {pytz_ms / range_ms:>7.0f}x "
+              f"{peak / 1e6:>8.2f} {matrix / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Compare per-city pytz conversion against precompiled TransitionTables
+
+Builds a city list from every IANA zone pytz knows, repeated up to the
+requested size, then times converting one UTC instant to every city's offset,
+local wall time and DST flag both ways. Before timing, both paths are
+checked to agree at random instants across the compiled window.
+
+    python benchmarks/bench_tztables.py [cities ...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytz
+
+from timesource import get_timezone
+from tztables import TransitionTables, year_start
+
+REPEATS = 20
+
+
+def make_cities(count):
+    zones = pytz.all_timezones
+    return {f"city-{i}": zones[i % len(zones)] for i in range(count)}
+
+
+def pytz_pass(time_zones, timestamp):
+    """Old path: one aware datetime per city through pytz"""
+    instant = datetime.fromtimestamp(timestamp, pytz.UTC)
+    offsets, local_seconds, dst = [], [], []
+    for tz_name in time_zones.values():
+        now = instant.astimezone(get_timezone(tz_name))
+        offset = int(now.utcoffset().total_seconds())
+        offsets.append(offset)
+        local_seconds.append(timestamp + offset)
+        dst.append(bool(now.dst()))
+    return offsets, local_seconds, dst
+
+
+def check(tables, time_zones, samples=200):
+    rng = random.Random(1)
+    low = year_start(tables.first_year)
+    high = year_start(tables.last_year + 1) - 1
+    for _ in range(samples):
+        timestamp = rng.randint(low, high)
+        snapshot = tables.snapshot(timestamp)
+        offsets, local_seconds, dst = pytz_pass(time_zones, timestamp)
+        assert list(snapshot.offsets) == offsets, timestamp
+        assert list(snapshot.local_seconds) == local_seconds, timestamp
+        assert [bool(flag) for flag in snapshot.dst] == dst, timestamp
+
+
+def best_of(func, *args):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [8, 600, 5000, 20000]
+    now = int(datetime.now(timezone.utc).timestamp())
+
+    print(f"{'cities':>8} {'compile':>10} {'pytz':>10} {'tables':>10} {'same tick':>10} {'speedup':>8}")
+    for count in sizes:
+        time_zones = make_cities(count)
+
+        start = time.perf_counter()
+        tables = TransitionTables(time_zones)
+        compile_time = time.perf_counter() - start
+
+        check(tables, time_zones, samples=20 if count > 5000 else 200)
+
+        pytz_time = best_of(pytz_pass, time_zones, now)
+        # Alternate instants far apart so every pass redoes the period lookups
+        instants = iter([now, now + 200 * 86400] * REPEATS)
+        cold_time = best_of(lambda: tables.snapshot(next(instants)))
+        warm_time = best_of(tables.snapshot, now)
+
+        print(f"{count:>8} {compile_time * 1e3:>8.1f}ms {pytz_time * 1e3:>8.2f}ms "
+              f"{cold_time * 1e3:>8.2f}ms {warm_time * 1e3:>8.2f}ms {pytz_time / cold_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
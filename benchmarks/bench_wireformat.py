@@ -0,0 +1,68 @@
+"""Payload size and encode/decode time of the /api/time-data wire formats
+
+For N synthetic cities (real zone names, compiled offset tables) builds one
+second's body in each format the way TimeDataCache does, and reports its size
+plain and gzip-compressed, the time to build and encode it (what the server
+pays once per second) and the time to decode it in Python. The browser reads
+the binary format through a DataView without any decoding step.
+
+    python benchmarks/bench_wireformat.py [--cities 1000 10000 50000]
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cities import CityRegistry, default_cities  # noqa: E402
+from server import GZIP_LEVEL, TimeDataAPI, TimeDataCache  # noqa: E402
+from tztables import TransitionTables  # noqa: E402
+from wireformat import FORMATS, decode_binary  # noqa: E402
+
+DECODERS = {
+    "json": json.loads,
+    "columns": json.loads,
+    "binary": decode_binary,
+}
+
+
+def per_call_ms(function, repeat=5):
+    """Best of `repeat` timings of one call, in milliseconds"""
+    number, _ = timeit.Timer(function).autorange()
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    known_zones = sorted(set(default_cities().values()))
+    print(f"{'cities':>7} {'format':>8} {'bytes':>10} {'gzip bytes':>11} {'B/city':>7} "
+          f"{'encode ms':>10} {'decode ms':>10}")
+    for count in args.cities:
+        rng = random.Random(count)
+        registry = CityRegistry()
+        for i in range(count):
+            registry.add(f"City {i}", known_zones[rng.randrange(len(known_zones))],
+                         rng.uniform(-180, 180), rng.uniform(-90, 90))
+        time_api = TimeDataAPI(registry, tables=TransitionTables(registry))
+        cache = TimeDataCache(time_api)
+        second = int(time.time())
+
+        for wire_format in FORMATS:
+            body = cache.encode(second, wire_format, False)
+            compressed = gzip.compress(body, GZIP_LEVEL)
+            encode = per_call_ms(lambda: cache.encode(second, wire_format, False))
+            decode = per_call_ms(lambda: DECODERS[wire_format](body))
+            print(f"{count:>7} {wire_format:>8} {len(body):>10} {len(compressed):>11} "
+                  f"{len(body) / count:>7.1f} {encode:>10.2f} {decode:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Load-test /api/time-data under 1, 10 and 100 concurrent clients
+
+Starts the server in a child process (the threaded server by default, or the
+old single-threaded socketserver.TCPServer with --legacy) unless --url points
+at a running one. Each client keeps one HTTP/1.1 connection open and issues
+requests back to back for --duration seconds. Reports requests/sec and
+p50/p99 latency per concurrency level.
+
+    python benchmarks/loadtest.py [--legacy] [--url http://host:port] [--duration 5]
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import socketserver
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PATH = "/api/time-data"
+
+
+def run_server(legacy, port_queue):
+    import server
+
+    class QuietHandler(server.AppHandler):
+        def log_message(self, format, *args):
+            pass
+
+    if legacy:
+        # The previous setup: one request at a time, HTTP/1.0, no keep-alive
+        QuietHandler.protocol_version = "HTTP/1.0"
+        httpd = socketserver.TCPServer(("127.0.0.1", 0), QuietHandler)
+    else:
+        httpd = server.ThreadedHTTPServer(("127.0.0.1", 0), QuietHandler)
+    port_queue.put(httpd.server_address[1])
+    httpd.serve_forever()
+
+
+def client(host, port, deadline, latencies, errors):
+    conn = None
+    while time.perf_counter() < deadline:
+        try:
+            if conn is None:
+                conn = http.client.HTTPConnection(host, port, timeout=10)
+            start = time.perf_counter()
+            conn.request("GET", PATH)
+            response = conn.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            if response.will_close:
+                conn.close()
+                conn = None
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            if conn is not None:
+                conn.close()
+            conn = None
+    if conn is not None:
+        conn.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_level(host, port, clients, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=client, args=(host, port, deadline, latencies, errors))
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return len(latencies) / duration, percentile(latencies, 0.5), percentile(latencies, 0.99), len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="test an already running server instead of starting one")
+    parser.add_argument("--legacy", action="store_true", help="start the old single-threaded TCPServer")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per concurrency level")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        port_queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run_server, args=(args.legacy, port_queue), daemon=True)
+        process.start()
+        host, port = "127.0.0.1", port_queue.get(timeout=10)
+
+    try:
+        print(f"GET {PATH} on {host}:{port} ({'legacy' if args.legacy else 'threaded'})")
+        print(f"{'clients':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+        for clients in args.clients:
+            rps, p50, p99, errors = run_level(host, port, clients, args.duration)
+            print(f"{clients:>8} {rps:>10.0f} {p50 * 1e3:>10.2f} {p99 * 1e3:>10.2f} {errors:>8}")
+    finally:
+        if process is not None:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
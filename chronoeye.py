@@ -0,0 +1,127 @@
+"""ChronoEye command line
+
+    python -m chronoeye serve [--host HOST] [--port PORT] [--workers N] [--cities FILE] [--compiled]
+                              [--processes N] [--reuse-port] [--snapshot FILE]
+    python -m chronoeye gui [--snapshot FILE] [--tick-stats] [--fps N] [--idle-fps N] [--budget F]
+
+`serve` runs only the HTTP server and time engine (globe page, /api/*) with
+no GUI imports; `gui` opens the desktop clock window. With --processes the
+server runs in N pre-forked processes; SIGHUP reloads them (rereading
+--cities) without dropping connections. --snapshot names the file the
+per-second time snapshot is shared through, so a GUI started with the same
+--snapshot reads the server's times instead of computing its own.
+--tick-stats shows the GUI scheduler's jitter and missed ticks and the
+globe's frame rate in the status bar; --fps, --idle-fps and --budget set the
+globe's frame rate in use, after a while without input, and its CPU budget.
+"""
+import argparse
+
+
+def configure(args):
+    import server
+    from cities import default_cities, load_cities
+
+    if args.cities:
+        server.configure_cities(load_cities(args.cities), compiled=args.compiled)
+    elif args.compiled:
+        server.configure_cities(default_cities(), compiled=True)
+
+
+def serve(args):
+    if args.processes != 1 or args.reuse_port:
+        from prefork import Supervisor
+
+        supervisor = Supervisor(host=args.host, port=args.port, processes=args.processes,
+                                workers=args.workers, reuse_port=args.reuse_port,
+                                setup=lambda: configure(args), snapshot_path=args.snapshot)
+        # setup runs before any process is forked; a reload that fails keeps
+        # the running processes instead
+        try:
+            supervisor.run()
+        except ValueError as error:
+            raise SystemExit(f"chronoeye serve: {error}")
+        return
+
+    import server
+
+    try:
+        configure(args)
+    except ValueError as error:
+        raise SystemExit(f"chronoeye serve: {error}")
+    snapshot = None
+    if args.snapshot:
+        import threading
+        from sharedtime import SharedSnapshot
+
+        snapshot = SharedSnapshot.create(server.time_api, args.snapshot)
+        server.time_data_cache.shared = snapshot
+        threading.Thread(target=snapshot.run, daemon=True).start()
+    try:
+        server.serve(host=args.host, port=args.port, workers=args.workers)
+    finally:
+        if snapshot is not None:
+            snapshot.unlink()
+
+
+def gui(args):
+    import tkinter as tk
+    from main import GLOBE_FPS, ClockApp
+    from timesource import TimeSource
+
+    shared = None
+    if args.snapshot:
+        from sharedtime import SharedSnapshot
+        shared = SharedSnapshot.attach(args.snapshot)
+
+    root = tk.Tk()
+    ClockApp(
+        root,
+        TimeSource(shared=shared),
+        show_tick_stats=args.tick_stats,
+        globe_fps=args.fps or GLOBE_FPS,
+        idle_fps=args.idle_fps,
+        frame_budget=args.budget
+    )
+    root.mainloop()
+
+
+def main(argv=None):
+    from scheduler import FRAME_BUDGET, IDLE_AFTER, IDLE_FPS
+    from server import DEFAULT_WORKERS
+
+    parser = argparse.ArgumentParser(prog="chronoeye", description="ChronoEye global time visualizer")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the headless web/API server")
+    serve_parser.add_argument("--host", default="", help="bind address (default: all interfaces)")
+    serve_parser.add_argument("--port", type=int, default=8081, help="port, 0 for any free port (default: 8081)")
+    serve_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                              help=f"connections served at once per process (default: {DEFAULT_WORKERS})")
+    serve_parser.add_argument("--processes", type=int, default=1,
+                              help="pre-forked server processes, 0 for one per CPU (default: 1)")
+    serve_parser.add_argument("--reuse-port", action="store_true",
+                              help="give each process its own SO_REUSEPORT socket")
+    serve_parser.add_argument("--snapshot", help="file to publish the shared per-second time snapshot at")
+    serve_parser.add_argument("--cities", help="CSV or JSON file with the cities to serve")
+    serve_parser.add_argument("--compiled", action="store_true",
+                              help="use precompiled offset tables (faster for many cities)")
+    serve_parser.set_defaults(run=serve)
+
+    gui_parser = commands.add_parser("gui", help="open the desktop clock window")
+    gui_parser.add_argument("--snapshot", help="read times from a server's shared snapshot file")
+    gui_parser.add_argument("--tick-stats", action="store_true",
+                            help="show update jitter, missed ticks and globe fps in the status bar")
+    gui_parser.add_argument("--fps", type=float,
+                            help="globe frame rate while in use (default: 10)")
+    gui_parser.add_argument("--idle-fps", type=float, default=IDLE_FPS,
+                            help=f"globe frame rate after {IDLE_AFTER} s without input (default: {IDLE_FPS})")
+    gui_parser.add_argument("--budget", type=float, default=FRAME_BUDGET,
+                            help=f"share of CPU time the globe may use (default: {FRAME_BUDGET})")
+    gui_parser.set_defaults(run=gui)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""City registry shared by the server, the time snapshot and the Tk widgets
+
+Every city's name, zone and globe position lives in one CityRegistry loaded
+from cities.csv (or any CSV/JSON file given on the command line), so the
+subsystems can no longer disagree about where a city is.
+"""
+import csv
+import functools
+import json
+import math
+import os
+import sys
+from array import array
+from collections.abc import Mapping
+
+# Cities shown when no other file is given
+CITIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cities.csv")
+
+
+class CityRegistry(Mapping):
+    """Cities held in columnar arrays, looked up in O(1) by id or name
+
+    A city's id is its position in load order. Longitude and latitude are
+    float32 columns (NaN when unknown) and zones are interned once and
+    referenced by a 16-bit index, so those take 10 bytes a city. Names are
+    kept as one list of str with a {name: id} dict: the server needs every
+    name as a str anyway (it walks the cities each second and keys its JSON
+    by name), and the registry's str objects are the ones shared with the
+    compiled tables and city metadata. Besides the name strings themselves
+    a city costs 70-90 bytes, most of it the dict entry, against 120-160
+    for the {city: zone} and {city: [lon, lat, offset]} dicts it replaces
+    (benchmarks/bench_registry.py).
+
+    As a Mapping it reads like the {city name: zone name} dicts it replaces;
+    items() and values() iterate the columns directly instead of returning
+    views.
+    """
+
+    def __init__(self):
+        self.longitudes = array("f")
+        self.latitudes = array("f")
+        self.zone_ids = array("H")
+        self.zones = []
+        self.zone_index = {}
+        self.names = []
+        self.ids = {}
+
+    def add(self, name, zone, longitude=math.nan, latitude=math.nan):
+        """Append a city and return its id"""
+        if name in self.ids:
+            raise ValueError(f"Duplicate city name: {name!r}")
+
+        zone_id = self.zone_index.get(zone)
+        if zone_id is None:
+            zone_id = self.zone_index[zone] = len(self.zones)
+            self.zones.append(sys.intern(zone))
+
+        city_id = len(self.names)
+        self.longitudes.append(longitude)
+        self.latitudes.append(latitude)
+        self.zone_ids.append(zone_id)
+        self.names.append(name)
+        self.ids[name] = city_id
+        return city_id
+
+    def id(self, name):
+        """Return the id of a city, KeyError if unknown"""
+        return self.ids[name]
+
+    def name(self, city_id):
+        return self.names[city_id]
+
+    def zone(self, city_id):
+        return self.zones[self.zone_ids[city_id]]
+
+    def coords(self, city_id):
+        """Return (longitude, latitude), or None if the position is unknown"""
+        longitude = self.longitudes[city_id]
+        if math.isnan(longitude):
+            return None
+        return longitude, self.latitudes[city_id]
+
+    def __getitem__(self, name):
+        return self.zones[self.zone_ids[self.ids[name]]]
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def items(self):
+        zones = self.zones
+        for name, zone_id in zip(self.names, self.zone_ids):
+            yield name, zones[zone_id]
+
+    def values(self):
+        zones = self.zones
+        for zone_id in self.zone_ids:
+            yield zones[zone_id]
+
+
+def load_cities(path):
+    """Read a CityRegistry from a .csv or .json file
+
+    CSV files need a header with name and timezone columns and may have
+    longitude and latitude. JSON files map city names either to a zone name
+    or to an object with "timezone" and optional "coords" ([longitude, latitude]):
+
+        {"Oslo": "Europe/Oslo", "Lima": {"timezone": "America/Lima", "coords": [-77.04, -12.05]}}
+    """
+    registry = CityRegistry()
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".json"):
+            for name, entry in json.load(f).items():
+                if isinstance(entry, str):
+                    registry.add(name, entry)
+                else:
+                    registry.add(name, entry["timezone"], *entry.get("coords", [])[:2])
+        else:
+            for row in csv.DictReader(f):
+                registry.add(
+                    row["name"],
+                    row["timezone"],
+                    float(row.get("longitude") or math.nan),
+                    float(row.get("latitude") or math.nan)
+                )
+    return registry
+
+
+@functools.lru_cache(maxsize=None)
+def default_cities():
+    """The registry from CITIES_FILE, loaded once per process"""
+    return load_cities(CITIES_FILE)
@@ -0,0 +1,940 @@
+"""Front end embedded as strings; generated by `python assets.py --embed`, do not edit"""
+
+EMBEDDED_ASSETS = {
+    'bench.html': """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>ChronoEye Marker Benchmark</title>
+    <link rel="stylesheet" href="css/styles.css">
+</head>
+<body>
+    <!-- bench.html?cities=10000&mode=instanced|legacy&seconds=10 -->
+    <div id="globe-container"></div>
+    <div id="time-display">
+        <pre id="bench-result">Measuring...</pre>
+    </div>
+
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js"></script>
+    <script src="js/markers.js"></script>
+    <script src="js/bench.js"></script>
+</body>
+</html>
+""",
+    'index.html': """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>ChronoEye 3D Globe</title>
+    <link rel="stylesheet" href="css/styles.css">
+</head>
+<body>
+    <div id="globe-container"></div>
+    <div id="time-display">
+        <div id="current-city">
+            <h2>Select a city</h2>
+            <div class="time">--:--:--</div>
+        </div>
+    </div>
+
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js"></script>
+    <script src="js/markers.js"></script>
+    <script src="js/graticule.js"></script>
+    <script src="js/debug.js"></script>
+    <script src="js/governor.js"></script>
+    <script src="js/globe.js"></script>
+</body>
+</html>""",
+    'css/styles.css': """body {
+    margin: 0;
+    padding: 0;
+    overflow: hidden;
+    background-color: #0F172A;
+    color: #F1F5F9;
+    font-family: 'Segoe UI', Arial, sans-serif;
+}
+
+#globe-container {
+    position: absolute;
+    width: 100%;
+    height: 100%;
+}
+
+#time-display {
+    position: absolute;
+    bottom: 20px;
+    left: 20px;
+    background-color: rgba(15, 23, 42, 0.7);
+    border-radius: 10px;
+    padding: 15px;
+    backdrop-filter: blur(10px);
+    border: 1px solid #3B82F6;
+    box-shadow: 0 0 20px rgba(6, 182, 212, 0.3);
+}
+
+#current-city h2 {
+    margin: 0 0 10px 0;
+    font-size: 24px;
+    color: #06B6D4;
+}
+
+.time {
+    font-size: 36px;
+    font-weight: bold;
+    color: #F1F5F9;
+}
+#debug-overlay {
+    position: absolute;
+    top: 20px;
+    right: 20px;
+    background-color: rgba(15, 23, 42, 0.85);
+    border-radius: 10px;
+    padding: 10px;
+    border: 1px solid #3B82F6;
+    font-family: monospace;
+    font-size: 12px;
+    color: #E2E8F0;
+    pointer-events: none;
+}
+
+#debug-overlay pre {
+    margin: 0 0 6px 0;
+}
+
+#debug-overlay canvas {
+    display: block;
+}
+""",
+    'js/bench.js': "// Frame rate benchmark for the globe's city markers\n//\n// Renders the globe with N random cities and reports frame times once the\n// run is over (also as window.benchResult for scripted runs). Query options:\n//   cities   number of markers (default 10000)\n//   mode     instanced: the marker layer from markers.js (default)\n//            legacy: one sphere mesh, material and point light per city, as\n//            before; keep cities small, every light is added to every shader\n//   seconds  measured duration after a one second warm-up (default 10)\n\nconst params = new URLSearchParams(window.location.search);\nconst cityCount = parseInt(params.get('cities') || '10000', 10);\nconst mode = params.get('mode') || 'instanced';\nconst seconds = parseFloat(params.get('seconds') || '10');\nconst WARMUP_MS = 1000;\n\nlet scene, camera, renderer, globe, markerLayer = null;\nconst frameTimes = [];\nlet startTime = null;\nlet lastTime = null;\n\nfunction randomCities(count) {\n    const cities = [];\n    for (let i = 0; i < count; i++) {\n        cities.push({\n            name: `City ${i}`,\n            longitude: Math.random() * 360 - 180,\n            // Uniform over the sphere rather than bunched at the poles\n            latitude: Math.asin(Math.random() * 2 - 1) * 180 / Math.PI,\n            daylight: Math.random() < 0.5\n        });\n    }\n    return cities;\n}\n\n// The per-city meshes and lights globe.js used to create\nfunction addLegacyMarkers(cities) {\n    const position = new THREE.Vector3();\n    cities.forEach(city => {\n        markerPosition(city.longitude, city.latitude, position);\n        const color = city.daylight ? 0xf59e0b : 0x8b5cf6;\n        const marker = new THREE.Mesh(\n            new THREE.SphereGeometry(0.05, 16, 16),\n            new THREE.MeshBasicMaterial({ color: color })\n        );\n        marker.position.copy(position);\n        globe.add(marker);\n\n        const light = new THREE.PointLight(color, 0.5, 0.5);\n        light.position.copy(position);\n        globe.add(light);\n    });\n}\n\nfunction setup() {\n    scene = new THREE.Scene();\n    camera = new THREE.PerspectiveCamera(45, window.innerWidth / window.innerHeight, 0.1, 1000);\n    camera.position.z = 4;\n\n    renderer = new THREE.WebGLRenderer({ antialias: true, alpha: true });\n    renderer.setSize(window.innerWidth, window.innerHeight);\n    renderer.setPixelRatio(window.devicePixelRatio);\n    document.getElementById('globe-container').appendChild(renderer.domElement);\n\n    scene.add(new THREE.AmbientLight(0x404040, 1));\n    const directionalLight = new THREE.DirectionalLight(0xffffff, 1);\n    directionalLight.position.set(5, 3, 5);\n    scene.add(directionalLight);\n\n    // Same Phong globe as the app, so per-pixel lighting cost is comparable\n    globe = new THREE.Mesh(\n        new THREE.SphereGeometry(2, 64, 64),\n        new THREE.MeshPhongMaterial({\n            color: 0x1e3a8a,\n            emissive: 0x072655,\n            specular: 0x3b82f6,\n            shininess: 15,\n            transparent: true,\n            opacity: 0.9\n        })\n    );\n    scene.add(globe);\n\n    const cities = randomCities(cityCount);\n    if (mode === 'legacy') {\n        addLegacyMarkers(cities);\n    } else {\n        markerLayer = createMarkerLayer(cities);\n        globe.add(markerLayer.mesh);\n    }\n}\n\nfunction percentile(sorted, fraction) {\n    return sorted[Math.min(sorted.length - 1, Math.round(fraction * (sorted.length - 1)))];\n}\n\nfunction report() {\n    const sorted = frameTimes.slice().sort((a, b) => a - b);\n    const total = frameTimes.reduce((sum, value) => sum + value, 0);\n    const result = {\n        mode: mode,\n        cities: cityCount,\n        frames: frameTimes.length,\n        fps: frameTimes.length / (total / 1000),\n        p50: percentile(sorted, 0.5),\n        p95: percentile(sorted, 0.95),\n        p99: percentile(sorted, 0.99),\n        worst: sorted[sorted.length - 1]\n    };\n    window.benchResult = result;\n    document.getElementById('bench-result').textContent =\n        `${result.mode}, ${result.cities} cities, ${result.frames} frames\\n` +\n        `${result.fps.toFixed(1)} fps\\n` +\n        `frame ms p50 ${result.p50.toFixed(2)}  p95 ${result.p95.toFixed(2)}  ` +\n        `p99 ${result.p99.toFixed(2)}  worst ${result.worst.toFixed(2)}`;\n    console.log('bench result', JSON.stringify(result));\n}\n\nfunction frame(now) {\n    if (startTime === null) {\n        startTime = now;\n    }\n    const elapsed = now - startTime;\n    if (lastTime !== null && elapsed > WARMUP_MS) {\n        frameTimes.push(now - lastTime);\n    }\n    lastTime = now;\n\n    if (elapsed > WARMUP_MS + seconds * 1000) {\n        report();\n        return;\n    }\n\n    globe.rotation.y += 0.001;\n    if (markerLayer) {\n        animateMarkers(markerLayer, now / 1000);\n    }\n    renderer.render(scene, camera);\n    requestAnimationFrame(frame);\n}\n\nwindow.addEventListener('load', () => {\n    setup();\n    requestAnimationFrame(frame);\n});\n",
+    'js/debug.js': '// Debug overlay: frame times, JS heap growth and garbage collections over time\n//\n// Enabled with ?debug=1 or by pressing "d". Per frame it only writes the frame\n// time into a preallocated ring; the text and graph are redrawn twice a second.\n// Browsers do not report collections to pages, so a drop in the used JS heap\n// (performance.memory, Chromium only) is counted as one, and the longest frame\n// since the previous sample is shown as its likely pause.\n\nconst DEBUG_FRAMES = 240;         // frame times kept for the graph and percentiles\nconst DEBUG_HEAP_SAMPLES = 240;   // heap samples kept, one per DEBUG_REFRESH_MS\nconst DEBUG_REFRESH_MS = 500;\n\n// describe, if given, returns one more line of text for the overlay\nfunction createDebugOverlay(describe) {\n    const panel = document.createElement(\'div\');\n    panel.id = \'debug-overlay\';\n    const text = document.createElement(\'pre\');\n    const graph = document.createElement(\'canvas\');\n    graph.width = DEBUG_FRAMES;\n    graph.height = 60;\n    panel.appendChild(text);\n    panel.appendChild(graph);\n    document.body.appendChild(panel);\n    const context = graph.getContext(\'2d\');\n\n    const frames = new Float32Array(DEBUG_FRAMES);\n    const sorted = new Float32Array(DEBUG_FRAMES);\n    const heap = new Float64Array(DEBUG_HEAP_SAMPLES);\n    const memory = performance.memory;\n\n    const state = {\n        frameCount: 0,\n        heapCount: 0,\n        lastFrame: null,\n        lastRefresh: 0,\n        longestFrame: 0,\n        startHeap: memory ? memory.usedJSHeapSize : 0,\n        startTime: performance.now(),\n        collections: 0,\n        lastPause: 0\n    };\n\n    function sampleHeap() {\n        if (!memory) {\n            return;\n        }\n        const used = memory.usedJSHeapSize;\n        const previous = state.heapCount > 0 ? heap[(state.heapCount - 1) % DEBUG_HEAP_SAMPLES] : used;\n        if (used < previous) {\n            state.collections++;\n            state.lastPause = state.longestFrame;\n        }\n        heap[state.heapCount % DEBUG_HEAP_SAMPLES] = used;\n        state.heapCount++;\n    }\n\n    function draw(now) {\n        const count = Math.min(state.frameCount, DEBUG_FRAMES);\n        sorted.set(frames);\n        const recent = sorted.subarray(0, count).sort();\n        const p50 = count ? recent[Math.floor(count * 0.5)] : 0;\n        const p95 = count ? recent[Math.floor(count * 0.95)] : 0;\n        const worst = count ? recent[count - 1] : 0;\n\n        let heapLine = \'JS heap: not reported by this browser\';\n        if (memory) {\n            const used = memory.usedJSHeapSize / 1048576;\n            const minutes = (now - state.startTime) / 60000;\n            const growth = (memory.usedJSHeapSize - state.startHeap) / 1048576 / Math.max(minutes, 1 / 60);\n            heapLine = `JS heap ${used.toFixed(1)} MB, ${growth >= 0 ? \'+\' : \'\'}${growth.toFixed(2)} MB/min\\n` +\n                `GCs (heap drops) ${state.collections}, last pause <= ${state.lastPause.toFixed(1)} ms`;\n        }\n        text.textContent =\n            `frame ms p50 ${p50.toFixed(1)}  p95 ${p95.toFixed(1)}  worst ${worst.toFixed(1)}\\n` + heapLine +\n            (describe ? `\\n${describe()}` : \'\');\n\n        // Frame times (bars, 33 ms full scale) with the heap trend on top\n        context.clearRect(0, 0, graph.width, graph.height);\n        context.fillStyle = \'#06B6D4\';\n        for (let i = 0; i < count; i++) {\n            const value = frames[(state.frameCount - count + i) % DEBUG_FRAMES];\n            const height = Math.min(value / 33.3, 1) * graph.height;\n            context.fillRect(i, graph.height - height, 1, height);\n        }\n        const heapCount = Math.min(state.heapCount, DEBUG_HEAP_SAMPLES);\n        if (heapCount > 1) {\n            let low = Infinity;\n            let high = -Infinity;\n            for (let i = 0; i < heapCount; i++) {\n                low = Math.min(low, heap[i]);\n                high = Math.max(high, heap[i]);\n            }\n            context.strokeStyle = \'#F59E0B\';\n            context.beginPath();\n            for (let i = 0; i < heapCount; i++) {\n                const value = heap[(state.heapCount - heapCount + i) % DEBUG_HEAP_SAMPLES];\n                const x = i * graph.width / (DEBUG_HEAP_SAMPLES - 1);\n                const y = graph.height - (value - low) / Math.max(high - low, 1) * (graph.height - 2) - 1;\n                i === 0 ? context.moveTo(x, y) : context.lineTo(x, y);\n            }\n            context.stroke();\n        }\n    }\n\n    return {\n        panel: panel,\n\n        // Record one frame; now is the frame\'s requestAnimationFrame timestamp\n        frame(now) {\n            if (state.lastFrame !== null) {\n                const duration = now - state.lastFrame;\n                frames[state.frameCount % DEBUG_FRAMES] = duration;\n                state.frameCount++;\n                state.longestFrame = Math.max(state.longestFrame, duration);\n            }\n            state.lastFrame = now;\n\n            if (now - state.lastRefresh >= DEBUG_REFRESH_MS) {\n                sampleHeap();\n                if (!panel.hidden) {\n                    draw(now);\n                }\n                state.lastRefresh = now;\n                state.longestFrame = 0;\n            }\n        }\n    };\n}\n',
+    'js/globe.js': """// Globe visualization using Three.js
+let scene, camera, renderer, globe, markerLayer = null, timeData = {}, cityInfo = {}, cityListId = null;
+let raycaster = new THREE.Raycaster();
+let mouse = new THREE.Vector2();
+let selectedCity = null;
+let hoveredCity = null;
+let streamTime = null;
+let frameGovernor = null;
+let debugOverlay = null;
+const pageParams = new URLSearchParams(window.location.search);
+
+// Globe spin in radians per millisecond (0.001 a frame at 60 fps), so the
+// speed does not depend on the frame rate
+const ROTATION_SPEED = 0.06 / 1000;
+
+// Longest frame gap the spin catches up on
+const MAX_FRAME_STEP = 1000;
+
+// Initialize the 3D scene
+function init() {
+    // Create scene
+    scene = new THREE.Scene();
+
+    // Create camera
+    camera = new THREE.PerspectiveCamera(45, window.innerWidth / window.innerHeight, 0.1, 1000);
+    camera.position.z = 4;
+
+    // Create renderer
+    renderer = new THREE.WebGLRenderer({ antialias: true, alpha: true });
+    renderer.setSize(window.innerWidth, window.innerHeight);
+    renderer.setPixelRatio(window.devicePixelRatio);
+    document.getElementById('globe-container').appendChild(renderer.domElement);
+
+    // Add ambient light
+    const ambientLight = new THREE.AmbientLight(0x404040, 1);
+    scene.add(ambientLight);
+
+    // Add directional light
+    const directionalLight = new THREE.DirectionalLight(0xffffff, 1);
+    directionalLight.position.set(5, 3, 5);
+    scene.add(directionalLight);
+
+    // Create earth globe
+    const earthGeometry = new THREE.SphereGeometry(2, 64, 64);
+
+    // Create two-tone earth material
+    const earthMaterial = new THREE.MeshPhongMaterial({
+        color: 0x1e3a8a, // Deep blue
+        emissive: 0x072655,
+        specular: 0x3b82f6,
+        shininess: 15,
+        transparent: true,
+        opacity: 0.9
+    });
+
+    globe = new THREE.Mesh(earthGeometry, earthMaterial);
+    scene.add(globe);
+
+    // Add grid lines (longitude/latitude)
+    addGridLines();
+
+    // Handle window resize
+    window.addEventListener('resize', onWindowResize);
+
+    // Add mouse interaction
+    window.addEventListener('mousemove', onMouseMove);
+    window.addEventListener('click', onMouseClick);
+
+    // Fetch static city data once, then follow the time data
+    loadCityInfo().then(updateTimeData);
+
+    // Frame time, heap and GC overlay with ?debug=1, toggled with "d"
+    if (pageParams.has('debug')) {
+        debugOverlay = createDebugOverlay(describeFrameRate);
+    }
+    window.addEventListener('keydown', onKeyDown);
+
+    // Start animation loop; paused while hidden, slower when idle
+    frameGovernor = createFrameGovernor(animate, governorOptions(pageParams));
+}
+
+// Add grid lines to represent longitude and latitude, batched into one
+// LineSegments geometry (one draw call per color)
+function addGridLines(density = GRATICULE_DENSITY) {
+    // ?graticule=server uses the buffer precomputed by the Python server
+    if (pageParams.get('graticule') === 'server') {
+        fetchGraticuleBuffer(density)
+            .then(buffer => scene.add(createGraticule(buffer)))
+            .catch(error => {
+                console.error('Error fetching graticule:', error);
+                scene.add(createGraticule(graticuleBuffer(density)));
+            });
+        return;
+    }
+    scene.add(createGraticule(graticuleBuffer(density)));
+}
+
+// Update the globe rotation and city markers; the frame governor calls this
+// with the requestAnimationFrame timestamp and the time since the last frame
+//
+// Nothing here allocates: that timestamp is the only time sample, and the
+// marker layer keeps its positions in typed arrays and animates on the GPU,
+// so steady-state frames leave no garbage to collect.
+function animate(now, elapsed) {
+    // Rotate the globe slowly
+    globe.rotation.y += ROTATION_SPEED * Math.min(elapsed, MAX_FRAME_STEP);
+
+    // Pulse the city markers; culling and coloring happen on the GPU
+    if (markerLayer) {
+        animateMarkers(markerLayer, now / 1000);
+    }
+
+    renderer.render(scene, camera);
+
+    if (debugOverlay) {
+        debugOverlay.frame(now);
+    }
+}
+
+// Frame governor line of the debug overlay
+function describeFrameRate() {
+    const governor = frameGovernor;
+    return `${governor.state}: ${governor.currentFps.toFixed(1)} of ${governor.targetFps} fps, ` +
+        `frame ${governor.frameCost.toFixed(2)} ms`;
+}
+
+// Show or hide the debug overlay
+function onKeyDown(event) {
+    if (event.key !== 'd' || event.ctrlKey || event.metaKey || event.altKey) {
+        return;
+    }
+    if (!debugOverlay) {
+        debugOverlay = createDebugOverlay(describeFrameRate);
+    } else {
+        debugOverlay.panel.hidden = !debugOverlay.panel.hidden;
+    }
+}
+
+// Handle window resize
+function onWindowResize() {
+    camera.aspect = window.innerWidth / window.innerHeight;
+    camera.updateProjectionMatrix();
+    renderer.setSize(window.innerWidth, window.innerHeight);
+}
+
+// Fetch the static city metadata (names, zones, coordinates); cached by ETag
+function loadCityInfo() {
+    return fetch('/api/cities')
+        .then(response => {
+            // Binary time data names its city list by the start of this ETag
+            cityListId = (response.headers.get('ETag') || '').replace(/"/g, '').slice(0, 16);
+            return response.json();
+        })
+        .then(data => {
+            cityInfo = data;
+        })
+        .catch(error => {
+            console.error('Error fetching city data:', error);
+        });
+}
+
+// Combine per-second time entries with the static city metadata
+function withCityInfo(data) {
+    Object.entries(data).forEach(([city, entry]) => {
+        Object.assign(entry, cityInfo[city]);
+    });
+    return data;
+}
+
+// Subscribe to the time stream from the Python backend
+function updateTimeData() {
+    // Fall back to polling where Server-Sent Events are unavailable
+    if (!window.EventSource) {
+        pollTimeData();
+        return;
+    }
+
+    const stream = new EventSource('/api/time-stream');
+
+    // Full city data, sent once per connection (and again after a reconnect)
+    stream.addEventListener('snapshot', event => {
+        const snapshot = JSON.parse(event.data);
+        timeData = withCityInfo(snapshot.cities);
+        createCityMarkers();
+        applyTick(snapshot.t, {});
+    });
+
+    // Each second: the UTC instant plus only the cities whose offset, date or daylight changed
+    stream.addEventListener('tick', event => {
+        const tick = JSON.parse(event.data);
+        applyTick(tick.t, tick.changed);
+    });
+
+    stream.onerror = error => {
+        // EventSource reconnects by itself and receives a fresh snapshot
+        console.error('Time stream interrupted:', error);
+    };
+}
+
+// Poll the time data once a second in the binary format: one offset per
+// city, read in place, with everything else derived here
+function pollTimeData() {
+    fetch('/api/time-data?format=binary')
+        .then(response => response.arrayBuffer())
+        .then(buffer => {
+            const tick = decodeTimeData(buffer);
+            if (tick.cityListId !== cityListId) {
+                // The server's cities changed; fetch them and rebuild the markers
+                return loadCityInfo().then(() => {
+                    timeData = {};
+                    if (markerLayer) {
+                        disposeMarkerLayer(markerLayer);
+                        markerLayer = null;
+                    }
+                });
+            }
+            applyOffsets(tick);
+
+            // Create the city markers on the first response
+            if (!markerLayer) {
+                createCityMarkers();
+            }
+
+            // Update selected city display
+            updateSelectedCityDisplay();
+        })
+        .catch(error => {
+            console.error('Error fetching time data:', error);
+        });
+
+    // Update every second
+    setTimeout(pollTimeData, 1000);
+}
+
+// Read a binary /api/time-data body (layout in wireformat.py) through a DataView
+function decodeTimeData(buffer) {
+    const view = new DataView(buffer);
+    if (view.getUint32(0, true) !== 0x44544543) { // "CETD"
+        throw new Error('Not a binary time-data body');
+    }
+    let listId = '';
+    for (let i = 16; i < 24; i++) {
+        listId += view.getUint8(i).toString(16).padStart(2, '0');
+    }
+    return {
+        view: view,
+        count: view.getUint32(4, true),
+        // int64 epoch second, exact as a double for any real date
+        t: view.getUint32(8, true) + view.getInt32(12, true) * 4294967296,
+        cityListId: listId
+    };
+}
+
+// Fill timeData from a decoded tick; cities come in /api/cities order
+function applyOffsets(tick) {
+    const names = Object.keys(cityInfo);
+    for (let i = 0; i < tick.count && i < names.length; i++) {
+        const city = names[i];
+        const entry = timeData[city] || (timeData[city] = Object.assign({}, cityInfo[city]));
+        entry.offset = formatOffset(tick.view.getInt32(24 + 4 * i, true));
+        setLocalTime(entry, tick.t);
+        const daylight = entry.hour >= 6 && entry.hour < 18;
+        if (markerLayer && daylight !== entry.daylight) {
+            setMarkerDaylight(markerLayer, city, daylight);
+        }
+        entry.daylight = daylight;
+    }
+    streamTime = tick.t;
+}
+
+// Merge a stream tick into timeData
+function applyTick(epochSeconds, changed) {
+    for (const city in changed) {
+        const fields = changed[city];
+        if (timeData[city]) {
+            Object.assign(timeData[city], fields);
+            if (markerLayer && 'daylight' in fields) {
+                setMarkerDaylight(markerLayer, city, fields.daylight);
+            }
+        }
+    }
+
+    streamTime = epochSeconds;
+    updateSelectedCityDisplay();
+}
+
+// Convert a "+0530" style offset to seconds
+function offsetSeconds(offset) {
+    const sign = offset[0] === '-' ? -1 : 1;
+    return sign * (parseInt(offset.slice(1, 3), 10) * 3600 + parseInt(offset.slice(3, 5), 10) * 60);
+}
+
+// Format seconds as a "+0530" style offset
+function formatOffset(seconds) {
+    const sign = seconds < 0 ? '-' : '+';
+    const minutes = Math.abs(seconds) / 60;
+    return sign + String(Math.floor(minutes / 60)).padStart(2, '0') + String(minutes % 60).padStart(2, '0');
+}
+
+// Fill in a city's time fields for a UTC epoch second
+function setLocalTime(cityData, epochSeconds) {
+    const local = new Date((epochSeconds + offsetSeconds(cityData.offset)) * 1000);
+    cityData.time = local.toISOString().slice(11, 19);
+    cityData.date = local.toISOString().slice(0, 10);
+    cityData.hour = local.getUTCHours();
+    cityData.minute = local.getUTCMinutes();
+    cityData.second = local.getUTCSeconds();
+}
+
+// Create the marker layer for every city with coordinates
+function createCityMarkers() {
+    if (markerLayer) {
+        disposeMarkerLayer(markerLayer);
+    }
+
+    const cities = [];
+    Object.entries(timeData).forEach(([city, data]) => {
+        if (data.coords) {
+            cities.push({
+                name: city,
+                longitude: data.coords[0],
+                latitude: data.coords[1],
+                daylight: data.daylight
+            });
+        }
+    });
+
+    // Markers are children of the globe so they turn with it
+    markerLayer = createMarkerLayer(cities);
+    globe.add(markerLayer.mesh);
+}
+
+// City under the pointer, found without testing every marker
+function cityAtPointer(event) {
+    if (!markerLayer) {
+        return null;
+    }
+    mouse.x = (event.clientX / window.innerWidth) * 2 - 1;
+    mouse.y = -(event.clientY / window.innerHeight) * 2 + 1;
+    raycaster.setFromCamera(mouse, camera);
+    return markerAtRay(markerLayer, raycaster.ray);
+}
+
+// Handle mouse move for interactions
+function onMouseMove(event) {
+    const city = cityAtPointer(event);
+    if (city !== hoveredCity) {
+        hoveredCity = city;
+        if (markerLayer) {
+            highlightMarker(markerLayer, city);
+        }
+    }
+    document.body.style.cursor = city ? 'pointer' : 'default';
+}
+
+// Handle mouse click for selecting cities
+function onMouseClick(event) {
+    const city = cityAtPointer(event);
+    if (city) {
+        selectedCity = city;
+        updateSelectedCityDisplay();
+    }
+}
+
+// Update the display for the selected city
+function updateSelectedCityDisplay() {
+    if (selectedCity && timeData[selectedCity]) {
+        const cityData = timeData[selectedCity];
+
+        // On the stream, derive the clock locally from the tick and the city's offset
+        if (streamTime !== null) {
+            setLocalTime(cityData, streamTime);
+        }
+
+        const cityElement = document.getElementById('current-city');
+        cityElement.innerHTML = `
+            <h2>${selectedCity}</h2>
+            <div class="time">${cityData.time}</div>
+            <div>${cityData.date}</div>
+            <div>${cityData.timezone} (UTC${cityData.offset})</div>
+        `;
+    }
+}
+
+// Initialize the scene when the page loads
+window.addEventListener('load', init);""",
+    'js/governor.js': """// Adaptive frame rate for the globe animation
+//
+// Rendering stops while the page is hidden, runs at the idle rate once there
+// has been no input for a while (or the window lost focus) and at the full
+// rate otherwise, and never faster than the render budget allows: the share
+// of each second the measured frame time may take. Below the display's rate,
+// frames wait on a timer instead of spinning through requestAnimationFrame.
+// Options come from the page URL:
+//   fps        frame rate while in use (default 60)
+//   idle_fps   frame rate when idle (default 5)
+//   budget     share of time frames may take, 0-1 (default 0.25)
+
+const GOVERNOR_DEFAULTS = { fps: 60, idleFps: 5, budget: 0.25, idleAfter: 30000 };
+const GOVERNOR_INPUT_EVENTS = ['pointermove', 'pointerdown', 'wheel', 'keydown', 'touchstart'];
+
+// Weight of the newest frame in the frame cost and frame rate averages
+const GOVERNOR_SMOOTHING = 0.1;
+
+// Time a timer-delayed frame leaves for requestAnimationFrame to line it up with the display
+const DISPLAY_FRAME_MS = 8;
+
+function governorOptions(params) {
+    const options = {};
+    [['fps', 'fps'], ['idle_fps', 'idleFps'], ['budget', 'budget']].forEach(([param, key]) => {
+        const value = parseFloat(params.get(param));
+        if (value > 0) {
+            options[key] = value;
+        }
+    });
+    return options;
+}
+
+// Run frame(now, elapsedMs) at the governed rate; the returned object exposes
+// currentFps, targetFps, frameCost (ms) and state ('active', 'idle', 'hidden')
+function createFrameGovernor(frame, options = {}) {
+    const config = Object.assign({}, GOVERNOR_DEFAULTS, options);
+    const governor = {
+        config: config,
+        currentFps: 0,
+        targetFps: config.fps,
+        frameCost: 0,
+        state: 'active'
+    };
+
+    let lastFrame = null;
+    let lastInput = performance.now();
+    let focused = document.hasFocus();
+    let request = null;
+    let timer = null;
+
+    function refresh(now) {
+        if (document.visibilityState === 'hidden') {
+            governor.state = 'hidden';
+            governor.targetFps = 0;
+            return;
+        }
+        const idle = !focused || now - lastInput >= config.idleAfter;
+        governor.state = idle ? 'idle' : 'active';
+        let target = idle ? config.idleFps : config.fps;
+        if (governor.frameCost > 0) {
+            target = Math.min(target, Math.max(1, Math.floor(config.budget * 1000 / governor.frameCost)));
+        }
+        governor.targetFps = target;
+    }
+
+    function cancel() {
+        if (request !== null) {
+            cancelAnimationFrame(request);
+            request = null;
+        }
+        if (timer !== null) {
+            clearTimeout(timer);
+            timer = null;
+        }
+    }
+
+    function schedule() {
+        cancel();
+        if (governor.targetFps === 0) {
+            lastFrame = null;
+            governor.currentFps = 0;
+            return;
+        }
+        const wait = lastFrame === null ? 0 : lastFrame + 1000 / governor.targetFps - performance.now() - DISPLAY_FRAME_MS;
+        if (wait > 0) {
+            timer = setTimeout(() => {
+                timer = null;
+                request = requestAnimationFrame(run);
+            }, wait);
+        } else {
+            request = requestAnimationFrame(run);
+        }
+    }
+
+    function run(now) {
+        request = null;
+        const elapsed = lastFrame === null ? 0 : now - lastFrame;
+        if (elapsed > 0) {
+            const fps = 1000 / elapsed;
+            governor.currentFps += GOVERNOR_SMOOTHING * (fps - governor.currentFps);
+        }
+        lastFrame = now;
+
+        const started = performance.now();
+        frame(now, elapsed);
+        const cost = performance.now() - started;
+        governor.frameCost += GOVERNOR_SMOOTHING * (cost - governor.frameCost);
+
+        refresh(now);
+        schedule();
+    }
+
+    // Input (or focus) makes the full rate apply at once rather than at the next idle frame
+    function wake() {
+        const wasIdle = governor.state !== 'active';
+        lastInput = performance.now();
+        refresh(lastInput);
+        if (wasIdle && governor.state === 'active') {
+            schedule();
+        }
+    }
+
+    GOVERNOR_INPUT_EVENTS.forEach(name => window.addEventListener(name, wake, { passive: true }));
+    window.addEventListener('focus', () => {
+        focused = true;
+        wake();
+    });
+    window.addEventListener('blur', () => {
+        focused = false;
+        refresh(performance.now());
+    });
+    document.addEventListener('visibilitychange', () => {
+        refresh(performance.now());
+        schedule();
+    });
+
+    refresh(performance.now());
+    schedule();
+    return governor;
+}
+""",
+    'js/graticule.js': """// Globe graticule (meridians, parallels, equator) as one THREE.LineSegments
+//
+// All lines share a single Float32Array geometry with one group, and so one
+// draw call, per material. The vertex buffer uses the layout graticule.py
+// serves from /api/graticule: three uint32 vertex counts (meridians,
+// parallels, equator) followed by float32 x, y, z per vertex, each pair of
+// vertices being one segment.
+
+const GRATICULE_RADIUS = 2;
+
+// Default density: meridians around the globe, degrees between parallels and
+// degrees between the vertices along every line
+const GRATICULE_DENSITY = { meridians: 24, parallelStep: 20, step: 1 };
+
+// Shared by every graticule: meridians, parallels, equator
+const GRATICULE_MATERIALS = [
+    new THREE.LineBasicMaterial({ color: 0x3b82f6, transparent: true, opacity: 0.3 }),
+    new THREE.LineBasicMaterial({ color: 0x06b6d4, transparent: true, opacity: 0.3 }),
+    new THREE.LineBasicMaterial({ color: 0x8b5cf6, transparent: true, opacity: 0.6, linewidth: 2 })
+];
+
+// Build the graticule buffer in the browser, matching graticule_buffer() in Python
+function graticuleBuffer(density = GRATICULE_DENSITY) {
+    const meridianSteps = Math.ceil(180 / density.step);
+    const circleSteps = Math.ceil(360 / density.step);
+    const first = -Math.ceil(90 / density.parallelStep) + 1;
+    const parallels = [];
+    for (let k = first; k <= -first; k++) {
+        if (k !== 0) {
+            parallels.push(k * density.parallelStep);
+        }
+    }
+
+    const counts = [
+        density.meridians * meridianSteps * 2,
+        parallels.length * circleSteps * 2,
+        circleSteps * 2
+    ];
+    const buffer = new ArrayBuffer(12 + (counts[0] + counts[1] + counts[2]) * 12);
+    new Uint32Array(buffer, 0, 3).set(counts);
+    const vertices = new Float32Array(buffer, 12);
+
+    let offset = 0;
+    // Segments between consecutive points of one line, (angle, latitude) in degrees
+    function addLine(steps, pointAt) {
+        for (let j = 0; j < steps; j++) {
+            offset = writePoint(vertices, offset, pointAt(j));
+            offset = writePoint(vertices, offset, pointAt(j + 1));
+        }
+    }
+
+    for (let i = 0; i < density.meridians; i++) {
+        const angle = 360 * i / density.meridians;
+        addLine(meridianSteps, j => [angle, -90 + 180 * j / meridianSteps]);
+    }
+    parallels.forEach(latitude => {
+        addLine(circleSteps, j => [360 * j / circleSteps, latitude]);
+    });
+    addLine(circleSteps, j => [360 * j / circleSteps, 0]);
+    return buffer;
+}
+
+function writePoint(vertices, offset, [angle, latitude]) {
+    const a = angle * Math.PI / 180;
+    const l = latitude * Math.PI / 180;
+    vertices[offset] = GRATICULE_RADIUS * Math.cos(l) * Math.cos(a);
+    vertices[offset + 1] = GRATICULE_RADIUS * Math.sin(l);
+    vertices[offset + 2] = GRATICULE_RADIUS * Math.cos(l) * Math.sin(a);
+    return offset + 3;
+}
+
+// Fetch the precomputed buffer for a density from the Python server
+function fetchGraticuleBuffer(density = GRATICULE_DENSITY) {
+    const query = `meridians=${density.meridians}&parallel_step=${density.parallelStep}&step=${density.step}`;
+    return fetch(`/api/graticule?${query}`).then(response => {
+        if (!response.ok) {
+            throw new Error(`graticule request failed: ${response.status}`);
+        }
+        return response.arrayBuffer();
+    });
+}
+
+// The graticule object for a buffer from graticuleBuffer() or the server
+function createGraticule(buffer) {
+    const counts = new DataView(buffer, 0, 12);
+    const meridians = counts.getUint32(0, true);
+    const parallels = counts.getUint32(4, true);
+    const equator = counts.getUint32(8, true);
+
+    const geometry = new THREE.BufferGeometry();
+    geometry.setAttribute('position', new THREE.BufferAttribute(new Float32Array(buffer, 12), 3));
+    geometry.addGroup(0, meridians, 0);
+    geometry.addGroup(meridians, parallels, 1);
+    geometry.addGroup(meridians + parallels, equator, 2);
+    geometry.computeBoundingSphere();
+    return new THREE.LineSegments(geometry, GRATICULE_MATERIALS);
+}
+""",
+    'js/markers.js': """// City markers as one THREE.InstancedMesh: a single draw call for every city,
+// with the pulse, the day/night color and far-side culling done in the shader
+
+// Markers sit slightly above the globe surface (radius 2)
+const MARKER_RADIUS = 2.1;
+const DAY_COLOR = new THREE.Color(0xf59e0b);
+const NIGHT_COLOR = new THREE.Color(0x8b5cf6);
+
+// Grid used to find the marker under the pointer without testing every city
+const HIT_CELL_DEGREES = 5;
+
+// Out-of-the-way highlight position meaning "no marker highlighted"
+const NO_HIGHLIGHT = new THREE.Vector3(1e3, 1e3, 1e3);
+
+const markerVertexShader = `
+    uniform float time;
+    uniform vec3 highlight;
+    varying vec3 vColor;
+    varying float vPulse;
+
+    void main() {
+        // Marker center in the globe's frame and in the world
+        vec3 center = (instanceMatrix * vec4(0.0, 0.0, 0.0, 1.0)).xyz;
+        vec3 worldCenter = (modelMatrix * vec4(center, 1.0)).xyz;
+        vec3 globeCenter = (modelMatrix * vec4(0.0, 0.0, 0.0, 1.0)).xyz;
+
+        // Markers on the far side collapse to a point and produce no fragments
+        float facing = dot(normalize(worldCenter - globeCenter), normalize(cameraPosition - worldCenter));
+        float size = facing > 0.0 ? 1.0 : 0.0;
+
+        // Each city gets its own phase so the pulses do not beat in unison
+        float pulse = 0.5 + 0.5 * sin(time * 2.0 + dot(center, vec3(12.9898, 78.233, 37.719)));
+        size *= 1.0 + 0.2 * pulse;
+        if (distance(center, highlight) < 1e-4) {
+            size *= 1.5;
+        }
+
+        vColor = instanceColor;
+        vPulse = pulse;
+        gl_Position = projectionMatrix * modelViewMatrix * instanceMatrix * vec4(position * size, 1.0);
+    }
+`;
+
+const markerFragmentShader = `
+    varying vec3 vColor;
+    varying float vPulse;
+
+    void main() {
+        // Brightness follows the pulse in place of the old per-city point lights
+        gl_FragColor = vec4(vColor * (0.8 + 0.4 * vPulse), 1.0);
+    }
+`;
+
+// Position of a longitude/latitude on the marker shell, in the globe's frame
+function markerPosition(longitude, latitude, target) {
+    const phi = (90 - latitude) * Math.PI / 180;
+    const theta = (longitude + 180) * Math.PI / 180;
+    return target.set(
+        -MARKER_RADIUS * Math.sin(phi) * Math.cos(theta),
+        MARKER_RADIUS * Math.cos(phi),
+        MARKER_RADIUS * Math.sin(phi) * Math.sin(theta)
+    );
+}
+
+function hitCell(longitude, latitude) {
+    const columns = 360 / HIT_CELL_DEGREES;
+    const row = Math.min(Math.floor((latitude + 90) / HIT_CELL_DEGREES), 180 / HIT_CELL_DEGREES - 1);
+    const column = ((Math.floor((longitude + 180) / HIT_CELL_DEGREES) % columns) + columns) % columns;
+    return row * columns + column;
+}
+
+// Build the marker layer for [{name, longitude, latitude, daylight}]
+function createMarkerLayer(cities) {
+    const geometry = new THREE.SphereGeometry(0.05, 8, 6);
+    const material = new THREE.ShaderMaterial({
+        uniforms: {
+            time: { value: 0 },
+            highlight: { value: NO_HIGHLIGHT.clone() }
+        },
+        vertexShader: markerVertexShader,
+        fragmentShader: markerFragmentShader
+    });
+    const mesh = new THREE.InstancedMesh(geometry, material, cities.length);
+    // Created up front rather than by the first setColorAt, so the shader's
+    // instanceColor attribute and needsUpdate below exist even with no cities
+    mesh.instanceColor = new THREE.InstancedBufferAttribute(new Float32Array(cities.length * 3), 3);
+    // The bounding sphere would be that of one marker; culling happens in the shader
+    mesh.frustumCulled = false;
+
+    const layer = {
+        mesh: mesh,
+        names: [],
+        index: new Map(),
+        positions: new Float32Array(cities.length * 3),
+        grid: new Map()
+    };
+
+    const matrix = new THREE.Matrix4();
+    const position = new THREE.Vector3();
+    cities.forEach((city, i) => {
+        markerPosition(city.longitude, city.latitude, position);
+        matrix.makeTranslation(position.x, position.y, position.z);
+        mesh.setMatrixAt(i, matrix);
+        mesh.setColorAt(i, city.daylight ? DAY_COLOR : NIGHT_COLOR);
+        position.toArray(layer.positions, i * 3);
+
+        layer.names.push(city.name);
+        layer.index.set(city.name, i);
+        const cell = hitCell(city.longitude, city.latitude);
+        if (!layer.grid.has(cell)) {
+            layer.grid.set(cell, []);
+        }
+        layer.grid.get(cell).push(i);
+    });
+    mesh.instanceMatrix.needsUpdate = true;
+    mesh.instanceColor.needsUpdate = true;
+    return layer;
+}
+
+function disposeMarkerLayer(layer) {
+    layer.mesh.parent && layer.mesh.parent.remove(layer.mesh);
+    layer.mesh.geometry.dispose();
+    layer.mesh.material.dispose();
+}
+
+// Switch one city between the day and night color
+function setMarkerDaylight(layer, name, daylight) {
+    const i = layer.index.get(name);
+    if (i !== undefined) {
+        layer.mesh.setColorAt(i, daylight ? DAY_COLOR : NIGHT_COLOR);
+        layer.mesh.instanceColor.needsUpdate = true;
+    }
+}
+
+// Advance the pulse; the only per-frame work the layer needs
+function animateMarkers(layer, seconds) {
+    layer.mesh.material.uniforms.time.value = seconds;
+}
+
+// Enlarge one city's marker, or none with null
+function highlightMarker(layer, name) {
+    const highlight = layer.mesh.material.uniforms.highlight.value;
+    const i = name === null ? undefined : layer.index.get(name);
+    if (i === undefined) {
+        highlight.copy(NO_HIGHLIGHT);
+    } else {
+        highlight.fromArray(layer.positions, i * 3);
+    }
+}
+
+// Name of the city whose marker the ray passes through, or null
+//
+// The ray is intersected with the marker shell analytically, the hit is turned
+// back into longitude/latitude on the (rotated) globe and only the markers in
+// the neighbouring grid cells are compared, whatever the number of cities.
+const hitSphere = new THREE.Sphere();
+const hitPoint = new THREE.Vector3();
+function markerAtRay(layer, ray, maxDistance = 0.08) {
+    const parent = layer.mesh.parent;
+    parent.getWorldPosition(hitSphere.center);
+    hitSphere.radius = MARKER_RADIUS;
+    if (ray.intersectSphere(hitSphere, hitPoint) === null) {
+        return null;
+    }
+    parent.worldToLocal(hitPoint);
+
+    const latitude = 90 - Math.acos(Math.max(-1, Math.min(1, hitPoint.y / MARKER_RADIUS))) * 180 / Math.PI;
+    const longitude = Math.atan2(hitPoint.z, -hitPoint.x) * 180 / Math.PI - 180;
+
+    // Neighbouring cells; rows near the poles span more columns for the same distance
+    const reach = maxDistance / MARKER_RADIUS * 180 / Math.PI;
+    const rows = 180 / HIT_CELL_DEGREES;
+    const columns = 360 / HIT_CELL_DEGREES;
+    const cosLatitude = Math.max(Math.cos(latitude * Math.PI / 180), 1e-3);
+    const columnReach = Math.min(Math.ceil(reach / cosLatitude / HIT_CELL_DEGREES) + 1, columns / 2);
+    const center = hitCell(longitude, latitude);
+    const centerRow = Math.floor(center / columns);
+    const centerColumn = center % columns;
+
+    let best = null;
+    let bestDistance = maxDistance * maxDistance;
+    for (let row = Math.max(centerRow - 1, 0); row <= Math.min(centerRow + 1, rows - 1); row++) {
+        for (let offset = -columnReach; offset <= columnReach; offset++) {
+            const column = ((centerColumn + offset) % columns + columns) % columns;
+            const bucket = layer.grid.get(row * columns + column);
+            if (!bucket) {
+                continue;
+            }
+            for (const i of bucket) {
+                const dx = layer.positions[i * 3] - hitPoint.x;
+                const dy = layer.positions[i * 3 + 1] - hitPoint.y;
+                const dz = layer.positions[i * 3 + 2] - hitPoint.z;
+                const distance = dx * dx + dy * dy + dz * dz;
+                if (distance < bestDistance) {
+                    bestDistance = distance;
+                    best = layer.names[i];
+                }
+            }
+        }
+    }
+    return best;
+}
+"""
+}
@@ -0,0 +1,92 @@
+"""Globe graticule (meridians, parallels, equator) as one binary vertex buffer
+
+The buffer is what web/js/graticule.js builds in the browser, precomputed so
+the page can upload it to a THREE.LineSegments geometry without generating
+anything:
+
+    header     uint32 vertex counts of the meridians, parallels and equator
+    vertices   float32 x, y, z per vertex, in that order
+
+Each consecutive pair of vertices is one line segment. Everything is
+little-endian and the vertices start 4-byte aligned, so a Float32Array can
+view them in place.
+"""
+import gzip
+import math
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+# Radius of the globe sphere in the scene
+GLOBE_RADIUS = 2.0
+
+# Default density: meridians around the globe, degrees between parallels and
+# degrees between the vertices along every line
+MERIDIANS = 24
+PARALLEL_STEP = 20
+STEP_DEGREES = 1.0
+
+# Vertex counts of the meridians, parallels and equator
+HEADER = struct.Struct("<III")
+
+# gzip level for the served buffer; it repeats a lot and shrinks to a quarter
+GZIP_LEVEL = 6
+
+
+def globe_point(angle, lat, radius=GLOBE_RADIUS):
+    """Scene position of latitude lat at angle degrees around the y axis"""
+    angle_rad = math.radians(angle)
+    lat_rad = math.radians(lat)
+    return (
+        radius * math.cos(lat_rad) * math.cos(angle_rad),
+        radius * math.sin(lat_rad),
+        radius * math.cos(lat_rad) * math.sin(angle_rad)
+    )
+
+
+def add_polyline(vertices, points):
+    """Append the polyline through points as separate segments"""
+    previous = None
+    for point in points:
+        if previous is not None:
+            vertices.extend(previous)
+            vertices.extend(point)
+        previous = point
+
+
+@lru_cache(maxsize=8)
+def graticule_buffer(meridians=MERIDIANS, parallel_step=PARALLEL_STEP, step=STEP_DEGREES):
+    """Return the encoded graticule for the given density
+
+    Parallels are drawn every parallel_step degrees either side of the
+    equator, which has its own line.
+    """
+    vertices = array("f")
+    counts = []
+
+    steps = math.ceil(180 / step)
+    for i in range(meridians):
+        angle = 360 * i / meridians
+        add_polyline(vertices, (globe_point(angle, -90 + 180 * j / steps) for j in range(steps + 1)))
+    counts.append(len(vertices) // 3)
+
+    steps = math.ceil(360 / step)
+    parallels = [k * parallel_step for k in range(-math.ceil(90 / parallel_step) + 1, math.ceil(90 / parallel_step))]
+    for lat in parallels:
+        if lat != 0:
+            add_polyline(vertices, (globe_point(360 * j / steps, lat) for j in range(steps + 1)))
+    counts.append(len(vertices) // 3 - sum(counts))
+
+    add_polyline(vertices, (globe_point(360 * j / steps, 0) for j in range(steps + 1)))
+    counts.append(len(vertices) // 3 - sum(counts))
+
+    if sys.byteorder == "big":
+        vertices.byteswap()
+    return HEADER.pack(*counts) + vertices.tobytes()
+
+
+@lru_cache(maxsize=8)
+def compressed_graticule(meridians=MERIDIANS, parallel_step=PARALLEL_STEP, step=STEP_DEGREES):
+    """graticule_buffer() gzip-compressed, for clients that accept it"""
+    return gzip.compress(graticule_buffer(meridians, parallel_step, step), GZIP_LEVEL)
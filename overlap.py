@@ -0,0 +1,246 @@
+"""Overlapping working hours of cities over a UTC range
+
+Every city has local working hours on some weekdays (WorkingHours). Each
+local day's window is converted to a UTC interval with the city's compiled
+ZoneTable, using the offset in force at that local time, so the days on
+either side of a DST change get intervals shifted by the change. A sweep
+line then walks all interval ends in time order keeping track of who is at
+work, and the overlaps are the stretches where enough cities are at work at
+once. Cities sharing a zone and working hours have identical intervals, so
+they are swept as one group.
+"""
+import bisect
+import math
+
+DAY = 86400
+
+# Local days before a UTC instant whose windows may still be open at it:
+# offsets reach +14 h and a window may run past midnight
+LOOKBEHIND_DAYS = 2
+
+# Seconds before a local time that are certainly before the UTC instant it
+# maps to, whatever the offset
+SEARCH_MARGIN = DAY
+
+WEEKDAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+WORKING_DAYS = frozenset(range(5))
+
+
+def parse_clock(text):
+    """Seconds since midnight of "HH:MM" (or "24:00")"""
+    hours, _, minutes = text.strip().partition(":")
+    try:
+        hours, minutes = int(hours), int(minutes or 0)
+    except ValueError:
+        raise ValueError(f"bad time of day: {text!r}") from None
+    seconds = hours * 3600 + minutes * 60
+    if not 0 <= minutes < 60 or not 0 <= seconds <= DAY:
+        raise ValueError(f"bad time of day: {text!r}")
+    return seconds
+
+
+def parse_weekdays(text):
+    """Weekday numbers (Monday 0) of e.g. "mon-fri", "sun-thu" or "mon,wed,fri" """
+    days = set()
+    for item in text.lower().split(","):
+        first, _, last = item.strip().partition("-")
+        try:
+            first = WEEKDAY_NAMES.index(first.strip()[:3])
+            last = WEEKDAY_NAMES.index(last.strip()[:3]) if last else first
+        except ValueError:
+            raise ValueError(f"bad weekdays: {text!r}") from None
+        # Ranges may wrap past Sunday, e.g. "sat-mon"
+        days.update(day % 7 for day in range(first, first + (last - first) % 7 + 1))
+    return frozenset(days)
+
+
+class WorkingHours:
+    """A local window of working time on some weekdays
+
+    start and end are seconds since local midnight; an end at or before the
+    start runs past midnight into the next day. weekdays holds the days
+    (Monday 0) on which a window starts.
+    """
+
+    __slots__ = ("start", "end", "weekdays")
+
+    def __init__(self, start=9 * 3600, end=17 * 3600, weekdays=WORKING_DAYS):
+        self.start = start
+        self.end = end
+        self.weekdays = frozenset(weekdays)
+
+    @classmethod
+    def parse(cls, hours, weekdays=None):
+        """WorkingHours from "HH:MM-HH:MM" and optionally weekdays like "mon-fri" """
+        start, separator, end = hours.partition("-")
+        if not separator:
+            raise ValueError(f"bad working hours: {hours!r}")
+        return cls(parse_clock(start), parse_clock(end),
+                   WORKING_DAYS if weekdays is None else parse_weekdays(weekdays))
+
+    @property
+    def length(self):
+        length = (self.end - self.start) % DAY
+        return length or DAY
+
+    def key(self):
+        return self.start, self.end, self.weekdays
+
+    def __repr__(self):
+        def clock(seconds):
+            return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}"
+        days = ",".join(WEEKDAY_NAMES[day] for day in sorted(self.weekdays))
+        return f"WorkingHours({clock(self.start)}-{clock(self.end)} {days})"
+
+
+class Overlap:
+    """A UTC stretch [start, stop) during which the same cities are all at work"""
+
+    __slots__ = ("start", "stop", "cities")
+
+    def __init__(self, start, stop, cities):
+        self.start = start
+        self.stop = stop
+        self.cities = cities
+
+    @property
+    def duration(self):
+        return self.stop - self.start
+
+    def __repr__(self):
+        return f"Overlap({self.start}, {self.stop}, {len(self.cities)} cities)"
+
+
+def local_to_utc(zone, local_seconds):
+    """UTC epoch second at which a ZoneTable's wall clock reads local_seconds
+
+    A local time repeated when clocks go back maps to its first occurrence;
+    one skipped when they go forward maps to the change itself, the first
+    instant the clock reads past it.
+    """
+    starts, offsets = zone.starts, zone.offsets
+    last = len(starts) - 1
+    i = bisect.bisect_right(starts, local_seconds - SEARCH_MARGIN) - 1
+    while True:
+        utc = local_seconds - offsets[i]
+        if i == last or utc < starts[i + 1]:
+            return utc
+        if local_seconds - offsets[i + 1] < starts[i + 1]:
+            return starts[i + 1]
+        i += 1
+
+
+def working_intervals(zone, hours, start, stop):
+    """UTC [begin, end) of every working window of a zone's local days, clipped to [start, stop)"""
+    starts, offsets = zone.starts, zone.offsets
+    weekdays = hours.weekdays
+    length = hours.length
+    intervals = []
+    # Local times that the period found last maps certainly and alone: more
+    # than a day from its ends, where no other period's offset can reach
+    low = high = offset = 0
+    first_day = (start + zone.offset_at(start)) // DAY - LOOKBEHIND_DAYS
+    last_day = (stop + zone.offset_at(stop)) // DAY
+    for day in range(first_day, last_day + 1):
+        # 1970-01-01, local day 0, was a Thursday
+        if (day + 3) % 7 not in weekdays:
+            continue
+        local_start = day * DAY + hours.start
+        local_end = local_start + length
+        if low <= local_start and local_end < high:
+            begin = local_start - offset
+            end = local_end - offset
+        else:
+            begin = local_to_utc(zone, local_start)
+            end = local_to_utc(zone, local_end)
+            i = zone.period(begin)
+            offset = offsets[i]
+            low = starts[i] + offset + DAY
+            high = starts[i + 1] + offset - DAY if i + 1 < len(starts) else math.inf
+        if begin < start:
+            begin = start
+        if end > stop:
+            end = stop
+        if begin < end:
+            intervals.append((begin, end))
+    return intervals
+
+
+def find_overlaps(schedules, start, stop, quorum=None, min_duration=0):
+    """Overlapping working hours of cities during the UTC range [start, stop)
+
+    schedules are (city, ZoneTable, WorkingHours) triples. Returns Overlaps in
+    time order: maximal stretches during which at least quorum cities
+    (default: all of them) are at work, each listing exactly the cities at
+    work throughout it, and lasting at least min_duration seconds.
+    """
+    names = []
+    groups = {}
+    for position, (city, zone, hours) in enumerate(schedules):
+        names.append(city)
+        groups.setdefault((id(zone), hours.key()), (zone, hours, []))[2].append(position)
+    quorum = len(names) if quorum is None else quorum
+    if quorum <= 0 or quorum > len(names) or start >= stop:
+        return []
+
+    # Events as single integers, which sort far faster than tuples: seconds
+    # since start, then the group, then 1 for a window opening, 0 closing
+    shift = (2 * len(groups)).bit_length()
+    group_mask = (1 << shift - 1) - 1
+    events = []
+    members = []
+    for group, (zone, hours, positions) in enumerate(groups.values()):
+        members.append(positions)
+        opening, closing = group << 1 | 1, group << 1
+        for begin, end in working_intervals(zone, hours, start, stop):
+            events.append((begin - start) << shift | opening)
+            events.append((end - start) << shift | closing)
+    events.sort()
+    span = stop - start
+    # Past every real event, so the last instant is settled like the others
+    events.append((span + 1) << shift)
+
+    counts = [0] * len(members)
+    # Positions and names of the cities at work, kept sorted by position so
+    # an overlap's cities are a copy of the names
+    working_positions = []
+    working_names = []
+    # Groups that started or stopped working at the current instant; applying
+    # every event at an instant before comparing means windows that end as
+    # another begins do not split an overlap
+    flipped = set()
+    overlaps = []
+    open_start = open_names = None
+    instant = 0
+    for event in events:
+        now = event >> shift
+        if now != instant:
+            if flipped:
+                flipped.clear()
+                moment = start + instant
+                if open_start is not None and moment - open_start >= min_duration:
+                    overlaps.append(Overlap(open_start, moment, open_names))
+                open_start = open_names = None
+                if len(working_names) >= quorum:
+                    open_start = moment
+                    open_names = working_names[:]
+            if now > span:
+                break
+            instant = now
+
+        group = event >> 1 & group_mask
+        count = counts[group] = counts[group] + (1 if event & 1 else -1)
+        if count == 1 and event & 1:
+            for position in members[group]:
+                index = bisect.bisect_left(working_positions, position)
+                working_positions.insert(index, position)
+                working_names.insert(index, names[position])
+        elif count == 0:
+            for position in members[group]:
+                index = bisect.bisect_left(working_positions, position)
+                del working_positions[index]
+                del working_names[index]
+        else:
+            continue
+        flipped ^= {group}
+    return overlaps
@@ -0,0 +1,277 @@
+"""Multi-process serving: one supervisor, N pre-forked server processes
+
+Each process runs its own ThreadedHTTPServer, so JSON building and request
+parsing are spread over cores instead of sharing one GIL. The supervisor
+binds the port, forks the processes, restarts any that die and replaces
+them all on SIGHUP. SIGINT or SIGTERM drains and stops everything.
+
+The supervisor is also the single producer of the per-second time snapshot
+(sharedtime.SharedSnapshot) the processes serve /api/time-data from, so the
+time data is computed once per second in total rather than once per process.
+
+POSIX only (needs os.fork).
+"""
+import os
+import select
+import signal
+import socket
+import threading
+import time
+import traceback
+
+import server
+from sharedtime import SharedSnapshot
+from server import AppHandler, DEFAULT_WORKERS, LISTEN_BACKLOG, SHUTDOWN_GRACE, ThreadedHTTPServer
+
+# A process that exits sooner than this after starting counts as a crash loop
+MIN_PROCESS_UPTIME = 1.0
+
+# Longest wait between restarts while processes keep crashing
+MAX_RESTART_DELAY = 30.0
+
+# Seconds between supervisor checks when no signal arrives
+SUPERVISE_INTERVAL = 1.0
+
+
+def reserve_port(host, port):
+    """Bind (without listening) a SO_REUSEPORT socket to claim a port
+
+    The server processes then bind their own listening sockets to the same
+    port and the kernel balances new connections between them. A socket
+    that is not listening never receives connections itself.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    return sock
+
+
+class Supervisor:
+    """Pre-forks server processes on one port and keeps `processes` of them running
+
+    By default the listening socket is bound once here and inherited by every
+    process; it stays open across restarts and reloads, so no connection is
+    refused while processes come and go. With reuse_port each process binds
+    its own SO_REUSEPORT socket instead, which spreads connections more
+    evenly but resets connections still queued on a process that exits.
+
+    setup, if given, runs here before the first processes are forked and
+    again on every reload (SIGHUP), e.g. to reread the cities file; if it
+    fails on reload the running processes are kept. The time snapshot is
+    published at snapshot_path (default: a file in the temp directory),
+    where other processes such as the GUI can attach to it too.
+    """
+
+    def __init__(self, host="", port=8081, processes=None, workers=DEFAULT_WORKERS,
+                 handler=AppHandler, reuse_port=False, setup=None, grace=SHUTDOWN_GRACE,
+                 snapshot_path=None):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Multi-process serving needs os.fork, which this platform lacks")
+        self.host = host
+        self.processes = processes or os.cpu_count() or 1
+        self.workers = workers
+        self.handler = handler
+        self.reuse_port = reuse_port
+        self.setup = setup
+        self.grace = grace
+        self.snapshot_path = snapshot_path
+        self.snapshot = None
+
+        if reuse_port:
+            self.sock = reserve_port(host, port)
+        else:
+            self.sock = socket.create_server((host, port), backlog=LISTEN_BACKLOG)
+        self.port = self.sock.getsockname()[1]
+
+        self.pid = os.getpid()
+        # pid -> start time of the current processes
+        self.children = {}
+        # pid -> kill deadline of replaced processes that are still draining
+        self.retiring = {}
+        self.pending = []
+        self.restart_delay = 0
+        self.restart_at = 0
+        self.stopping = False
+
+    def run(self):
+        """Fork the processes and supervise them until SIGINT or SIGTERM"""
+        wake_read, wake_write = os.pipe()
+        os.set_blocking(wake_read, False)
+        os.set_blocking(wake_write, False)
+        self.wake_fds = (wake_read, wake_write)
+        # Signal handlers only queue the signal; the pipe wakes the loop below
+        signal.set_wakeup_fd(wake_write)
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(signum, lambda signum, frame: self.pending.append(signum))
+
+        if self.setup is not None:
+            self.setup()
+        self.snapshot = SharedSnapshot.create(server.time_api, self.snapshot_path)
+        mode = "SO_REUSEPORT" if self.reuse_port else "shared socket"
+        print(f"Server started at http://localhost:{self.port} "
+              f"({self.processes} processes, {mode}, supervisor {self.pid})")
+        print(f"Time snapshot published at {self.snapshot.path}")
+
+        try:
+            while not self.stopping:
+                self.maintain()
+                timeout = min(SUPERVISE_INTERVAL, self.snapshot.publish_due())
+                select.select([wake_read], [], [], timeout)
+                try:
+                    while os.read(wake_read, 512):
+                        pass
+                except BlockingIOError:
+                    pass
+                self.handle_signals()
+                self.reap()
+        finally:
+            self.stop()
+            self.snapshot.close()
+            self.snapshot.unlink()
+            signal.set_wakeup_fd(-1)
+            os.close(wake_read)
+            os.close(wake_write)
+
+    def handle_signals(self):
+        while self.pending:
+            signum = self.pending.pop(0)
+            if signum in (signal.SIGINT, signal.SIGTERM):
+                self.stopping = True
+            elif signum == signal.SIGHUP:
+                self.reload()
+
+    def maintain(self):
+        """Fork missing processes and kill replaced ones that overran their grace"""
+        now = time.monotonic()
+        if len(self.children) < self.processes and now >= self.restart_at:
+            for _ in range(self.processes - len(self.children)):
+                self.spawn()
+        for pid, deadline in list(self.retiring.items()):
+            if now > deadline:
+                self.signal(pid, signal.SIGKILL)
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                self.run_process()
+            except BaseException:
+                traceback.print_exc()
+                status = 1
+            finally:
+                os._exit(status)
+        self.children[pid] = time.monotonic()
+
+    def run_process(self):
+        """Body of a forked server process"""
+        signal.set_wakeup_fd(-1)
+        for fd in self.wake_fds:
+            os.close(fd)
+        stop_requested = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop_requested.set())
+        # Ctrl+C reaches the whole process group; the supervisor coordinates the stop
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+        sock = self.sock
+        if self.reuse_port:
+            sock = socket.create_server((self.host, self.port), backlog=LISTEN_BACKLOG, reuse_port=True)
+            self.sock.close()
+        server.time_data_cache.shared = self.snapshot
+        httpd = ThreadedHTTPServer.from_socket(sock, self.handler, workers=self.workers)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+        # Also stop if the supervisor went away without telling us
+        while not stop_requested.wait(1) and os.getppid() == self.pid:
+            pass
+        httpd.stop(self.grace)
+        server.time_stream.close()
+
+    def reap(self):
+        """Collect exited processes and schedule restarts for unexpected exits"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if self.retiring.pop(pid, None) is not None:
+                continue
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+
+            print(f"Server process {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting")
+            # Back off while processes die right after starting
+            if time.monotonic() - started < MIN_PROCESS_UPTIME:
+                self.restart_delay = min(max(self.restart_delay * 2, 0.5), MAX_RESTART_DELAY)
+            else:
+                self.restart_delay = 0
+            self.restart_at = time.monotonic() + self.restart_delay
+
+    def reload(self):
+        """Replace every process with a fresh one; the old ones drain in-flight requests"""
+        if self.setup is not None:
+            try:
+                self.setup()
+            except Exception:
+                traceback.print_exc()
+                print("Reload failed, keeping the running processes")
+                return
+
+        # The city list may have changed: publish a new snapshot file. Draining
+        # processes keep the old mapping and compute locally once it goes stale.
+        snapshot = SharedSnapshot.create(server.time_api, self.snapshot_path)
+        if self.snapshot_path is None:
+            self.snapshot.unlink()
+        self.snapshot.close()
+        self.snapshot = snapshot
+        print(f"Time snapshot published at {snapshot.path}")
+
+        old = self.children
+        self.children = {}
+        self.restart_delay = self.restart_at = 0
+        for _ in range(self.processes):
+            self.spawn()
+        deadline = time.monotonic() + self.grace + 1
+        for pid in old:
+            self.retiring[pid] = deadline
+            self.signal(pid, signal.SIGTERM)
+        print(f"Reloaded: {len(old)} processes draining, {self.processes} started")
+
+    @staticmethod
+    def signal(pid, signum):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def stop(self):
+        """Drain every process, killing those still running after the grace period"""
+        self.stopping = True
+        for pid in list(self.children) + list(self.retiring):
+            self.signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.grace + 1
+        while (self.children or self.retiring) and time.monotonic() < deadline:
+            time.sleep(0.05)
+            self.collect()
+        for pid in list(self.children) + list(self.retiring):
+            self.signal(pid, signal.SIGKILL)
+        while self.children or self.retiring:
+            self.collect(block=True)
+        self.sock.close()
+
+    def collect(self, block=False):
+        """Wait for exited processes while stopping"""
+        try:
+            pid, _ = os.waitpid(-1, 0 if block else os.WNOHANG)
+        except ChildProcessError:
+            self.children.clear()
+            self.retiring.clear()
+            return
+        self.children.pop(pid, None)
+        self.retiring.pop(pid, None)
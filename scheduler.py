@@ -0,0 +1,264 @@
+"""Wall-clock aligned ticks on a Tk event loop
+
+Polling with root.after(100) or after(1000) redraws far more often than
+anything changes, and a fixed delay after the previous pass drifts: the work
+itself and timer latency push every wakeup a little later until a second is
+skipped or shown twice. TickScheduler instead computes each wakeup from the
+wall clock:
+
+    every_second   jobs run once per second, just after the second boundary,
+                   with that second's timestamp
+    every_frame    jobs run on boundaries of a separate frame rate (multiples
+                   of 1/fps), e.g. for the globe animation
+
+Only one Tk timer is pending at a time. When second and frame boundaries
+coincide they share a wakeup, and every job due at a wakeup runs in the same
+pass with the same clock sample. Each kind of tick records how far its
+wakeup was from the intended time (jitter) and how many boundaries it
+skipped because a wakeup came too late (missed ticks); a late wakeup runs
+its jobs once, never once per skipped boundary.
+"""
+import math
+import time
+
+# Seconds a wakeup aims past its boundary, so the clock read when it fires is
+# already past the boundary despite Tk's millisecond timer rounding
+BOUNDARY_SLACK = 0.002
+
+# Weight of the newest frame in the frame cost and frame rate moving averages
+FRAME_SMOOTHING = 0.1
+
+# FrameGovernor defaults: frame rate with no input for IDLE_AFTER seconds, and
+# the share of wall-clock time frame jobs may take
+IDLE_FPS = 2
+IDLE_AFTER = 30
+FRAME_BUDGET = 0.05
+
+# Fastest a budget-limited frame rate may fall while the window is visible
+MIN_FPS = 1
+
+
+class TickStats:
+    """Lateness and skipped boundaries of one kind of tick"""
+
+    __slots__ = ("ticks", "missed", "total_jitter", "max_jitter", "last_jitter")
+
+    def __init__(self):
+        self.ticks = 0
+        self.missed = 0
+        self.total_jitter = 0.0
+        self.max_jitter = 0.0
+        self.last_jitter = 0.0
+
+    def record(self, jitter, missed):
+        self.ticks += 1
+        self.missed += missed
+        self.total_jitter += jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        self.last_jitter = jitter
+
+    @property
+    def mean_jitter(self):
+        return self.total_jitter / self.ticks if self.ticks else 0.0
+
+    def __str__(self):
+        return (f"{self.ticks} ticks, {self.missed} missed, jitter mean "
+                f"{self.mean_jitter * 1000:.1f} ms, max {self.max_jitter * 1000:.1f} ms")
+
+
+class TickScheduler:
+    """One-timer scheduler for 1 Hz and frame-rate work on a Tk root
+
+    `root` only needs after() and after_cancel(); `clock` returns wall-clock
+    epoch seconds.
+    """
+
+    def __init__(self, root, clock=time.time):
+        self.root = root
+        self.clock = clock
+        self.second_jobs = []
+        self.frame_jobs = []
+        self.frame_interval = None
+        self.next_second = None
+        self.next_frame = None
+        self.pending = None
+        self.wakeups = 0
+        self.seconds = TickStats()
+        self.frames = TickStats()
+        # Moving averages of the seconds frame jobs take and between frames
+        self.frame_cost = 0.0
+        self.frame_period = None
+        self.last_frame = None
+
+    def every_second(self, callback):
+        """Call callback(timestamp) once per second, just after each boundary"""
+        self.second_jobs.append(callback)
+
+    def every_frame(self, callback, fps=None):
+        """Call callback(timestamp) on every frame; fps, if given, sets the frame rate"""
+        self.frame_jobs.append(callback)
+        if fps is not None:
+            self.set_frame_rate(fps)
+
+    def set_frame_rate(self, fps):
+        """Change the frame rate; 0 or None stops frames until set again"""
+        interval = 1 / fps if fps else None
+        if interval == self.frame_interval:
+            return
+        self.frame_interval = interval
+        self.next_frame = None
+        self.last_frame = None
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.schedule(self.clock())
+
+    @property
+    def frame_rate(self):
+        """Frame rate asked for"""
+        return 1 / self.frame_interval if self.frame_interval else 0
+
+    @property
+    def measured_frame_rate(self):
+        """Frame rate achieved recently, 0 while frames are stopped"""
+        if self.frame_interval is None or not self.frame_period:
+            return 0
+        return 1 / self.frame_period
+
+    def start(self):
+        """Run every job once now, then follow the boundaries"""
+        now = self.clock()
+        for job in self.second_jobs + self.frame_jobs:
+            job(now)
+        self.next_second = math.floor(now) + 1
+        self.next_frame = None
+        self.schedule(now)
+
+    def stop(self):
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+
+    def schedule(self, now):
+        target = self.next_second
+        if self.frame_interval is not None:
+            if self.next_frame is None:
+                self.next_frame = math.floor(now / self.frame_interval) + 1
+            target = min(target, self.next_frame * self.frame_interval)
+        delay = max(0, math.ceil((target - now + BOUNDARY_SLACK) * 1000))
+        self.pending = self.root.after(delay, self.wake)
+
+    def wake(self):
+        self.pending = None
+        self.wakeups += 1
+        self.run(self.clock())
+
+    def run(self, now):
+        """Run every job whose boundary has passed, all with the clock sample now"""
+        second = math.floor(now)
+        if second >= self.next_second:
+            self.seconds.record(abs(now - second - BOUNDARY_SLACK), second - self.next_second)
+            for job in self.second_jobs:
+                job(now)
+            self.next_second = second + 1
+
+        interval = self.frame_interval
+        if interval is not None:
+            frame = math.floor(now / interval)
+            # next_frame is None right after a rate change; schedule() sets it
+            if self.next_frame is not None and frame >= self.next_frame:
+                self.frames.record(abs(now - frame * interval - BOUNDARY_SLACK), frame - self.next_frame)
+                started = time.perf_counter()
+                for job in self.frame_jobs:
+                    job(now)
+                self.frame_cost += FRAME_SMOOTHING * (time.perf_counter() - started - self.frame_cost)
+                if self.last_frame is not None:
+                    period = now - self.last_frame
+                    if self.frame_period is None:
+                        self.frame_period = period
+                    self.frame_period += FRAME_SMOOTHING * (period - self.frame_period)
+                self.last_frame = now
+                self.next_frame = frame + 1
+
+        self.schedule(now)
+
+    def report(self):
+        """One line with the wakeup count and both tick kinds' statistics"""
+        text = f"{self.wakeups} wakeups; seconds: {self.seconds}"
+        if self.frame_jobs:
+            text += f"; frames at {self.frame_rate:g} fps: {self.frames}"
+        return text
+
+
+class FrameGovernor:
+    """Picks a TickScheduler's frame rate from window state, input and a budget
+
+    Frames stop while the window is unmapped (minimized, withdrawn) or fully
+    obscured, run at idle_fps once there has been no input for idle_after
+    seconds and at active_fps otherwise. budget caps the share of wall-clock
+    time the frame jobs may take, as measured by the scheduler, so expensive
+    frames lower the rate instead of the machine's idle time. target_fps is
+    the rate asked for; the scheduler's measured_frame_rate is the one
+    achieved.
+    """
+
+    def __init__(self, scheduler, active_fps, idle_fps=IDLE_FPS, idle_after=IDLE_AFTER,
+                 budget=FRAME_BUDGET, clock=time.monotonic):
+        self.scheduler = scheduler
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+        self.budget = budget
+        self.clock = clock
+        self.root = None
+        self.visible = True
+        self.last_input = clock()
+        self.target_fps = active_fps
+        scheduler.every_second(self.refresh)
+
+    def bind(self, root):
+        """Follow root's map state and the input to any of its widgets"""
+        self.root = root
+        root.bind("<Map>", lambda event: self.set_visible(event, True), add="+")
+        root.bind("<Unmap>", lambda event: self.set_visible(event, False), add="+")
+        root.bind("<Visibility>", self.on_visibility, add="+")
+        for sequence in ("<Motion>", "<ButtonPress>", "<KeyPress>", "<MouseWheel>", "<FocusIn>"):
+            root.bind(sequence, self.on_input, add="+")
+
+    def set_visible(self, event, visible):
+        # Child widgets' events reach the root binding too; only the window counts
+        if event.widget is self.root:
+            self.visible = visible
+            self.refresh()
+
+    def on_visibility(self, event):
+        self.set_visible(event, event.state != "VisibilityFullyObscured")
+
+    def on_input(self, event=None):
+        self.last_input = self.clock()
+        if self.target_fps != self.active_fps:
+            self.refresh()
+
+    @property
+    def current_fps(self):
+        return self.scheduler.measured_frame_rate
+
+    @property
+    def idle(self):
+        return self.clock() - self.last_input >= self.idle_after
+
+    def refresh(self, timestamp=None):
+        """Recompute the target frame rate and hand it to the scheduler"""
+        if not self.visible:
+            target = 0
+        else:
+            target = self.idle_fps if self.idle else self.active_fps
+            cost = self.scheduler.frame_cost
+            if cost > 0:
+                target = min(target, max(MIN_FPS, math.floor(self.budget / cost)))
+        self.target_fps = target
+        self.scheduler.set_frame_rate(target)
+
+    def report(self):
+        state = "hidden" if not self.visible else "idle" if self.idle else "active"
+        return (f"{state}, {self.current_fps:.1f} of {self.target_fps:g} fps, "
+                f"frames {self.scheduler.frame_cost * 1000:.2f} ms")
@@ -0,0 +1,940 @@
+import gzip
+import hashlib
+import json
+import math
+import signal
+import socket
+import threading
+import time
+import http.server
+from array import array
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, unquote
+
+from assets import AssetStore, accepts_encoding, etag_matches
+from cities import default_cities
+from graticule import MERIDIANS, PARALLEL_STEP, STEP_DEGREES, compressed_graticule, graticule_buffer
+from overlap import DAY, LOOKBEHIND_DAYS, WorkingHours, find_overlaps
+from spatial import SpatialIndex
+from timesource import TimeSource, get_timezone
+from tztables import TransitionTables, format_offset, wall_clock, year_start
+from wireformat import FORMATS, city_list_id, encode_binary, encode_columns, negotiate
+
+# Ports tried by bind_available_port when a starting port is given
+PORT_SEARCH_LIMIT = 100
+
+# Listen backlog for sockets we bind ourselves; the socketserver default of 5
+# resets bursts of clients
+LISTEN_BACKLOG = 128
+
+# Connections handled at once; further accepted connections wait for a worker
+DEFAULT_WORKERS = 32
+
+# Seconds an idle keep-alive connection is held open
+KEEPALIVE_TIMEOUT = 5
+
+# Seconds stop() waits for in-flight connections to finish
+SHUTDOWN_GRACE = 5
+
+# Seconds a stream subscriber may block a send before it is dropped
+STREAM_SEND_TIMEOUT = 0.05
+
+# gzip level for cached responses; the body is compressed once per second
+GZIP_LEVEL = 6
+
+# Fields that change only occasionally; the time itself is derived by clients
+STREAM_FIELDS = ("offset", "date", "daylight")
+
+# /api/time-range limits: smallest step in seconds, most instants per request
+# (a year of minutes) and the years instants may fall in
+MIN_RANGE_STEP = 60
+MAX_RANGE_INSTANTS = 527040
+RANGE_YEARS = (1970, 2099)
+
+# Cities x instants computed and sent per time-range chunk
+RANGE_CHUNK_CELLS = 65536
+
+# Longest UTC range /api/overlaps searches
+MAX_OVERLAP_DAYS = 366
+
+
+class TimeDataAPI:
+    """Class to provide time data to the web component
+
+    `cities` is a cities.CityRegistry (any {city: zone} mapping works, without
+    coordinates). City metadata that never changes (display name, zone,
+    [longitude, latitude] or null) is built and serialized once at
+    construction and served from /api/cities. get_time_data() only produces
+    the per-second fields.
+    """
+
+    def __init__(self, cities, time_source=None, tables=None):
+        self.cities = cities
+        self.time_source = time_source or TimeSource()
+        self.tables = tables
+        self.index = None
+        # Tables compiled for time-range queries outside `tables`' window
+        self.range_cache = None
+        # Held while building the index or range tables, so requests that need
+        # them at once wait for one build
+        self.lock = threading.Lock()
+
+        self.city_info = {}
+        for city_id, (city, tz_name) in enumerate(cities.items()):
+            position = cities.coords(city_id) if hasattr(cities, "coords") else None
+            self.city_info[city] = {
+                "name": city,
+                "timezone": tz_name,
+                "coords": None if position is None else [round(value, 4) for value in position]
+            }
+        self.city_info_body = json.dumps(self.city_info).encode()
+        self.city_info_etag = '"%s"' % hashlib.sha1(self.city_info_body).hexdigest()
+        self.city_list_id = city_list_id(self.city_info_body)
+
+    def get_time_data(self, instant=None, include_static=False):
+        """Returns current time data for all time zones
+
+        With include_static, each entry also carries its timezone and coords.
+        """
+        if instant is None:
+            instant = self.time_source.tick()
+        if self.tables is not None:
+            time_data = self.get_compiled_time_data(instant)
+        else:
+            time_data = {}
+            for city, tz_name in self.cities.items():
+                now = self.time_source.local_time(tz_name, instant)
+
+                time_data[city] = {
+                    "time": now.strftime("%H:%M:%S"),
+                    "hour": now.hour,
+                    "minute": now.minute,
+                    "second": now.second,
+                    "offset": now.strftime("%z"),
+                    "date": now.strftime("%Y-%m-%d"),
+                    "daylight": True if 6 <= now.hour < 18 else False
+                }
+
+        if include_static:
+            for city, entry in time_data.items():
+                info = self.city_info[city]
+                entry["timezone"] = info["timezone"]
+                entry["coords"] = info["coords"]
+        return time_data
+
+    def get_offsets(self, instant):
+        """Every city's UTC offset in seconds at instant, in city order, as array('i')"""
+        if self.tables is not None:
+            return array("i", self.tables.snapshot(instant.timestamp()).offsets)
+        local_time = self.time_source.local_time
+        return array("i", [
+            int(local_time(tz_name, instant).utcoffset().total_seconds()) for tz_name in self.cities.values()
+        ])
+
+    def range_tables(self, start, stop):
+        """TransitionTables whose window covers [start, stop)
+
+        The serving tables are used when they cover it; otherwise tables are
+        compiled for a window spanning both the range and the default years
+        and kept for the next query.
+        """
+        if self.tables is not None and self.tables.covers(start, stop):
+            return self.tables
+        tables = self.range_cache
+        if tables is not None and tables.covers(start, stop):
+            return tables
+        with self.lock:
+            tables = self.range_cache
+            if tables is None or not tables.covers(start, stop):
+                this_year = time.gmtime().tm_year
+                first_year = min(time.gmtime(start).tm_year, this_year - 1)
+                last_year = max(time.gmtime(stop).tm_year, this_year + 5)
+                tables = self.range_cache = TransitionTables(self.cities, first_year, last_year)
+            return tables
+
+    def get_time_range(self, start, stop, step, chunk_cells=RANGE_CHUNK_CELLS):
+        """Yield tztables.RangeChunks for every city at start, start + step, ... before stop
+
+        Each chunk holds about chunk_cells cities x instants: per city (in
+        city order) an array of UTC offsets in seconds and one of local wall
+        times as epoch seconds, parallel to the chunk's instants.
+        """
+        tables = self.range_tables(start, stop)
+        chunk = max(1, chunk_cells // max(1, len(self.cities)))
+        return tables.time_range(start, stop, step, chunk)
+
+    def get_next_transitions(self, timestamp):
+        """{city: next offset change after timestamp, or None}
+
+        A change is {"at": UTC epoch second, "offset_before": seconds,
+        "offset_after": seconds, "dst": DST in force after it}.
+        """
+        tables = self.range_tables(timestamp, timestamp + 1)
+        result = {}
+        for city, transition in zip(tables.cities, tables.next_transitions(timestamp)):
+            if transition is not None:
+                at, before, after, dst = transition
+                transition = {"at": at, "offset_before": before, "offset_after": after, "dst": dst}
+            result[city] = transition
+        return result
+
+    def find_overlaps(self, hours, start, stop, quorum=None, min_duration=0):
+        """Overlapping working hours during [start, stop), see overlap.find_overlaps
+
+        hours maps the cities taking part to their WorkingHours (KeyError for
+        an unknown city).
+        """
+        # Windows opened on the local days before start may still be running
+        tables = self.range_tables(start - LOOKBEHIND_DAYS * DAY, stop + DAY)
+        schedules = [(city, tables.zone(self.cities[city]), window) for city, window in hours.items()]
+        return find_overlaps(schedules, start, stop, quorum, min_duration)
+
+    def spatial_index(self):
+        """SpatialIndex over the cities, built on first use"""
+        if self.index is None:
+            with self.lock:
+                if self.index is None:
+                    self.index = SpatialIndex(self.cities)
+        return self.index
+
+    def query_cities(self, query, lon, lat, value=None):
+        """Answer a /api/cities/<query> request, returns a JSON-ready dict or None
+
+        visible: names of the cities on the hemisphere (or a smaller cap of
+        `value` degrees) centered on (lon, lat).
+        nearest: the `value` (default 1) nearest cities with their distance.
+        within: cities within `value` km, nearest first.
+        """
+        index = self.spatial_index()
+        name = self.cities.name
+        if query == "visible":
+            angle = 90.0 if value is None else value
+            return {"cities": [name(city_id) for city_id in index.visible(lon, lat, angle)]}
+        if query == "nearest":
+            found = index.nearest(lon, lat, 1 if value is None else int(value))
+        elif query == "within" and value is not None:
+            found = index.within(lon, lat, value)
+        else:
+            return None
+        return {"cities": [
+            {"name": name(city_id), "distance_km": round(distance, 1)} for distance, city_id in found
+        ]}
+
+    def get_compiled_time_data(self, instant):
+        """Same payload as get_time_data, built from precompiled TransitionTables"""
+        time_data = {}
+        snapshot = self.tables.snapshot(instant.timestamp())
+        for city, offset, local in zip(snapshot.cities, snapshot.offsets, snapshot.local_seconds):
+            day, hour, minute, second = wall_clock(local)
+            time_data[city] = {
+                "time": f"{hour:02d}:{minute:02d}:{second:02d}",
+                "hour": hour,
+                "minute": minute,
+                "second": second,
+                "offset": format_offset(offset),
+                "date": day.isoformat(),
+                "daylight": 6 <= hour < 18
+            }
+        return time_data
+
+
+class TimeDataCache:
+    """Serialized /api/time-data bodies for the current epoch second
+
+    The payload only changes once a second, so each variant (wire format,
+    with or without static fields, plain or gzip) is built and encoded once
+    per second and the same bytes go to every request in that second. Builds
+    run under a lock: requests that arrive together at a second boundary wait
+    for one build instead of each doing their own. With a
+    sharedtime.SharedSnapshot attached as `shared`, the default JSON variants
+    and the offsets of the binary format are read from it instead of being
+    computed in this process.
+    """
+
+    def __init__(self, time_api, compress_level=GZIP_LEVEL, shared=None):
+        self.time_api = time_api
+        self.compress_level = compress_level
+        self.shared = shared
+        self.lock = threading.Lock()
+        # (epoch second, {(wire_format, include_static, compressed): body})
+        self.current = (None, {})
+
+    def get(self, include_static=False, compressed=False, wire_format="json"):
+        """Return the encoded body for this second, building it if needed
+
+        wire_format is one of wireformat.FORMATS; binary bodies never carry
+        static fields.
+        """
+        second = int(time.time())
+        if wire_format == "binary":
+            include_static = False
+        key = (wire_format, include_static, compressed)
+        cached_second, bodies = self.current
+        if cached_second == second and key in bodies:
+            return bodies[key]
+
+        with self.lock:
+            cached_second, bodies = self.current
+            if cached_second != second:
+                bodies = {}
+                self.current = (second, bodies)
+            if key not in bodies and self.shared is not None and wire_format == "json" and not include_static:
+                body = self.shared.body(second, compressed)
+                if body is not None:
+                    bodies[key] = body
+            if key not in bodies:
+                plain_key = (wire_format, include_static, False)
+                if plain_key not in bodies:
+                    bodies[plain_key] = self.encode(second, wire_format, include_static)
+                if compressed:
+                    bodies[key] = gzip.compress(bodies[plain_key], self.compress_level)
+            return bodies[key]
+
+    def encode(self, second, wire_format, include_static):
+        """Build one uncompressed body"""
+        instant = datetime.fromtimestamp(second, timezone.utc)
+        if wire_format == "binary":
+            offsets = self.shared.offsets(second) if self.shared is not None else None
+            if offsets is None:
+                offsets = self.time_api.get_offsets(instant)
+            return encode_binary(second, offsets, self.time_api.city_list_id)
+        data = self.time_api.get_time_data(instant, include_static=include_static)
+        if wire_format == "columns":
+            return encode_columns(second, data)
+        return json.dumps(data).encode()
+
+
+class TimeStream:
+    """Server-Sent Events feed of the time data
+
+    A subscriber first gets a `snapshot` event with every city's time entry
+    (static metadata comes from /api/cities),
+    then one `tick` event per second carrying the UTC epoch second and only
+    the cities whose offset, date or daylight flag changed. Clients derive
+    the clock from the tick and each city's offset. The deltas are computed
+    and encoded once per second on a single broadcast thread and the same
+    bytes are written to every subscriber socket. The thread runs only while
+    there are subscribers and stops for good once the stream is closed.
+    Subscribers are kept with the HTTP server they came through, so one
+    server stopping disconnects only its own (disconnect()) while the
+    stream goes on for the others; close() is for process shutdown.
+    """
+
+    def __init__(self, time_api):
+        self.time_api = time_api
+        self.lock = threading.Lock()
+        # {socket: HTTP server it was accepted by}
+        self.subscribers = {}
+        self.thread = None
+        self.closed = False
+        self.timestamp = None
+        self.data = None
+        self.snapshot_bytes = None
+
+    @staticmethod
+    def event(name, timestamp, payload):
+        return f"event: {name}\nid: {timestamp}\ndata: {json.dumps(payload)}\n\n".encode()
+
+    def refresh(self):
+        """Compute the time data for the current second, returns the changed cities"""
+        instant = self.time_api.time_source.tick()
+        data = self.time_api.get_time_data(instant)
+        timestamp = int(instant.timestamp())
+        previous = self.data or {}
+        changed = {}
+        for city, entry in data.items():
+            old = previous.get(city)
+            if old is None or any(old[field] != entry[field] for field in STREAM_FIELDS):
+                changed[city] = {field: entry[field] for field in STREAM_FIELDS}
+        self.timestamp, self.data, self.snapshot_bytes = timestamp, data, None
+        return changed
+
+    def snapshot(self):
+        """Return the encoded snapshot event for the current second"""
+        if self.snapshot_bytes is None:
+            self.snapshot_bytes = self.event(
+                "snapshot", self.timestamp, {"t": self.timestamp, "cities": self.data}
+            )
+        return self.snapshot_bytes
+
+    def subscribe(self, sock, server=None):
+        """Send the snapshot to a connected socket and add it to the broadcast"""
+        sock.settimeout(STREAM_SEND_TIMEOUT)
+        with self.lock:
+            if self.closed:
+                sock.close()
+                return
+            # Without a broadcast thread the data is stale, and nobody misses
+            # the changes this refresh absorbs
+            if self.thread is None:
+                self.refresh()
+            try:
+                sock.sendall(self.snapshot())
+            except OSError:
+                sock.close()
+                return
+            self.subscribers[sock] = server
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def broadcast(self, message):
+        """Write one message to every subscriber, dropping those that cannot keep up
+
+        The sends happen outside the lock, so a slow subscriber holds up
+        neither new subscriptions nor close().
+        """
+        with self.lock:
+            subscribers = list(self.subscribers)
+        dropped = []
+        for sock in subscribers:
+            try:
+                sock.sendall(message)
+            except OSError:
+                sock.close()
+                dropped.append(sock)
+        if dropped:
+            with self.lock:
+                for sock in dropped:
+                    self.subscribers.pop(sock, None)
+
+    def disconnect(self, server):
+        """Disconnect the subscribers that came through one HTTP server"""
+        with self.lock:
+            for sock in [sock for sock, owner in self.subscribers.items() if owner is server]:
+                del self.subscribers[sock]
+                sock.close()
+
+    def close(self):
+        """Disconnect every subscriber and stop the broadcast thread"""
+        with self.lock:
+            self.closed = True
+            for sock in self.subscribers:
+                sock.close()
+            self.subscribers = {}
+
+    def run(self):
+        """Broadcast a tick just after every wall-clock second boundary
+
+        Returns once there are no subscribers left or the stream is closed;
+        the next subscribe() starts a new thread.
+        """
+        while True:
+            time.sleep(1 - time.time() % 1)
+            with self.lock:
+                if self.closed or not self.subscribers:
+                    self.thread = None
+                    return
+                changed = self.refresh()
+                message = self.event("tick", self.timestamp, {"t": self.timestamp, "changed": changed})
+            self.broadcast(message)
+
+
+def rows_as_lists(rows):
+    """Lists of a time-range chunk's per-city arrays
+
+    Cities sharing a zone share an array, which is converted once.
+    """
+    lists = {}
+    result = []
+    for row in rows:
+        key = id(row)
+        if key not in lists:
+            lists[key] = row.tolist()
+        result.append(lists[key])
+    return result
+
+
+def parse_instant(value):
+    """Epoch seconds from a number or an ISO 8601 string (UTC unless it has an offset)"""
+    try:
+        return int(float(value))
+    except ValueError:
+        instant = datetime.fromisoformat(value)
+    if instant.tzinfo is None:
+        instant = instant.replace(tzinfo=timezone.utc)
+    return int(instant.timestamp())
+
+
+def bind_available_port(host="", start_port=None, search_limit=PORT_SEARCH_LIMIT):
+    """Return a socket already bound and listening on a free port
+
+    Without start_port the OS picks a free port in one bind. Otherwise ports
+    from start_port upwards are tried with a plain bind each. The socket is
+    meant to be handed straight to the server (WebServer(sock=...)), so the
+    port cannot be taken by someone else between finding and using it.
+    """
+    if start_port is None:
+        return socket.create_server((host, 0), backlog=LISTEN_BACKLOG)
+
+    for port in range(start_port, start_port + search_limit):
+        try:
+            return socket.create_server((host, port), backlog=LISTEN_BACKLOG)
+        except OSError:
+            # Port not available, try the next one
+            continue
+    raise RuntimeError("No available ports found")
+
+
+class ThreadedHTTPServer(http.server.HTTPServer):
+    """HTTP server that hands each connection to a bounded worker pool
+
+    The accept loop never blocks on a slow client. At most `workers`
+    connections are serviced at once; while others are waiting for a worker,
+    keep-alive connections are closed after their current response so
+    waiting clients get a turn.
+    """
+
+    request_queue_size = LISTEN_BACKLOG
+
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS,
+                 bind_and_activate=True):
+        super().__init__(server_address, handler_class, bind_and_activate)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chronoeye-http")
+        self.lock = threading.Lock()
+        self.connections = {}
+        self.detached = set()
+        self.waiting = 0
+        self.draining = False
+
+    @classmethod
+    def from_socket(cls, sock, handler_class, workers=DEFAULT_WORKERS):
+        """Serve on an already bound and listening socket"""
+        server = cls(sock.getsockname()[:2], handler_class, workers, bind_and_activate=False)
+        server.socket.close()
+        server.socket = sock
+        server.server_address = sock.getsockname()[:2]
+        host, port = server.server_address
+        server.server_name = socket.getfqdn(host)
+        server.server_port = port
+        return server
+
+    def process_request(self, request, client_address):
+        """Queue the connection for a worker instead of handling it inline"""
+        with self.lock:
+            self.waiting += 1
+            future = self.executor.submit(self.process_request_thread, request, client_address)
+            self.connections[future] = request
+        future.add_done_callback(self.connection_done)
+
+    def process_request_thread(self, request, client_address):
+        """Serve one connection, possibly several keep-alive requests, on a worker"""
+        with self.lock:
+            self.waiting -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def connection_done(self, future):
+        with self.lock:
+            self.connections.pop(future, None)
+
+    def detach(self, request):
+        """Hand a connection over to someone else; the server will not close it"""
+        with self.lock:
+            self.detached.add(request)
+
+    def shutdown_request(self, request):
+        with self.lock:
+            if request in self.detached:
+                self.detached.discard(request)
+                return
+        super().shutdown_request(request)
+
+    def should_close(self):
+        """True when connections should not be kept alive past this response"""
+        return self.draining or self.waiting > 0
+
+    def stop(self, grace=SHUTDOWN_GRACE):
+        """Stop accepting, let in-flight connections finish for up to `grace` seconds"""
+        self.draining = True
+        self.shutdown()
+        self.server_close()
+        with self.lock:
+            connections = dict(self.connections)
+        # Idle keep-alive connections see EOF at once; responses being written still go out
+        for request in connections.values():
+            try:
+                request.shutdown(socket.SHUT_RD)
+            except OSError:
+                pass
+        wait(connections, timeout=grace)
+        self.executor.shutdown(wait=False)
+
+
+# Create custom handler for the web server
+class AppHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
+    # Headers and body are separate writes; without TCP_NODELAY a kept-alive
+    # connection waits on delayed ACKs for every response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        params = parse_qs(query)
+
+        if path == '/api/time-data':
+            # This is the API endpoint for time data
+            wire_format = negotiate(params.get('format', [None])[0], self.headers.get('Accept'))
+            if wire_format is None:
+                self.send_error(400, "Expected format=json, columns or binary")
+                return
+            include_static = params.get('static', ['0'])[0] not in ('', '0', 'false')
+            compressed = accepts_encoding(self.headers.get('Accept-Encoding'), 'gzip')
+            body = time_data_cache.get(include_static, compressed, wire_format)
+            headers = {'Vary': 'Accept-Encoding, Accept'}
+            if compressed:
+                headers['Content-Encoding'] = 'gzip'
+            self.send_body(body, FORMATS[wire_format], headers=headers)
+        elif path == '/api/cities':
+            # Static city metadata, revalidated by ETag
+            if etag_matches(self.headers.get('If-None-Match'), time_api.city_info_etag):
+                self.send_response(304)
+                self.send_header('ETag', time_api.city_info_etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_body(
+                time_api.city_info_body,
+                'application/json',
+                headers={'ETag': time_api.city_info_etag, 'Cache-Control': 'max-age=300'}
+            )
+        elif path.startswith('/api/cities/'):
+            self.send_city_query(path[len('/api/cities/'):], params)
+        elif path == '/api/time-stream':
+            self.stream_time_data()
+        elif path == '/api/graticule':
+            self.send_graticule(params)
+        elif path == '/api/time-range':
+            self.send_time_range(params)
+        elif path == '/api/transitions':
+            self.send_transitions(params)
+        elif path == '/api/overlaps':
+            self.send_overlaps(params)
+        else:
+            # Serve static files from memory
+            self.send_asset(unquote(path))
+
+    def do_HEAD(self):
+        self.send_asset(unquote(self.path.partition('?')[0]), head_only=True)
+
+    def send_asset(self, path, head_only=False):
+        """Serve a web/ file from the in-memory asset store"""
+        asset = web_assets.lookup(path)
+        if asset is None:
+            self.send_error(404, "File not found")
+            return
+
+        validators = {
+            'ETag': asset.etag,
+            'Last-Modified': asset.last_modified,
+            'Cache-Control': 'no-cache'
+        }
+        if asset.not_modified(self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since')):
+            self.send_response(304)
+            for name, value in validators.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        coding, body = asset.body(self.headers.get('Accept-Encoding'))
+        self.send_response(200)
+        self.send_header('Content-type', asset.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Vary', 'Accept-Encoding')
+        if coding != 'identity':
+            self.send_header('Content-Encoding', coding)
+        for name, value in validators.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def send_city_query(self, query, params):
+        """Spatial queries: /api/cities/visible|nearest|within?lon=..&lat=..[&angle|k|radius=..]"""
+        value_name = {'visible': 'angle', 'nearest': 'k', 'within': 'radius'}.get(query)
+        try:
+            lon = float(params['lon'][0])
+            lat = float(params['lat'][0])
+            value = float(params[value_name][0]) if value_name in params else None
+        except (KeyError, ValueError):
+            result = None
+        else:
+            valid = math.isfinite(lon) and -90 <= lat <= 90
+            if value is not None:
+                # k counts cities; angle and radius only need to be positive
+                least = value >= 1 if query == 'nearest' else value > 0
+                valid = valid and math.isfinite(value) and least
+            result = time_api.query_cities(query, lon, lat, value) if valid else None
+        if result is None:
+            self.send_error(400, "Expected lon, lat and, for within, radius (km); "
+                                 "angle, k and radius must be finite and positive, k at least 1")
+            return
+        # Answers depend only on the city list, so they can be cached briefly
+        self.send_body(json.dumps(result).encode(), 'application/json',
+                       headers={'Cache-Control': 'max-age=300'})
+
+    def send_graticule(self, params):
+        """Globe grid lines as a binary vertex buffer (see graticule.py)"""
+        try:
+            meridians = int(params.get('meridians', [MERIDIANS])[0])
+            parallel_step = int(params.get('parallel_step', [PARALLEL_STEP])[0])
+            step = float(params.get('step', [STEP_DEGREES])[0])
+        except ValueError:
+            meridians = None
+        if meridians is None or not (1 <= meridians <= 360 and 1 <= parallel_step <= 90 and 0.5 <= step <= 90):
+            self.send_error(400, "Expected meridians 1-360, parallel_step 1-90 and step 0.5-90 (degrees)")
+            return
+        headers = {'Vary': 'Accept-Encoding', 'Cache-Control': 'max-age=86400'}
+        if accepts_encoding(self.headers.get('Accept-Encoding'), 'gzip'):
+            body = compressed_graticule(meridians, parallel_step, step)
+            headers['Content-Encoding'] = 'gzip'
+        else:
+            body = graticule_buffer(meridians, parallel_step, step)
+        self.send_body(body, 'application/octet-stream', headers=headers)
+
+    def send_time_range(self, params):
+        """Local times over a UTC range: /api/time-range?start=..&stop=..[&step=900]
+
+        start (default now) and stop are epoch seconds or ISO 8601 (UTC unless
+        an offset is given). The answer is newline-delimited JSON sent in
+        chunks: a header line {"cities", "start", "stop", "step", "count"},
+        then lines {"t": [instants], "offset": [[seconds] per city],
+        "local": [[local epoch seconds] per city]} until every instant is sent.
+        """
+        try:
+            start = parse_instant(params['start'][0]) if 'start' in params else int(time.time())
+            stop = parse_instant(params['stop'][0])
+            step = int(params.get('step', ['900'])[0])
+        except (KeyError, ValueError, OverflowError):
+            start = stop = step = None
+        low, high = year_start(RANGE_YEARS[0]), year_start(RANGE_YEARS[1] + 1)
+        # Instants start, start + step, ... before stop
+        count = -(-(stop - start) // step) if step else None
+        if (step is None or step < MIN_RANGE_STEP or not low <= start < stop <= high
+                or count > MAX_RANGE_INSTANTS):
+            self.send_error(400, f"Expected start < stop in {RANGE_YEARS[0]}-{RANGE_YEARS[1]}, "
+                                 f"step >= {MIN_RANGE_STEP} s and at most {MAX_RANGE_INSTANTS} instants")
+            return
+
+        api = time_api
+        header = {"cities": list(api.cities), "start": start, "stop": stop, "step": step, "count": count}
+        self.send_response(200)
+        self.send_header('Content-type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.send_chunk(json.dumps(header).encode() + b"\n")
+        for chunk in api.get_time_range(start, stop, step):
+            line = {
+                "t": chunk.instants.tolist(),
+                "offset": rows_as_lists(chunk.offsets),
+                "local": rows_as_lists(chunk.local_seconds)
+            }
+            self.send_chunk(json.dumps(line, separators=(",", ":")).encode() + b"\n")
+        self.send_chunk(b"")
+
+    def send_chunk(self, data):
+        """Write one chunk of a Transfer-Encoding: chunked body; b"" ends it"""
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def send_transitions(self, params):
+        """Next UTC offset change of every city: /api/transitions[?after=...]"""
+        try:
+            after = parse_instant(params['after'][0]) if 'after' in params else int(time.time())
+        except (ValueError, OverflowError):
+            after = None
+        if after is None or not year_start(RANGE_YEARS[0]) <= after < year_start(RANGE_YEARS[1] + 1):
+            self.send_error(400, "Expected after as epoch seconds or ISO 8601")
+            return
+        body = json.dumps({"after": after, "cities": time_api.get_next_transitions(after)}).encode()
+        self.send_body(body, 'application/json')
+
+    def send_overlaps(self, params):
+        """Shared working hours: /api/overlaps?cities=A,B@10:00-18:00@sun-thu,..&stop=..
+
+        Every city works `hours` (default 09:00-17:00) on `days` (default
+        mon-fri) in its own local time unless it names its own after an @.
+        start (default now) and stop are as for /api/time-range. quorum
+        (default: every city) is the fewest cities an overlap needs and
+        min_duration (minutes) its shortest length.
+        """
+        try:
+            start = parse_instant(params['start'][0]) if 'start' in params else int(time.time())
+            stop = parse_instant(params['stop'][0])
+            entries = params['cities'][0].split(',')
+            quorum = int(params['quorum'][0]) if 'quorum' in params else None
+            min_duration = int(float(params.get('min_duration', ['0'])[0]) * 60)
+        except (KeyError, ValueError, OverflowError):
+            entries = None
+        low, high = year_start(RANGE_YEARS[0]), year_start(RANGE_YEARS[1] + 1)
+        if entries is None or not low <= start < stop <= high or stop - start > MAX_OVERLAP_DAYS * DAY:
+            self.send_error(400, f"Expected cities, stop after start and at most {MAX_OVERLAP_DAYS} days")
+            return
+
+        # User text is echoed through ascii(): the message goes in the status line
+        default_hours = params.get('hours', ['09:00-17:00'])[0]
+        default_days = params.get('days', [None])[0]
+        hours = {}
+        for entry in entries:
+            city, *window = entry.strip().split('@')
+            try:
+                hours[city] = WorkingHours.parse(
+                    window[0] if window else default_hours,
+                    window[1] if len(window) > 1 else default_days
+                )
+            except ValueError as e:
+                self.send_error(400, f"Bad working hours for {ascii(city)}: {ascii(str(e))}")
+                return
+        if quorum is not None and not 1 <= quorum <= len(hours):
+            self.send_error(400, f"Expected quorum between 1 and the {len(hours)} cities")
+            return
+        try:
+            overlaps = time_api.find_overlaps(hours, start, stop, quorum, min_duration)
+        except KeyError as e:
+            self.send_error(400, f"Unknown city: {ascii(e.args[0])}")
+            return
+        body = json.dumps({
+            "start": start,
+            "stop": stop,
+            "overlaps": [
+                {"start": overlap.start, "stop": overlap.stop, "cities": overlap.cities} for overlap in overlaps
+            ]
+        }).encode()
+        self.send_body(body, 'application/json')
+
+    def send_body(self, body, content_type, headers=None):
+        """Send a complete 200 response with the given body"""
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_time_data(self):
+        """Switch this connection to the Server-Sent Events time stream"""
+        if not hasattr(self.server, "detach"):
+            self.send_error(501, "Streaming needs ThreadedHTTPServer")
+            return
+
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        # No Content-Length: the body runs until the client goes away
+        self.end_headers()
+        self.wfile.flush()
+
+        self.server.detach(self.request)
+        time_stream.subscribe(self.request, self.server)
+
+    def end_headers(self):
+        # Release the worker when other connections are waiting or we are stopping
+        if getattr(self.server, "should_close", None) and self.server.should_close():
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        super().end_headers()
+
+
+# The web/ front end, loaded into memory on first request
+web_assets = AssetStore()
+
+# Shared by all handlers so static city data is built once per process
+time_api = TimeDataAPI(default_cities())
+
+# Encoded /api/time-data bodies, rebuilt at most once per second
+time_data_cache = TimeDataCache(time_api)
+
+# One shared feed; its broadcast thread starts with the first subscriber
+time_stream = TimeStream(time_api)
+
+
+def check_zones(cities):
+    """Raise ValueError naming a city whose time zone pytz does not know
+
+    Each distinct zone is resolved once, so a bad city file fails at startup
+    rather than on every request.
+    """
+    zones = cities.zones if hasattr(cities, "zones") else set(cities.values())
+    unknown = set()
+    for zone in zones:
+        try:
+            get_timezone(zone)
+        except KeyError:
+            unknown.add(zone)
+    if unknown:
+        city, zone = next((city, zone) for city, zone in cities.items() if zone in unknown)
+        more = f" (and {len(unknown) - 1} more unknown zones)" if len(unknown) > 1 else ""
+        raise ValueError(f"Unknown time zone {zone!r} for city {city!r}{more}")
+
+
+def configure_cities(cities, compiled=False):
+    """Serve a different CityRegistry from the shared API, cache and stream
+
+    With compiled, local times come from precompiled TransitionTables, which
+    pays off for large city lists.
+    """
+    global time_api, time_data_cache, time_stream
+    check_zones(cities)
+    tables = TransitionTables(cities) if compiled else None
+    time_api = TimeDataAPI(cities, tables=tables)
+    time_data_cache = TimeDataCache(time_api)
+    time_stream.close()
+    time_stream = TimeStream(time_api)
+
+
+class WebServer:
+    """HTTP server for the HTML/JS files and the time API, run on a background thread"""
+
+    def __init__(self, port=8000, host="", workers=DEFAULT_WORKERS, handler=AppHandler, sock=None):
+        self.host = host
+        self.port = sock.getsockname()[1] if sock is not None else port
+        self.workers = workers
+        self.handler = handler
+        self.sock = sock
+        self.httpd = None
+
+    def start(self):
+        """Start the web server in a separate thread"""
+        if self.sock is not None:
+            self.httpd = ThreadedHTTPServer.from_socket(self.sock, self.handler, workers=self.workers)
+        else:
+            self.httpd = ThreadedHTTPServer((self.host, self.port), self.handler, workers=self.workers)
+        self.port = self.httpd.server_address[1]
+
+        server_thread = threading.Thread(target=self.httpd.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        print(f"Server started at http://localhost:{self.port}")
+
+    def stop(self, grace=SHUTDOWN_GRACE):
+        """Stop the web server, letting in-flight requests finish"""
+        if self.httpd:
+            self.httpd.stop(grace)
+            # The stream is shared with any other server in this process
+            time_stream.disconnect(self.httpd)
+            self.httpd = None
+
+
+def serve(host="", port=8081, workers=DEFAULT_WORKERS):
+    """Run the web server in the foreground until SIGINT or SIGTERM, then drain it"""
+    stop_requested = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_requested.set())
+
+    web_server = WebServer(port=port, host=host, workers=workers)
+    web_server.start()
+    # Wake up periodically so signals are handled promptly on every platform
+    while not stop_requested.wait(1):
+        pass
+    web_server.stop()
+    time_stream.close()
@@ -0,0 +1,243 @@
+"""Per-second time snapshot shared between processes through one mmap'd file
+
+One producer computes every city's time data once per second and writes it,
+together with the encoded /api/time-data bodies, into a fixed-layout region.
+Any number of readers (server processes, a separate GUI process) map the
+same file and read it without locks or IPC:
+
+    file header   magic, city count, names length, body capacity
+    names         JSON [[city, zone], ...], fixed for the life of the file
+    slot 0, 1     seq, timestamp, body length, gzip length,
+                  one record per city (offset, date ordinal, h, m, s, daylight),
+                  JSON body, gzip body
+
+Second S lives in slot S % 2 and is published half a second early, so around
+a second boundary both the current and the next second are readable and the
+producer never writes the slot readers are using. Each slot is a seqlock:
+the producer makes seq odd while writing and even when done; a reader that
+sees seq odd or changed across its read treats the slot as unavailable.
+Readers get None whenever the snapshot is missing or stale and compute
+locally instead.
+"""
+import gzip
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from datetime import date, datetime, timezone
+
+MAGIC = b"CHRONOEY"
+
+# magic, city count, names length, body capacity
+FILE_HEADER = struct.Struct("<8sIII")
+
+# seq, timestamp, body length, gzip length
+SLOT_HEADER = struct.Struct("<QqII")
+
+# UTC offset seconds, local date ordinal, hour, minute, second, daylight
+RECORD = struct.Struct("<iiBBBB")
+
+SEQ = struct.Struct("<Q")
+
+# Fraction of a second before its start that a second is published
+PUBLISH_AHEAD = 0.5
+
+# gzip level of the shared compressed body, same as server.GZIP_LEVEL
+GZIP_LEVEL = 6
+
+
+def parse_offset(offset):
+    """Return "+0530" style offsets in seconds"""
+    sign = -1 if offset.startswith("-") else 1
+    return sign * (int(offset[1:3]) * 3600 + int(offset[3:5]) * 60)
+
+
+def layout(city_count, names_length, body_capacity):
+    """Return (offset of slot 0, slot size); slots start on cache line boundaries"""
+    slots_start = -(-(FILE_HEADER.size + names_length) // 64) * 64
+    slot_size = RECORD.size * city_count + SLOT_HEADER.size + 2 * body_capacity
+    return slots_start, -(-slot_size // 64) * 64
+
+
+class SharedSnapshot:
+    """A mapped snapshot file; create() it to publish, attach() to read"""
+
+    def __init__(self, path, buffer, time_api=None):
+        self.path = path
+        self.buffer = buffer
+        self.time_api = time_api
+        magic, self.city_count, names_length, self.body_capacity = FILE_HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a ChronoEye snapshot")
+
+        names = json.loads(bytes(buffer[FILE_HEADER.size:FILE_HEADER.size + names_length]))
+        self.cities = [city for city, _ in names]
+        self.zone_index = {}
+        for index, (_, zone) in enumerate(names):
+            self.zone_index.setdefault(zone, index)
+
+        self.records_start = SLOT_HEADER.size
+        self.body_start = self.records_start + RECORD.size * self.city_count
+        self.gzip_start = self.body_start + self.body_capacity
+        self.slots_start, self.slot_size = layout(self.city_count, names_length, self.body_capacity)
+        self.published = None
+
+    @classmethod
+    def create(cls, time_api, path=None):
+        """Create the snapshot file for time_api's cities and map it for writing
+
+        The file is built under a temporary name and renamed onto path, so
+        readers attaching by path always find a complete file. Without path
+        a fresh file in the temp directory is used.
+        """
+        names = json.dumps([[city, zone] for city, zone in time_api.cities.items()]).encode()
+        sample = json.dumps(time_api.get_time_data()).encode()
+        body_capacity = 2 * len(sample) + 1024
+
+        directory = os.path.dirname(path) if path else tempfile.gettempdir()
+        fd, temp_path = tempfile.mkstemp(dir=directory or ".", prefix=".chronoeye-", suffix=".snapshot")
+        try:
+            slots_start, slot_size = layout(len(time_api.cities), len(names), body_capacity)
+            os.ftruncate(fd, slots_start + 2 * slot_size)
+            buffer = mmap.mmap(fd, slots_start + 2 * slot_size)
+            FILE_HEADER.pack_into(buffer, 0, MAGIC, len(time_api.cities), len(names), body_capacity)
+            buffer[FILE_HEADER.size:FILE_HEADER.size + len(names)] = names
+            os.chmod(temp_path, 0o644)
+            if path:
+                os.replace(temp_path, path)
+            else:
+                path = temp_path
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        finally:
+            os.close(fd)
+        return cls(path, buffer, time_api)
+
+    @classmethod
+    def attach(cls, path):
+        """Map an existing snapshot file read-only"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(path, buffer)
+
+    def publish(self, second):
+        """Compute and write the snapshot for one epoch second"""
+        instant = datetime.fromtimestamp(second, timezone.utc)
+        data = self.time_api.get_time_data(instant)
+        body = json.dumps(data).encode()
+        compressed = gzip.compress(body, GZIP_LEVEL)
+        if len(body) > self.body_capacity or len(compressed) > self.body_capacity:
+            # Readers fall back to building the body themselves
+            body = compressed = b""
+
+        buffer = self.buffer
+        slot = self.slots_start + (second % 2) * self.slot_size
+        seq = SEQ.unpack_from(buffer, slot)[0]
+        SEQ.pack_into(buffer, slot, seq + 1)
+        SLOT_HEADER.pack_into(buffer, slot, seq + 1, second, len(body), len(compressed))
+        position = slot + self.records_start
+        for entry in data.values():
+            RECORD.pack_into(
+                buffer, position,
+                parse_offset(entry["offset"]),
+                date.fromisoformat(entry["date"]).toordinal(),
+                entry["hour"], entry["minute"], entry["second"], entry["daylight"]
+            )
+            position += RECORD.size
+        buffer[slot + self.body_start:slot + self.body_start + len(body)] = body
+        buffer[slot + self.gzip_start:slot + self.gzip_start + len(compressed)] = compressed
+        SEQ.pack_into(buffer, slot, seq + 2)
+        self.published = second
+
+    def publish_due(self):
+        """Publish the current (and, late in the second, the next) second if not done yet
+
+        Returns the seconds until this should be called again.
+        """
+        now = time.time()
+        second = int(now)
+        fraction = now - second
+        due = [second, second + 1] if fraction >= 1 - PUBLISH_AHEAD else [second]
+        for target in due:
+            if self.published is None or target > self.published:
+                self.publish(target)
+        if fraction < 1 - PUBLISH_AHEAD:
+            return 1 - PUBLISH_AHEAD - fraction
+        return 2 - PUBLISH_AHEAD - fraction
+
+    def run(self):
+        """Publish forever, for a producer running on its own thread"""
+        while True:
+            time.sleep(self.publish_due())
+
+    def slot(self, second):
+        """Return (slot position, seq, body length, gzip length) if second is published"""
+        slot = self.slots_start + (second % 2) * self.slot_size
+        seq, timestamp, body_length, gzip_length = SLOT_HEADER.unpack_from(self.buffer, slot)
+        if seq & 1 or timestamp != second:
+            return None
+        return slot, seq, body_length, gzip_length
+
+    def body(self, second, compressed=False):
+        """Copy of the /api/time-data body (without static fields) for second, or None"""
+        found = self.slot(second)
+        if found is None:
+            return None
+        slot, seq, body_length, gzip_length = found
+        start, size = (self.gzip_start, gzip_length) if compressed else (self.body_start, body_length)
+        if not size:
+            return None
+        value = self.buffer[slot + start:slot + start + size]
+        # Bodies are copied out: a view could not be validated once it was sent
+        if SEQ.unpack_from(self.buffer, slot)[0] != seq:
+            return None
+        return value
+
+    def record(self, city_index, second):
+        """(offset, date ordinal, hour, minute, second, daylight) of one city, or None"""
+        found = self.slot(second)
+        if found is None:
+            return None
+        slot, seq = found[:2]
+        record = RECORD.unpack_from(self.buffer, slot + self.records_start + city_index * RECORD.size)
+        if SEQ.unpack_from(self.buffer, slot)[0] != seq:
+            return None
+        return record
+
+    def offsets(self, second):
+        """array('i') of every city's UTC offset at second, or None"""
+        found = self.slot(second)
+        if found is None:
+            return None
+        slot, seq = found[:2]
+        start = slot + self.records_start
+        records = array("i")
+        records.frombytes(self.buffer[start:start + self.city_count * RECORD.size])
+        if SEQ.unpack_from(self.buffer, slot)[0] != seq:
+            return None
+        if sys.byteorder == "big":
+            records.byteswap()
+        # The offset is the first of each record's three 4-byte words
+        return records[::RECORD.size // 4]
+
+    def offset(self, tz_name, second):
+        """UTC offset in seconds of tz_name at second, or None if not in the snapshot"""
+        index = self.zone_index.get(tz_name)
+        if index is None:
+            return None
+        record = self.record(index, second)
+        return None if record is None else record[0]
+
+    def close(self):
+        self.buffer.close()
+
+    def unlink(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
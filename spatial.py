@@ -0,0 +1,133 @@
+"""Spatial index over a CityRegistry for globe culling and proximity queries
+
+Cities are bucketed on a fixed latitude/longitude grid. Every query is a
+spherical cap (all cities within some angle of a point): only the grid cells
+overlapping the cap are visited and each candidate is tested exactly with a
+dot product of unit vectors, so the work is proportional to the cities near
+the answer rather than to the whole registry.
+"""
+import math
+from array import array
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Grid cell size in degrees; 5 gives 36 x 72 cells
+CELL_DEGREES = 5
+
+
+class SpatialIndex:
+    """Grid-bucketed unit vectors of every city with a known position
+
+    Cell contents are stored flat: ids of cell i are
+    cell_ids[cell_starts[i]:cell_starts[i + 1]].
+    """
+
+    def __init__(self, cities, cell_degrees=CELL_DEGREES):
+        self.cities = cities
+        self.cell_degrees = cell_degrees
+        self.rows = math.ceil(180 / cell_degrees)
+        self.columns = math.ceil(360 / cell_degrees)
+
+        count = len(cities)
+        self.x = array("d", bytes(8 * count))
+        self.y = array("d", bytes(8 * count))
+        self.z = array("d", bytes(8 * count))
+        cells = array("i", [-1]) * count
+        sizes = array("I", bytes(4 * (self.rows * self.columns + 1)))
+        for city_id in range(count):
+            position = cities.coords(city_id)
+            if position is None:
+                continue
+            lon, lat = position
+            self.x[city_id], self.y[city_id], self.z[city_id] = unit_vector(lon, lat)
+            cell = self.cell(lon, lat)
+            cells[city_id] = cell
+            sizes[cell + 1] += 1
+
+        # Counting sort of the ids by cell
+        for cell in range(1, len(sizes)):
+            sizes[cell] += sizes[cell - 1]
+        self.cell_starts = sizes
+        self.cell_ids = array("I", bytes(4 * sizes[-1]))
+        fill = array("I", sizes)
+        for city_id, cell in enumerate(cells):
+            if cell >= 0:
+                self.cell_ids[fill[cell]] = city_id
+                fill[cell] += 1
+
+    def cell(self, lon, lat):
+        row = min(int((lat + 90) / self.cell_degrees), self.rows - 1)
+        column = int((lon + 180) / self.cell_degrees) % self.columns
+        return row * self.columns + column
+
+    def cap(self, lon, lat, angle):
+        """Return [(cosine of the distance, id)] of cities within angle degrees of (lon, lat)"""
+        cx, cy, cz = unit_vector(lon, lat)
+        # A little slack so cities exactly on the edge are not lost to rounding
+        min_cos = math.cos(math.radians(min(angle, 180))) - 1e-12
+        cell = self.cell_degrees
+
+        first_row = max(int((lat - angle + 90) / cell), 0)
+        last_row = min(int((lat + angle + 90) / cell), self.rows - 1)
+        if angle >= 90 or lat + angle >= 90 or lat - angle <= -90:
+            columns = range(self.columns)
+        else:
+            # Widest longitude extent of a cap that contains no pole
+            half_width = math.degrees(math.asin(min(1.0, math.sin(math.radians(angle)) / math.cos(math.radians(lat)))))
+            first = math.floor((lon - half_width + 180) / cell)
+            last = math.floor((lon + half_width + 180) / cell)
+            if last - first + 1 >= self.columns:
+                columns = range(self.columns)
+            else:
+                columns = [column % self.columns for column in range(first, last + 1)]
+
+        x, y, z = self.x, self.y, self.z
+        starts, ids = self.cell_starts, self.cell_ids
+        found = []
+        for row in range(first_row, last_row + 1):
+            base = row * self.columns
+            for column in columns:
+                for index in range(starts[base + column], starts[base + column + 1]):
+                    city_id = ids[index]
+                    cosine = x[city_id] * cx + y[city_id] * cy + z[city_id] * cz
+                    if cosine >= min_cos:
+                        found.append((cosine, city_id))
+        return found
+
+    def visible(self, lon, lat, angle=90.0):
+        """Ids of cities on the part of the globe seen from above (lon, lat)
+
+        angle 90 is the whole facing hemisphere; a zoomed-in view needs less.
+        """
+        return [city_id for _, city_id in self.cap(lon, lat, angle)]
+
+    def within(self, lon, lat, radius_km):
+        """[(distance km, id)] of cities within radius_km, nearest first"""
+        angle = math.degrees(radius_km / EARTH_RADIUS_KM)
+        return sorted((distance_km(cosine), city_id) for cosine, city_id in self.cap(lon, lat, angle))
+
+    def nearest(self, lon, lat, k=1):
+        """[(distance km, id)] of the k cities nearest to (lon, lat), nearest first"""
+        angle = self.cell_degrees
+        while True:
+            found = self.cap(lon, lat, angle)
+            # Everything within the cap is found, so k hits in it are the k nearest
+            if len(found) >= k or angle >= 180:
+                found.sort(reverse=True)
+                return [(distance_km(cosine), city_id) for cosine, city_id in found[:k]]
+            angle *= 2
+
+
+def unit_vector(lon, lat):
+    lon_rad = math.radians(lon)
+    lat_rad = math.radians(lat)
+    return (
+        math.cos(lat_rad) * math.cos(lon_rad),
+        math.cos(lat_rad) * math.sin(lon_rad),
+        math.sin(lat_rad)
+    )
+
+
+def distance_km(cosine):
+    """Great-circle distance for the cosine of the central angle"""
+    return EARTH_RADIUS_KM * math.acos(max(-1.0, min(1.0, cosine)))
@@ -0,0 +1,24 @@
+"""Command line checks; run with python -m pytest"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chronoeye  # noqa: E402
+import server  # noqa: E402
+
+
+def test_serve_rejects_unknown_zone(tmp_path):
+    cities_file = tmp_path / "bad.csv"
+    cities_file.write_text("name,timezone,longitude,latitude\nOslo,Europe/Oslo,10.75,59.91\nFoo,Not/AZone,1,2\n")
+    api = server.time_api
+
+    with pytest.raises(SystemExit) as error:
+        chronoeye.main(["serve", "--cities", str(cities_file), "--port", "0"])
+
+    assert "Not/AZone" in str(error.value) and "'Foo'" in str(error.value)
+    # The server kept its previous cities
+    assert server.time_api is api
+
@@ -0,0 +1,80 @@
+"""HTTP API checks; run with python -m pytest"""
+import http.client
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+from tztables import year_start  # noqa: E402
+
+
+@pytest.fixture
+def web_server():
+    web_server = server.WebServer(port=0, host="127.0.0.1")
+    web_server.start()
+    yield web_server
+    web_server.stop(grace=0)
+
+
+def status(web_server, path):
+    """Status of a GET, without reading the body"""
+    connection = http.client.HTTPConnection("127.0.0.1", web_server.port, timeout=10)
+    try:
+        connection.request("GET", path)
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+def test_time_range_instant_limit(web_server):
+    start = year_start(2030)
+    step = 61
+    # Exactly MAX_RANGE_INSTANTS instants
+    stop = start + server.MAX_RANGE_INSTANTS * step
+    assert status(web_server, f"/api/time-range?start={start}&stop={stop}&step={step}") == 200
+
+    # One second more adds an instant, although it is under a step past the last one
+    assert status(web_server, f"/api/time-range?start={start}&stop={stop + 1}&step={step}") == 400
+
+
+def test_range_tables_compiled_once():
+    time_api = server.TimeDataAPI({"Oslo": "Europe/Oslo", "Sydney": "Australia/Sydney"})
+    start = year_start(1980)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(time_api.range_tables(start, start + 86400)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8 and all(tables is time_api.range_cache for tables in results)
+
+
+def open_stream(web_server):
+    """Connected /api/time-stream response, past its snapshot event"""
+    connection = http.client.HTTPConnection("127.0.0.1", web_server.port, timeout=10)
+    connection.request("GET", "/api/time-stream")
+    response = connection.getresponse()
+    assert response.status == 200
+    assert response.fp.readline().startswith(b"event: snapshot")
+    return connection, response
+
+
+def test_stopping_one_server_keeps_the_stream_of_another(web_server):
+    other = server.WebServer(port=0, host="127.0.0.1")
+    other.start()
+    connection, response = open_stream(other)
+    other.stop(grace=0)
+    # The stopped server's subscriber is disconnected...
+    while response.fp.readline():
+        pass
+    connection.close()
+
+    # ...and the other server still streams
+    connection, response = open_stream(web_server)
+    connection.close()
@@ -0,0 +1,65 @@
+import functools
+from datetime import datetime, timedelta, timezone
+
+# Upper bound on distinct zones kept resolved at once
+TIMEZONE_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
+def get_timezone(tz_name):
+    """Return the pytz timezone for tz_name, resolved once and cached
+
+    pytz and its zone data are imported on the first lookup, not at startup.
+    """
+    import pytz
+    return pytz.timezone(tz_name)
+
+
+@functools.lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
+def fixed_offset(offset):
+    """Return a tzinfo for a fixed offset in seconds"""
+    return timezone(timedelta(seconds=offset))
+
+
+class TimeSource:
+    """Single clock read per tick that every city's local time is derived from
+
+    Call tick() once per update pass; local_time() then converts that one UTC
+    instant for any zone, so every clock in the pass shows the same second.
+    Zones compiled into the optional TransitionTables are converted from those
+    tables instead of through pytz, and zones published in the optional
+    sharedtime.SharedSnapshot take their offset from it.
+    """
+
+    def __init__(self, tables=None, shared=None):
+        self.tables = tables
+        self.shared = shared
+        self.instant = None
+        self.tick()
+
+    def tick(self, timestamp=None):
+        """Read the clock once and return the UTC instant for this pass
+
+        A caller that has already sampled the clock passes that epoch
+        timestamp instead.
+        """
+        if timestamp is None:
+            self.instant = datetime.now(timezone.utc)
+        else:
+            self.instant = datetime.fromtimestamp(timestamp, timezone.utc)
+        return self.instant
+
+    def local_time(self, tz_name, instant=None):
+        """Return the instant (default: the current tick) as local time in tz_name"""
+        if instant is None:
+            instant = self.instant
+        shared = self.shared
+        if shared is not None:
+            offset = shared.offset(tz_name, int(instant.timestamp()))
+            if offset is not None:
+                return instant.astimezone(fixed_offset(offset))
+        tables = self.tables
+        if tables is not None and tz_name in tables:
+            offset = tables.zone(tz_name).offset_at(int(instant.timestamp()))
+            return instant.astimezone(fixed_offset(offset))
+        return instant.astimezone(get_timezone(tz_name))
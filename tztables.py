@@ -0,0 +1,258 @@
+import bisect
+import calendar
+import operator
+import time
+from array import array
+from datetime import date, datetime
+
+from timesource import get_timezone
+
+# Start of the period that is in force before a zone's first transition
+BEFORE_TIME = -(2 ** 62)
+
+
+# Proleptic ordinal of 1970-01-01, for turning local epoch days into dates
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def year_start(year):
+    """Return the UTC epoch second at which `year` begins"""
+    return calendar.timegm((year, 1, 1, 0, 0, 0))
+
+
+def wall_clock(local_seconds):
+    """Split local epoch seconds into (date, hour, minute, second)"""
+    days, seconds = divmod(local_seconds, 86400)
+    return date.fromordinal(EPOCH_ORDINAL + days), seconds // 3600, seconds // 60 % 60, seconds % 60
+
+
+def format_offset(offset):
+    """Format an offset in seconds like strftime's %z, e.g. +0530"""
+    sign = "-" if offset < 0 else "+"
+    minutes = abs(offset) // 60
+    return f"{sign}{minutes // 60:02d}{minutes % 60:02d}"
+
+
+class ZoneTable:
+    """UTC offset periods of one zone, compiled for a window of years
+
+    Period i is in force from starts[i] (UTC epoch seconds) up to starts[i + 1].
+    Lookups are a binary search over starts. Only transitions inside the
+    compiled window are kept, so instants outside it get the nearest period.
+    """
+
+    __slots__ = ("name", "starts", "offsets", "dst")
+
+    def __init__(self, name, starts, offsets, dst):
+        self.name = name
+        self.starts = array("q", starts)
+        self.offsets = array("l", offsets)
+        self.dst = array("b", dst)
+
+    @classmethod
+    def compile(cls, tz_name, first_year, last_year):
+        """Build the table for tz_name from pytz's transition data"""
+        tz = get_timezone(tz_name)
+        window_start = year_start(first_year)
+        window_end = year_start(last_year + 1)
+
+        transitions = getattr(tz, "_utc_transition_times", None)
+        if not transitions:
+            # Fixed-offset zones (UTC, Etc/GMT+5, ...) have a single period
+            sample = datetime(first_year, 1, 1)
+            dst = tz.dst(sample)
+            return cls(tz_name, [BEFORE_TIME], [int(tz.utcoffset(sample).total_seconds())],
+                       [bool(dst)])
+
+        starts, offsets, dst_flags = [], [], []
+        for when, (utcoffset, dst, _) in zip(transitions, tz._transition_info):
+            start = BEFORE_TIME if when == datetime.min else calendar.timegm(when.timetuple())
+            if start >= window_end:
+                break
+            if start <= window_start:
+                # Only the period in force when the window opens is needed
+                starts, offsets, dst_flags = [], [], []
+            starts.append(start)
+            offsets.append(int(utcoffset.total_seconds()))
+            dst_flags.append(bool(dst))
+
+        # The opening period extends back indefinitely
+        starts[0] = BEFORE_TIME
+        return cls(tz_name, starts, offsets, dst_flags)
+
+    def period(self, timestamp):
+        """Return the index of the period in force at a UTC epoch second"""
+        return bisect.bisect_right(self.starts, timestamp) - 1
+
+    def offset_at(self, timestamp):
+        """Return the UTC offset in seconds at a UTC epoch second"""
+        return self.offsets[self.period(timestamp)]
+
+    def offsets_every(self, start, step, count):
+        """array of the offsets at start, start + step, ... (count instants)
+
+        Offsets are constant between transitions, so each period is filled
+        with one repeated value rather than looked up instant by instant.
+        """
+        result = array("l")
+        starts = self.starts
+        i = self.period(start)
+        filled = 0
+        while filled < count:
+            if i + 1 < len(starts):
+                # Instants before the next transition (ceiling division)
+                end = min(count, max(filled, -(-(starts[i + 1] - start) // step)))
+            else:
+                end = count
+            if end > filled:
+                result.extend(array("l", [self.offsets[i]]) * (end - filled))
+                filled = end
+            i += 1
+        return result
+
+    def next_transition(self, timestamp):
+        """Index of the first period starting after timestamp, or None
+
+        Only transitions inside the compiled window are known.
+        """
+        i = self.period(timestamp) + 1
+        return i if i < len(self.starts) else None
+
+
+class Snapshot:
+    """Every city's offset, local wall time and DST flag at one UTC instant
+
+    Columns are parallel and in the city order of the TransitionTables that
+    produced them; local_seconds is the UTC timestamp shifted by the offset.
+    """
+
+    __slots__ = ("timestamp", "cities", "offsets", "local_seconds", "dst")
+
+    def __init__(self, timestamp, cities, offsets, local_seconds, dst):
+        self.timestamp = timestamp
+        self.cities = cities
+        self.offsets = offsets
+        self.local_seconds = local_seconds
+        self.dst = dst
+
+
+class RangeChunk:
+    """Offsets and local wall times of every city at a run of UTC instants
+
+    offsets[c] and local_seconds[c] are parallel to instants for the city at
+    position c of the TransitionTables; cities sharing a zone share the same
+    arrays.
+    """
+
+    __slots__ = ("instants", "offsets", "local_seconds")
+
+    def __init__(self, instants, offsets, local_seconds):
+        self.instants = instants
+        self.offsets = offsets
+        self.local_seconds = local_seconds
+
+
+class TransitionTables:
+    """Precompiled offset tables for a city -> zone mapping
+
+    Each distinct zone is compiled once into a ZoneTable. snapshot() converts
+    one UTC instant for all cities in a single pass: per-zone periods are
+    looked up by binary search and then fanned out to the cities using them.
+    Because offsets only change at transitions, the per-city offset column is
+    reused until the earliest upcoming transition of any zone, so successive
+    ticks in between only redo the addition.
+    """
+
+    def __init__(self, time_zones, first_year=None, last_year=None):
+        this_year = time.gmtime().tm_year
+        self.first_year = this_year - 1 if first_year is None else first_year
+        self.last_year = this_year + 5 if last_year is None else last_year
+
+        self.cities = list(time_zones)
+        self.zones = []
+        self.zone_index = {}
+        city_zones = []
+        for tz_name in time_zones.values():
+            if tz_name not in self.zone_index:
+                self.zone_index[tz_name] = len(self.zones)
+                self.zones.append(ZoneTable.compile(tz_name, self.first_year, self.last_year))
+            city_zones.append(self.zone_index[tz_name])
+        self.city_zones = array("l", city_zones)
+
+        # (valid_from, valid_until, offsets, dst): city columns and the span
+        # they hold for, swapped as one tuple so concurrent readers stay consistent
+        self.columns = (0, 0, None, None)
+
+    def __contains__(self, tz_name):
+        return tz_name in self.zone_index
+
+    def zone(self, tz_name):
+        """Return the compiled ZoneTable for tz_name"""
+        return self.zones[self.zone_index[tz_name]]
+
+    def _compute_columns(self, timestamp):
+        """Look up every zone's period at timestamp and build the city columns"""
+        zone_offsets = []
+        zone_dst = []
+        valid_from = BEFORE_TIME
+        valid_until = -BEFORE_TIME
+        for zone in self.zones:
+            i = bisect.bisect_right(zone.starts, timestamp) - 1
+            zone_offsets.append(zone.offsets[i])
+            zone_dst.append(zone.dst[i])
+            valid_from = max(valid_from, zone.starts[i])
+            if i + 1 < len(zone.starts):
+                valid_until = min(valid_until, zone.starts[i + 1])
+
+        return (
+            valid_from,
+            valid_until,
+            array("l", [zone_offsets[z] for z in self.city_zones]),
+            array("b", [zone_dst[z] for z in self.city_zones])
+        )
+
+    def snapshot(self, timestamp):
+        """Convert one UTC epoch second to every city's local time"""
+        timestamp = int(timestamp)
+        columns = self.columns
+        if not columns[0] <= timestamp < columns[1]:
+            columns = self.columns = self._compute_columns(timestamp)
+        offsets, dst = columns[2], columns[3]
+        local_seconds = array("q", [timestamp + offset for offset in offsets])
+        return Snapshot(timestamp, self.cities, offsets, local_seconds, dst)
+
+    def covers(self, start, stop):
+        """True if every instant in [start, stop) is inside the compiled window"""
+        return year_start(self.first_year) <= start and stop <= year_start(self.last_year + 1)
+
+    def time_range(self, start, stop, step, chunk):
+        """Yield RangeChunks for start, start + step, ... before stop, chunk instants each
+
+        Each chunk is computed per zone, then fanned out to the cities, so
+        memory is bounded by the zones times the chunk length whatever the
+        length of the range.
+        """
+        total = max(0, -(-(stop - start) // step))
+        for first in range(0, total, chunk):
+            count = min(chunk, total - first)
+            chunk_start = start + first * step
+            instants = array("q", range(chunk_start, chunk_start + count * step, step))
+            zone_offsets = [zone.offsets_every(chunk_start, step, count) for zone in self.zones]
+            zone_local = [array("q", map(operator.add, instants, offsets)) for offsets in zone_offsets]
+            yield RangeChunk(
+                instants,
+                [zone_offsets[z] for z in self.city_zones],
+                [zone_local[z] for z in self.city_zones]
+            )
+
+    def next_transitions(self, timestamp):
+        """For every city, (UTC start, offset before, offset after, DST after) of
+        its next offset change after timestamp, or None if there is none in the
+        compiled window"""
+        zone_next = []
+        for zone in self.zones:
+            i = zone.next_transition(timestamp)
+            zone_next.append(None if i is None else (
+                zone.starts[i], zone.offsets[i - 1], zone.offsets[i], bool(zone.dst[i])
+            ))
+        return [zone_next[z] for z in self.city_zones]
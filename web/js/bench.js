@@ -0,0 +1,145 @@
+// Frame rate benchmark for the globe's city markers
+//
+// Renders the globe with N random cities and reports frame times once the
+// run is over (also as window.benchResult for scripted runs). Query options:
+//   cities   number of markers (default 10000)
+//   mode     instanced: the marker layer from markers.js (default)
+//            legacy: one sphere mesh, material and point light per city, as
+//            before; keep cities small, every light is added to every shader
+//   seconds  measured duration after a one second warm-up (default 10)
+
+const params = new URLSearchParams(window.location.search);
+const cityCount = parseInt(params.get('cities') || '10000', 10);
+const mode = params.get('mode') || 'instanced';
+const seconds = parseFloat(params.get('seconds') || '10');
+const WARMUP_MS = 1000;
+
+let scene, camera, renderer, globe, markerLayer = null;
+const frameTimes = [];
+let startTime = null;
+let lastTime = null;
+
+function randomCities(count) {
+    const cities = [];
+    for (let i = 0; i < count; i++) {
+        cities.push({
+            name: `City ${i}`,
+            longitude: Math.random() * 360 - 180,
+            // Uniform over the sphere rather than bunched at the poles
+            latitude: Math.asin(Math.random() * 2 - 1) * 180 / Math.PI,
+            daylight: Math.random() < 0.5
+        });
+    }
+    return cities;
+}
+
+// The per-city meshes and lights globe.js used to create
+function addLegacyMarkers(cities) {
+    const position = new THREE.Vector3();
+    cities.forEach(city => {
+        markerPosition(city.longitude, city.latitude, position);
+        const color = city.daylight ? 0xf59e0b : 0x8b5cf6;
+        const marker = new THREE.Mesh(
+            new THREE.SphereGeometry(0.05, 16, 16),
+            new THREE.MeshBasicMaterial({ color: color })
+        );
+        marker.position.copy(position);
+        globe.add(marker);
+
+        const light = new THREE.PointLight(color, 0.5, 0.5);
+        light.position.copy(position);
+        globe.add(light);
+    });
+}
+
+function setup() {
+    scene = new THREE.Scene();
+    camera = new THREE.PerspectiveCamera(45, window.innerWidth / window.innerHeight, 0.1, 1000);
+    camera.position.z = 4;
+
+    renderer = new THREE.WebGLRenderer({ antialias: true, alpha: true });
+    renderer.setSize(window.innerWidth, window.innerHeight);
+    renderer.setPixelRatio(window.devicePixelRatio);
+    document.getElementById('globe-container').appendChild(renderer.domElement);
+
+    scene.add(new THREE.AmbientLight(0x404040, 1));
+    const directionalLight = new THREE.DirectionalLight(0xffffff, 1);
+    directionalLight.position.set(5, 3, 5);
+    scene.add(directionalLight);
+
+    // Same Phong globe as the app, so per-pixel lighting cost is comparable
+    globe = new THREE.Mesh(
+        new THREE.SphereGeometry(2, 64, 64),
+        new THREE.MeshPhongMaterial({
+            color: 0x1e3a8a,
+            emissive: 0x072655,
+            specular: 0x3b82f6,
+            shininess: 15,
+            transparent: true,
+            opacity: 0.9
+        })
+    );
+    scene.add(globe);
+
+    const cities = randomCities(cityCount);
+    if (mode === 'legacy') {
+        addLegacyMarkers(cities);
+    } else {
+        markerLayer = createMarkerLayer(cities);
+        globe.add(markerLayer.mesh);
+    }
+}
+
+function percentile(sorted, fraction) {
+    return sorted[Math.min(sorted.length - 1, Math.round(fraction * (sorted.length - 1)))];
+}
+
+function report() {
+    const sorted = frameTimes.slice().sort((a, b) => a - b);
+    const total = frameTimes.reduce((sum, value) => sum + value, 0);
+    const result = {
+        mode: mode,
+        cities: cityCount,
+        frames: frameTimes.length,
+        fps: frameTimes.length / (total / 1000),
+        p50: percentile(sorted, 0.5),
+        p95: percentile(sorted, 0.95),
+        p99: percentile(sorted, 0.99),
+        worst: sorted[sorted.length - 1]
+    };
+    window.benchResult = result;
+    document.getElementById('bench-result').textContent =
+        `${result.mode}, ${result.cities} cities, ${result.frames} frames\n` +
+        `${result.fps.toFixed(1)} fps\n` +
+        `frame ms p50 ${result.p50.toFixed(2)}  p95 ${result.p95.toFixed(2)}  ` +
+        `p99 ${result.p99.toFixed(2)}  worst ${result.worst.toFixed(2)}`;
+    console.log('bench result', JSON.stringify(result));
+}
+
+function frame(now) {
+    if (startTime === null) {
+        startTime = now;
+    }
+    const elapsed = now - startTime;
+    if (lastTime !== null && elapsed > WARMUP_MS) {
+        frameTimes.push(now - lastTime);
+    }
+    lastTime = now;
+
+    if (elapsed > WARMUP_MS + seconds * 1000) {
+        report();
+        return;
+    }
+
+    globe.rotation.y += 0.001;
+    if (markerLayer) {
+        animateMarkers(markerLayer, now / 1000);
+    }
+    renderer.render(scene, camera);
+    requestAnimationFrame(frame);
+}
+
+window.addEventListener('load', () => {
+    setup();
+    requestAnimationFrame(frame);
+});
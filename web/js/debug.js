@@ -0,0 +1,128 @@
+// Debug overlay: frame times, JS heap growth and garbage collections over time
+//
+// Enabled with ?debug=1 or by pressing "d". Per frame it only writes the frame
+// time into a preallocated ring; the text and graph are redrawn twice a second.
+// Browsers do not report collections to pages, so a drop in the used JS heap
+// (performance.memory, Chromium only) is counted as one, and the longest frame
+// since the previous sample is shown as its likely pause.
+
+const DEBUG_FRAMES = 240;         // frame times kept for the graph and percentiles
+const DEBUG_HEAP_SAMPLES = 240;   // heap samples kept, one per DEBUG_REFRESH_MS
+const DEBUG_REFRESH_MS = 500;
+
+// describe, if given, returns one more line of text for the overlay
+function createDebugOverlay(describe) {
+    const panel = document.createElement('div');
+    panel.id = 'debug-overlay';
+    const text = document.createElement('pre');
+    const graph = document.createElement('canvas');
+    graph.width = DEBUG_FRAMES;
+    graph.height = 60;
+    panel.appendChild(text);
+    panel.appendChild(graph);
+    document.body.appendChild(panel);
+    const context = graph.getContext('2d');
+
+    const frames = new Float32Array(DEBUG_FRAMES);
+    const sorted = new Float32Array(DEBUG_FRAMES);
+    const heap = new Float64Array(DEBUG_HEAP_SAMPLES);
+    const memory = performance.memory;
+
+    const state = {
+        frameCount: 0,
+        heapCount: 0,
+        lastFrame: null,
+        lastRefresh: 0,
+        longestFrame: 0,
+        startHeap: memory ? memory.usedJSHeapSize : 0,
+        startTime: performance.now(),
+        collections: 0,
+        lastPause: 0
+    };
+
+    function sampleHeap() {
+        if (!memory) {
+            return;
+        }
+        const used = memory.usedJSHeapSize;
+        const previous = state.heapCount > 0 ? heap[(state.heapCount - 1) % DEBUG_HEAP_SAMPLES] : used;
+        if (used < previous) {
+            state.collections++;
+            state.lastPause = state.longestFrame;
+        }
+        heap[state.heapCount % DEBUG_HEAP_SAMPLES] = used;
+        state.heapCount++;
+    }
+
+    function draw(now) {
+        const count = Math.min(state.frameCount, DEBUG_FRAMES);
+        sorted.set(frames);
+        const recent = sorted.subarray(0, count).sort();
+        const p50 = count ? recent[Math.floor(count * 0.5)] : 0;
+        const p95 = count ? recent[Math.floor(count * 0.95)] : 0;
+        const worst = count ? recent[count - 1] : 0;
+
+        let heapLine = 'JS heap: not reported by this browser';
+        if (memory) {
+            const used = memory.usedJSHeapSize / 1048576;
+            const minutes = (now - state.startTime) / 60000;
+            const growth = (memory.usedJSHeapSize - state.startHeap) / 1048576 / Math.max(minutes, 1 / 60);
+            heapLine = `JS heap ${used.toFixed(1)} MB, ${growth >= 0 ? '+' : ''}${growth.toFixed(2)} MB/min\n` +
+                `GCs (heap drops) ${state.collections}, last pause <= ${state.lastPause.toFixed(1)} ms`;
+        }
+        text.textContent =
+            `frame ms p50 ${p50.toFixed(1)}  p95 ${p95.toFixed(1)}  worst ${worst.toFixed(1)}\n` + heapLine +
+            (describe ? `\n${describe()}` : '');
+
+        // Frame times (bars, 33 ms full scale) with the heap trend on top
+        context.clearRect(0, 0, graph.width, graph.height);
+        context.fillStyle = '#06B6D4';
+        for (let i = 0; i < count; i++) {
+            const value = frames[(state.frameCount - count + i) % DEBUG_FRAMES];
+            const height = Math.min(value / 33.3, 1) * graph.height;
+            context.fillRect(i, graph.height - height, 1, height);
+        }
+        const heapCount = Math.min(state.heapCount, DEBUG_HEAP_SAMPLES);
+        if (heapCount > 1) {
+            let low = Infinity;
+            let high = -Infinity;
+            for (let i = 0; i < heapCount; i++) {
+                low = Math.min(low, heap[i]);
+                high = Math.max(high, heap[i]);
+            }
+            context.strokeStyle = '#F59E0B';
+            context.beginPath();
+            for (let i = 0; i < heapCount; i++) {
+                const value = heap[(state.heapCount - heapCount + i) % DEBUG_HEAP_SAMPLES];
+                const x = i * graph.width / (DEBUG_HEAP_SAMPLES - 1);
+                const y = graph.height - (value - low) / Math.max(high - low, 1) * (graph.height - 2) - 1;
+                i === 0 ? context.moveTo(x, y) : context.lineTo(x, y);
+            }
+            context.stroke();
+        }
+    }
+
+    return {
+        panel: panel,
+
+        // Record one frame; now is the frame's requestAnimationFrame timestamp
+        frame(now) {
+            if (state.lastFrame !== null) {
+                const duration = now - state.lastFrame;
+                frames[state.frameCount % DEBUG_FRAMES] = duration;
+                state.frameCount++;
+                state.longestFrame = Math.max(state.longestFrame, duration);
+            }
+            state.lastFrame = now;
+
+            if (now - state.lastRefresh >= DEBUG_REFRESH_MS) {
+                sampleHeap();
+                if (!panel.hidden) {
+                    draw(now);
+                }
+                state.lastRefresh = now;
+                state.longestFrame = 0;
+            }
+        }
+    };
+}
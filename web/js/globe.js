@@ -1,8 +1,20 @@
 // Globe visualization using Three.js
-let scene, camera, renderer, globe, cityMarkers = {}, timeData = {};
+let scene, camera, renderer, globe, markerLayer = null, timeData = {}, cityInfo = {}, cityListId = null;
 let raycaster = new THREE.Raycaster();
 let mouse = new THREE.Vector2();
 let selectedCity = null;
+let hoveredCity = null;
+let streamTime = null;
+let frameGovernor = null;
+let debugOverlay = null;
+const pageParams = new URLSearchParams(window.location.search);
+
+// Globe spin in radians per millisecond (0.001 a frame at 60 fps), so the
+// speed does not depend on the frame rate
+const ROTATION_SPEED = 0.06 / 1000;
+
+// Longest frame gap the spin catches up on
+const MAX_FRAME_STEP = 1000;
 
 // Initialize the 3D scene
 function init() {
@@ -54,100 +66,74 @@ function init() {
     window.addEventListener('mousemove', onMouseMove);
     window.addEventListener('click', onMouseClick);
 
-    // Fetch initial time data
-    updateTimeData();
-
-    // Start animation loop
-    animate();
-}
-
-// Add grid lines to represent longitude and latitude
-function addGridLines() {
-    // Add longitude lines
-    for (let i = 0; i < 24; i++) {
-        const material = new THREE.LineBasicMaterial({ 
-            color: 0x3b82f6,
-            transparent: true,
-            opacity: 0.3
-        });
-
-        const points = [];
-        const angle = (i / 24) * Math.PI * 2;
-
-        for (let j = 0; j <= 180; j++) {
-            const latitude = (j - 90) * Math.PI / 180;
-            const x = 2 * Math.cos(latitude) * Math.cos(angle);
-            const y = 2 * Math.sin(latitude);
-            const z = 2 * Math.cos(latitude) * Math.sin(angle);
-
-            points.push(new THREE.Vector3(x, y, z));
-        }
+    // Fetch static city data once, then follow the time data
+    loadCityInfo().then(updateTimeData);
 
-        const geometry = new THREE.BufferGeometry().setFromPoints(points);
-        const line = new THREE.Line(geometry, material);
-        scene.add(line);
+    // Frame time, heap and GC overlay with ?debug=1, toggled with "d"
+    if (pageParams.has('debug')) {
+        debugOverlay = createDebugOverlay(describeFrameRate);
     }
+    window.addEventListener('keydown', onKeyDown);
 
-    // Add latitude lines
-    for (let i = -80; i <= 80; i += 20) {
-        const material = new THREE.LineBasicMaterial({ 
-            color: 0x06b6d4,
-            transparent: true,
-            opacity: 0.3
-        });
-
-        const points = [];
-        const latitude = i * Math.PI / 180;
+    // Start animation loop; paused while hidden, slower when idle
+    frameGovernor = createFrameGovernor(animate, governorOptions(pageParams));
+}
 
-        for (let j = 0; j <= 360; j++) {
-            const angle = j * Math.PI / 180;
-            const radius = 2 * Math.cos(latitude);
-            const x = radius * Math.cos(angle);
-            const y = 2 * Math.sin(latitude);
-            const z = radius * Math.sin(angle);
+// Add grid lines to represent longitude and latitude, batched into one
+// LineSegments geometry (one draw call per color)
+function addGridLines(density = GRATICULE_DENSITY) {
+    // ?graticule=server uses the buffer precomputed by the Python server
+    if (pageParams.get('graticule') === 'server') {
+        fetchGraticuleBuffer(density)
+            .then(buffer => scene.add(createGraticule(buffer)))
+            .catch(error => {
+                console.error('Error fetching graticule:', error);
+                scene.add(createGraticule(graticuleBuffer(density)));
+            });
+        return;
+    }
+    scene.add(createGraticule(graticuleBuffer(density)));
+}
 
-            points.push(new THREE.Vector3(x, y, z));
-        }
+// Update the globe rotation and city markers; the frame governor calls this
+// with the requestAnimationFrame timestamp and the time since the last frame
+//
+// Nothing here allocates: that timestamp is the only time sample, and the
+// marker layer keeps its positions in typed arrays and animates on the GPU,
+// so steady-state frames leave no garbage to collect.
+function animate(now, elapsed) {
+    // Rotate the globe slowly
+    globe.rotation.y += ROTATION_SPEED * Math.min(elapsed, MAX_FRAME_STEP);
 
-        const geometry = new THREE.BufferGeometry().setFromPoints(points);
-        const line = new THREE.Line(geometry, material);
-        scene.add(line);
+    // Pulse the city markers; culling and coloring happen on the GPU
+    if (markerLayer) {
+        animateMarkers(markerLayer, now / 1000);
     }
 
-    // Add equator with special styling
-    const equatorMaterial = new THREE.LineBasicMaterial({ 
-        color: 0x8b5cf6,
-        transparent: true,
-        opacity: 0.6,
-        linewidth: 2
-    });
-
-    const equatorPoints = [];
-    for (let j = 0; j <= 360; j++) {
-        const angle = j * Math.PI / 180;
-        const x = 2 * Math.cos(angle);
-        const y = 0;
-        const z = 2 * Math.sin(angle);
+    renderer.render(scene, camera);
 
-        equatorPoints.push(new THREE.Vector3(x, y, z));
+    if (debugOverlay) {
+        debugOverlay.frame(now);
     }
-
-    const equatorGeometry = new THREE.BufferGeometry().setFromPoints(equatorPoints);
-    const equator = new THREE.Line(equatorGeometry, equatorMaterial);
-    scene.add(equator);
 }
 
-// Update the globe rotation and city markers
-function animate() {
-    requestAnimationFrame(animate);
-
-    // Rotate the globe slowly
-    globe.rotation.y += 0.001;
-
-    // Update city markers
-    updateCityMarkers();
+// Frame governor line of the debug overlay
+function describeFrameRate() {
+    const governor = frameGovernor;
+    return `${governor.state}: ${governor.currentFps.toFixed(1)} of ${governor.targetFps} fps, ` +
+        `frame ${governor.frameCost.toFixed(2)} ms`;
+}
 
-    renderer.render(scene, camera);
+// Show or hide the debug overlay
+function onKeyDown(event) {
+    if (event.key !== 'd' || event.ctrlKey || event.metaKey || event.altKey) {
+        return;
+    }
+    if (!debugOverlay) {
+        debugOverlay = createDebugOverlay(describeFrameRate);
+    } else {
+        debugOverlay.panel.hidden = !debugOverlay.panel.hidden;
+    }
 }
 
 // Handle window resize
@@ -157,17 +143,81 @@ function onWindowResize() {
     renderer.setSize(window.innerWidth, window.innerHeight);
 }
 
-// Fetch time data from Python backend
-function updateTimeData() {
-    // In a real implementation, this would be an API call
-    // For now, we'll manually update with some sample data
-    fetch('/api/time-data')
-        .then(response => response.json())
+// Fetch the static city metadata (names, zones, coordinates); cached by ETag
+function loadCityInfo() {
+    return fetch('/api/cities')
+        .then(response => {
+            // Binary time data names its city list by the start of this ETag
+            cityListId = (response.headers.get('ETag') || '').replace(/"/g, '').slice(0, 16);
+            return response.json();
+        })
         .then(data => {
-            timeData = data;
+            cityInfo = data;
+        })
+        .catch(error => {
+            console.error('Error fetching city data:', error);
+        });
+}
 
-            // Update city markers if they exist
-            if (Object.keys(cityMarkers).length === 0) {
+// Combine per-second time entries with the static city metadata
+function withCityInfo(data) {
+    Object.entries(data).forEach(([city, entry]) => {
+        Object.assign(entry, cityInfo[city]);
+    });
+    return data;
+}
+
+// Subscribe to the time stream from the Python backend
+function updateTimeData() {
+    // Fall back to polling where Server-Sent Events are unavailable
+    if (!window.EventSource) {
+        pollTimeData();
+        return;
+    }
+
+    const stream = new EventSource('/api/time-stream');
+
+    // Full city data, sent once per connection (and again after a reconnect)
+    stream.addEventListener('snapshot', event => {
+        const snapshot = JSON.parse(event.data);
+        timeData = withCityInfo(snapshot.cities);
+        createCityMarkers();
+        applyTick(snapshot.t, {});
+    });
+
+    // Each second: the UTC instant plus only the cities whose offset, date or daylight changed
+    stream.addEventListener('tick', event => {
+        const tick = JSON.parse(event.data);
+        applyTick(tick.t, tick.changed);
+    });
+
+    stream.onerror = error => {
+        // EventSource reconnects by itself and receives a fresh snapshot
+        console.error('Time stream interrupted:', error);
+    };
+}
+
+// Poll the time data once a second in the binary format: one offset per
+// city, read in place, with everything else derived here
+function pollTimeData() {
+    fetch('/api/time-data?format=binary')
+        .then(response => response.arrayBuffer())
+        .then(buffer => {
+            const tick = decodeTimeData(buffer);
+            if (tick.cityListId !== cityListId) {
+                // The server's cities changed; fetch them and rebuild the markers
+                return loadCityInfo().then(() => {
+                    timeData = {};
+                    if (markerLayer) {
+                        disposeMarkerLayer(markerLayer);
+                        markerLayer = null;
+                    }
+                });
+            }
+            applyOffsets(tick);
+
+            // Create the city markers on the first response
+            if (!markerLayer) {
                 createCityMarkers();
             }
 
@@ -176,134 +226,138 @@ function updateTimeData() {
         })
         .catch(error => {
             console.error('Error fetching time data:', error);
-            // Use fallback data for demo
-            // This would be provided by the Python backend in real implementation
         });
 
     // Update every second
-    setTimeout(updateTimeData, 1000);
+    setTimeout(pollTimeData, 1000);
 }
 
-// Create markers for each city
-function createCityMarkers() {
-    // Clear existing markers
-    Object.values(cityMarkers).forEach(marker => {
-        scene.remove(marker);
-    });
-    cityMarkers = {};
+// Read a binary /api/time-data body (layout in wireformat.py) through a DataView
+function decodeTimeData(buffer) {
+    const view = new DataView(buffer);
+    if (view.getUint32(0, true) !== 0x44544543) { // "CETD"
+        throw new Error('Not a binary time-data body');
+    }
+    let listId = '';
+    for (let i = 16; i < 24; i++) {
+        listId += view.getUint8(i).toString(16).padStart(2, '0');
+    }
+    return {
+        view: view,
+        count: view.getUint32(4, true),
+        // int64 epoch second, exact as a double for any real date
+        t: view.getUint32(8, true) + view.getInt32(12, true) * 4294967296,
+        cityListId: listId
+    };
+}
 
-    // Create new markers
-    Object.entries(timeData).forEach(([city, data]) => {
-        const [longitude, latitude, timezone] = data.coords;
+// Fill timeData from a decoded tick; cities come in /api/cities order
+function applyOffsets(tick) {
+    const names = Object.keys(cityInfo);
+    for (let i = 0; i < tick.count && i < names.length; i++) {
+        const city = names[i];
+        const entry = timeData[city] || (timeData[city] = Object.assign({}, cityInfo[city]));
+        entry.offset = formatOffset(tick.view.getInt32(24 + 4 * i, true));
+        setLocalTime(entry, tick.t);
+        const daylight = entry.hour >= 6 && entry.hour < 18;
+        if (markerLayer && daylight !== entry.daylight) {
+            setMarkerDaylight(markerLayer, city, daylight);
+        }
+        entry.daylight = daylight;
+    }
+    streamTime = tick.t;
+}
 
-        // Convert coordinates to 3D position
-        const phi = (90 - latitude) * Math.PI / 180;
-        const theta = (longitude + 180) * Math.PI / 180;
+// Merge a stream tick into timeData
+function applyTick(epochSeconds, changed) {
+    for (const city in changed) {
+        const fields = changed[city];
+        if (timeData[city]) {
+            Object.assign(timeData[city], fields);
+            if (markerLayer && 'daylight' in fields) {
+                setMarkerDaylight(markerLayer, city, fields.daylight);
+            }
+        }
+    }
 
-        const x = -2.1 * Math.sin(phi) * Math.cos(theta);
-        const y = 2.1 * Math.cos(phi);
-        const z = 2.1 * Math.sin(phi) * Math.sin(theta);
+    streamTime = epochSeconds;
+    updateSelectedCityDisplay();
+}
 
-        // Create marker
-        const markerGeometry = new THREE.SphereGeometry(0.05, 16, 16);
-        const markerMaterial = new THREE.MeshBasicMaterial({ 
-            color: data.daylight ? 0xf59e0b : 0x8b5cf6
-        });
+// Convert a "+0530" style offset to seconds
+function offsetSeconds(offset) {
+    const sign = offset[0] === '-' ? -1 : 1;
+    return sign * (parseInt(offset.slice(1, 3), 10) * 3600 + parseInt(offset.slice(3, 5), 10) * 60);
+}
 
-        const marker = new THREE.Mesh(markerGeometry, markerMaterial);
-        marker.position.set(x, y, z);
-        marker.userData = { city: city };
-        scene.add(marker);
-
-        // Add pulsing light effect
-        const pulseLight = new THREE.PointLight(
-            data.daylight ? 0xf59e0b : 0x8b5cf6, 
-            0.5, 
-            0.5
-        );
-        pulseLight.position.set(x, y, z);
-        scene.add(pulseLight);
-
-        // Store reference to marker
-        cityMarkers[city] = {
-            marker: marker,
-            light: pulseLight,
-            position: new THREE.Vector3(x, y, z)
-        };
-    });
+// Format seconds as a "+0530" style offset
+function formatOffset(seconds) {
+    const sign = seconds < 0 ? '-' : '+';
+    const minutes = Math.abs(seconds) / 60;
+    return sign + String(Math.floor(minutes / 60)).padStart(2, '0') + String(minutes % 60).padStart(2, '0');
+}
+
+// Fill in a city's time fields for a UTC epoch second
+function setLocalTime(cityData, epochSeconds) {
+    const local = new Date((epochSeconds + offsetSeconds(cityData.offset)) * 1000);
+    cityData.time = local.toISOString().slice(11, 19);
+    cityData.date = local.toISOString().slice(0, 10);
+    cityData.hour = local.getUTCHours();
+    cityData.minute = local.getUTCMinutes();
+    cityData.second = local.getUTCSeconds();
 }
 
-// Update city markers (colors, positions based on rotation)
-function updateCityMarkers() {
-    Object.entries(cityMarkers).forEach(([city, markerObj]) => {
-        const { marker, light, position } = markerObj;
-
-        // Check if the marker is on the visible side of the globe
-        const dotProduct = new THREE.Vector3(0, 0, 1).dot(
-            position.clone().applyMatrix4(globe.matrixWorld).normalize()
-        );
-
-        // Make visible only if facing the camera
-        if (dotProduct > 0) {
-            marker.visible = true;
-            light.visible = true;
-
-            // Pulse effect
-            const time = Date.now() * 0.001;
-            const pulse = (Math.sin(time * 2) + 1) / 4 + 0.5;
-            light.intensity = pulse;
-        } else {
-            marker.visible = false;
-            light.visible = false;
+// Create the marker layer for every city with coordinates
+function createCityMarkers() {
+    if (markerLayer) {
+        disposeMarkerLayer(markerLayer);
+    }
+
+    const cities = [];
+    Object.entries(timeData).forEach(([city, data]) => {
+        if (data.coords) {
+            cities.push({
+                name: city,
+                longitude: data.coords[0],
+                latitude: data.coords[1],
+                daylight: data.daylight
+            });
         }
     });
+
+    // Markers are children of the globe so they turn with it
+    markerLayer = createMarkerLayer(cities);
+    globe.add(markerLayer.mesh);
 }
 
-// Handle mouse move for interactions
-function onMouseMove(event) {
-    // Calculate mouse position in normalized device coordinates
+// City under the pointer, found without testing every marker
+function cityAtPointer(event) {
+    if (!markerLayer) {
+        return null;
+    }
     mouse.x = (event.clientX / window.innerWidth) * 2 - 1;
     mouse.y = -(event.clientY / window.innerHeight) * 2 + 1;
-
-    // Check for intersections with city markers
     raycaster.setFromCamera(mouse, camera);
+    return markerAtRay(markerLayer, raycaster.ray);
+}
 
-    // Get all city markers for intersection test
-    const markerObjects = Object.values(cityMarkers).map(m => m.marker);
-    const intersects = raycaster.intersectObjects(markerObjects);
-
-    // Reset all markers to normal size
-    markerObjects.forEach(marker => {
-        marker.scale.set(1, 1, 1);
-    });
-
-    // If intersection found, highlight the marker
-    if (intersects.length > 0) {
-        const marker = intersects[0].object;
-        marker.scale.set(1.5, 1.5, 1.5);
-        document.body.style.cursor = 'pointer';
-    } else {
-        document.body.style.cursor = 'default';
+// Handle mouse move for interactions
+function onMouseMove(event) {
+    const city = cityAtPointer(event);
+    if (city !== hoveredCity) {
+        hoveredCity = city;
+        if (markerLayer) {
+            highlightMarker(markerLayer, city);
+        }
     }
+    document.body.style.cursor = city ? 'pointer' : 'default';
 }
 
 // Handle mouse click for selecting cities
 function onMouseClick(event) {
-    // Calculate mouse position in normalized device coordinates
-    mouse.x = (event.clientX / window.innerWidth) * 2 - 1;
-    mouse.y = -(event.clientY / window.innerHeight) * 2 + 1;
-
-    // Check for intersections with city markers
-    raycaster.setFromCamera(mouse, camera);
-
-    // Get all city markers for intersection test
-    const markerObjects = Object.values(cityMarkers).map(m => m.marker);
-    const intersects = raycaster.intersectObjects(markerObjects);
-
-    // If intersection found, select the city
-    if (intersects.length > 0) {
-        const marker = intersects[0].object;
-        selectedCity = marker.userData.city;
+    const city = cityAtPointer(event);
+    if (city) {
+        selectedCity = city;
         updateSelectedCityDisplay();
     }
 }
@@ -312,6 +366,12 @@ function onMouseClick(event) {
 function updateSelectedCityDisplay() {
     if (selectedCity && timeData[selectedCity]) {
         const cityData = timeData[selectedCity];
+
+        // On the stream, derive the clock locally from the tick and the city's offset
+        if (streamTime !== null) {
+            setLocalTime(cityData, streamTime);
+        }
+
         const cityElement = document.getElementById('current-city');
         cityElement.innerHTML = `
             <h2>${selectedCity}</h2>
@@ -0,0 +1,140 @@
+// Adaptive frame rate for the globe animation
+//
+// Rendering stops while the page is hidden, runs at the idle rate once there
+// has been no input for a while (or the window lost focus) and at the full
+// rate otherwise, and never faster than the render budget allows: the share
+// of each second the measured frame time may take. Below the display's rate,
+// frames wait on a timer instead of spinning through requestAnimationFrame.
+// Options come from the page URL:
+//   fps        frame rate while in use (default 60)
+//   idle_fps   frame rate when idle (default 5)
+//   budget     share of time frames may take, 0-1 (default 0.25)
+
+const GOVERNOR_DEFAULTS = { fps: 60, idleFps: 5, budget: 0.25, idleAfter: 30000 };
+const GOVERNOR_INPUT_EVENTS = ['pointermove', 'pointerdown', 'wheel', 'keydown', 'touchstart'];
+
+// Weight of the newest frame in the frame cost and frame rate averages
+const GOVERNOR_SMOOTHING = 0.1;
+
+// Time a timer-delayed frame leaves for requestAnimationFrame to line it up with the display
+const DISPLAY_FRAME_MS = 8;
+
+function governorOptions(params) {
+    const options = {};
+    [['fps', 'fps'], ['idle_fps', 'idleFps'], ['budget', 'budget']].forEach(([param, key]) => {
+        const value = parseFloat(params.get(param));
+        if (value > 0) {
+            options[key] = value;
+        }
+    });
+    return options;
+}
+
+// Run frame(now, elapsedMs) at the governed rate; the returned object exposes
+// currentFps, targetFps, frameCost (ms) and state ('active', 'idle', 'hidden')
+function createFrameGovernor(frame, options = {}) {
+    const config = Object.assign({}, GOVERNOR_DEFAULTS, options);
+    const governor = {
+        config: config,
+        currentFps: 0,
+        targetFps: config.fps,
+        frameCost: 0,
+        state: 'active'
+    };
+
+    let lastFrame = null;
+    let lastInput = performance.now();
+    let focused = document.hasFocus();
+    let request = null;
+    let timer = null;
+
+    function refresh(now) {
+        if (document.visibilityState === 'hidden') {
+            governor.state = 'hidden';
+            governor.targetFps = 0;
+            return;
+        }
+        const idle = !focused || now - lastInput >= config.idleAfter;
+        governor.state = idle ? 'idle' : 'active';
+        let target = idle ? config.idleFps : config.fps;
+        if (governor.frameCost > 0) {
+            target = Math.min(target, Math.max(1, Math.floor(config.budget * 1000 / governor.frameCost)));
+        }
+        governor.targetFps = target;
+    }
+
+    function cancel() {
+        if (request !== null) {
+            cancelAnimationFrame(request);
+            request = null;
+        }
+        if (timer !== null) {
+            clearTimeout(timer);
+            timer = null;
+        }
+    }
+
+    function schedule() {
+        cancel();
+        if (governor.targetFps === 0) {
+            lastFrame = null;
+            governor.currentFps = 0;
+            return;
+        }
+        const wait = lastFrame === null ? 0 : lastFrame + 1000 / governor.targetFps - performance.now() - DISPLAY_FRAME_MS;
+        if (wait > 0) {
+            timer = setTimeout(() => {
+                timer = null;
+                request = requestAnimationFrame(run);
+            }, wait);
+        } else {
+            request = requestAnimationFrame(run);
+        }
+    }
+
+    function run(now) {
+        request = null;
+        const elapsed = lastFrame === null ? 0 : now - lastFrame;
+        if (elapsed > 0) {
+            const fps = 1000 / elapsed;
+            governor.currentFps += GOVERNOR_SMOOTHING * (fps - governor.currentFps);
+        }
+        lastFrame = now;
+
+        const started = performance.now();
+        frame(now, elapsed);
+        const cost = performance.now() - started;
+        governor.frameCost += GOVERNOR_SMOOTHING * (cost - governor.frameCost);
+
+        refresh(now);
+        schedule();
+    }
+
+    // Input (or focus) makes the full rate apply at once rather than at the next idle frame
+    function wake() {
+        const wasIdle = governor.state !== 'active';
+        lastInput = performance.now();
+        refresh(lastInput);
+        if (wasIdle && governor.state === 'active') {
+            schedule();
+        }
+    }
+
+    GOVERNOR_INPUT_EVENTS.forEach(name => window.addEventListener(name, wake, { passive: true }));
+    window.addEventListener('focus', () => {
+        focused = true;
+        wake();
+    });
+    window.addEventListener('blur', () => {
+        focused = false;
+        refresh(performance.now());
+    });
+    document.addEventListener('visibilitychange', () => {
+        refresh(performance.now());
+        schedule();
+    });
+
+    refresh(performance.now());
+    schedule();
+    return governor;
+}
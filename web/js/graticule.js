@@ -0,0 +1,97 @@
+// Globe graticule (meridians, parallels, equator) as one THREE.LineSegments
+//
+// All lines share a single Float32Array geometry with one group, and so one
+// draw call, per material. The vertex buffer uses the layout graticule.py
+// serves from /api/graticule: three uint32 vertex counts (meridians,
+// parallels, equator) followed by float32 x, y, z per vertex, each pair of
+// vertices being one segment.
+
+const GRATICULE_RADIUS = 2;
+
+// Default density: meridians around the globe, degrees between parallels and
+// degrees between the vertices along every line
+const GRATICULE_DENSITY = { meridians: 24, parallelStep: 20, step: 1 };
+
+// Shared by every graticule: meridians, parallels, equator
+const GRATICULE_MATERIALS = [
+    new THREE.LineBasicMaterial({ color: 0x3b82f6, transparent: true, opacity: 0.3 }),
+    new THREE.LineBasicMaterial({ color: 0x06b6d4, transparent: true, opacity: 0.3 }),
+    new THREE.LineBasicMaterial({ color: 0x8b5cf6, transparent: true, opacity: 0.6, linewidth: 2 })
+];
+
+// Build the graticule buffer in the browser, matching graticule_buffer() in Python
+function graticuleBuffer(density = GRATICULE_DENSITY) {
+    const meridianSteps = Math.ceil(180 / density.step);
+    const circleSteps = Math.ceil(360 / density.step);
+    const first = -Math.ceil(90 / density.parallelStep) + 1;
+    const parallels = [];
+    for (let k = first; k <= -first; k++) {
+        if (k !== 0) {
+            parallels.push(k * density.parallelStep);
+        }
+    }
+
+    const counts = [
+        density.meridians * meridianSteps * 2,
+        parallels.length * circleSteps * 2,
+        circleSteps * 2
+    ];
+    const buffer = new ArrayBuffer(12 + (counts[0] + counts[1] + counts[2]) * 12);
+    new Uint32Array(buffer, 0, 3).set(counts);
+    const vertices = new Float32Array(buffer, 12);
+
+    let offset = 0;
+    // Segments between consecutive points of one line, (angle, latitude) in degrees
+    function addLine(steps, pointAt) {
+        for (let j = 0; j < steps; j++) {
+            offset = writePoint(vertices, offset, pointAt(j));
+            offset = writePoint(vertices, offset, pointAt(j + 1));
+        }
+    }
+
+    for (let i = 0; i < density.meridians; i++) {
+        const angle = 360 * i / density.meridians;
+        addLine(meridianSteps, j => [angle, -90 + 180 * j / meridianSteps]);
+    }
+    parallels.forEach(latitude => {
+        addLine(circleSteps, j => [360 * j / circleSteps, latitude]);
+    });
+    addLine(circleSteps, j => [360 * j / circleSteps, 0]);
+    return buffer;
+}
+
+function writePoint(vertices, offset, [angle, latitude]) {
+    const a = angle * Math.PI / 180;
+    const l = latitude * Math.PI / 180;
+    vertices[offset] = GRATICULE_RADIUS * Math.cos(l) * Math.cos(a);
+    vertices[offset + 1] = GRATICULE_RADIUS * Math.sin(l);
+    vertices[offset + 2] = GRATICULE_RADIUS * Math.cos(l) * Math.sin(a);
+    return offset + 3;
+}
+
+// Fetch the precomputed buffer for a density from the Python server
+function fetchGraticuleBuffer(density = GRATICULE_DENSITY) {
+    const query = `meridians=${density.meridians}&parallel_step=${density.parallelStep}&step=${density.step}`;
+    return fetch(`/api/graticule?${query}`).then(response => {
+        if (!response.ok) {
+            throw new Error(`graticule request failed: ${response.status}`);
+        }
+        return response.arrayBuffer();
+    });
+}
+
+// The graticule object for a buffer from graticuleBuffer() or the server
+function createGraticule(buffer) {
+    const counts = new DataView(buffer, 0, 12);
+    const meridians = counts.getUint32(0, true);
+    const parallels = counts.getUint32(4, true);
+    const equator = counts.getUint32(8, true);
+
+    const geometry = new THREE.BufferGeometry();
+    geometry.setAttribute('position', new THREE.BufferAttribute(new Float32Array(buffer, 12), 3));
+    geometry.addGroup(0, meridians, 0);
+    geometry.addGroup(meridians, parallels, 1);
+    geometry.addGroup(meridians + parallels, equator, 2);
+    geometry.computeBoundingSphere();
+    return new THREE.LineSegments(geometry, GRATICULE_MATERIALS);
+}
@@ -0,0 +1,202 @@
+// City markers as one THREE.InstancedMesh: a single draw call for every city,
+// with the pulse, the day/night color and far-side culling done in the shader
+
+// Markers sit slightly above the globe surface (radius 2)
+const MARKER_RADIUS = 2.1;
+const DAY_COLOR = new THREE.Color(0xf59e0b);
+const NIGHT_COLOR = new THREE.Color(0x8b5cf6);
+
+// Grid used to find the marker under the pointer without testing every city
+const HIT_CELL_DEGREES = 5;
+
+// Out-of-the-way highlight position meaning "no marker highlighted"
+const NO_HIGHLIGHT = new THREE.Vector3(1e3, 1e3, 1e3);
+
+const markerVertexShader = `
+    uniform float time;
+    uniform vec3 highlight;
+    varying vec3 vColor;
+    varying float vPulse;
+
+    void main() {
+        // Marker center in the globe's frame and in the world
+        vec3 center = (instanceMatrix * vec4(0.0, 0.0, 0.0, 1.0)).xyz;
+        vec3 worldCenter = (modelMatrix * vec4(center, 1.0)).xyz;
+        vec3 globeCenter = (modelMatrix * vec4(0.0, 0.0, 0.0, 1.0)).xyz;
+
+        // Markers on the far side collapse to a point and produce no fragments
+        float facing = dot(normalize(worldCenter - globeCenter), normalize(cameraPosition - worldCenter));
+        float size = facing > 0.0 ? 1.0 : 0.0;
+
+        // Each city gets its own phase so the pulses do not beat in unison
+        float pulse = 0.5 + 0.5 * sin(time * 2.0 + dot(center, vec3(12.9898, 78.233, 37.719)));
+        size *= 1.0 + 0.2 * pulse;
+        if (distance(center, highlight) < 1e-4) {
+            size *= 1.5;
+        }
+
+        vColor = instanceColor;
+        vPulse = pulse;
+        gl_Position = projectionMatrix * modelViewMatrix * instanceMatrix * vec4(position * size, 1.0);
+    }
+`;
+
+const markerFragmentShader = `
+    varying vec3 vColor;
+    varying float vPulse;
+
+    void main() {
+        // Brightness follows the pulse in place of the old per-city point lights
+        gl_FragColor = vec4(vColor * (0.8 + 0.4 * vPulse), 1.0);
+    }
+`;
+
+// Position of a longitude/latitude on the marker shell, in the globe's frame
+function markerPosition(longitude, latitude, target) {
+    const phi = (90 - latitude) * Math.PI / 180;
+    const theta = (longitude + 180) * Math.PI / 180;
+    return target.set(
+        -MARKER_RADIUS * Math.sin(phi) * Math.cos(theta),
+        MARKER_RADIUS * Math.cos(phi),
+        MARKER_RADIUS * Math.sin(phi) * Math.sin(theta)
+    );
+}
+
+function hitCell(longitude, latitude) {
+    const columns = 360 / HIT_CELL_DEGREES;
+    const row = Math.min(Math.floor((latitude + 90) / HIT_CELL_DEGREES), 180 / HIT_CELL_DEGREES - 1);
+    const column = ((Math.floor((longitude + 180) / HIT_CELL_DEGREES) % columns) + columns) % columns;
+    return row * columns + column;
+}
+
+// Build the marker layer for [{name, longitude, latitude, daylight}]
+function createMarkerLayer(cities) {
+    const geometry = new THREE.SphereGeometry(0.05, 8, 6);
+    const material = new THREE.ShaderMaterial({
+        uniforms: {
+            time: { value: 0 },
+            highlight: { value: NO_HIGHLIGHT.clone() }
+        },
+        vertexShader: markerVertexShader,
+        fragmentShader: markerFragmentShader
+    });
+    const mesh = new THREE.InstancedMesh(geometry, material, cities.length);
+    // Created up front rather than by the first setColorAt, so the shader's
+    // instanceColor attribute and needsUpdate below exist even with no cities
+    mesh.instanceColor = new THREE.InstancedBufferAttribute(new Float32Array(cities.length * 3), 3);
+    // The bounding sphere would be that of one marker; culling happens in the shader
+    mesh.frustumCulled = false;
+
+    const layer = {
+        mesh: mesh,
+        names: [],
+        index: new Map(),
+        positions: new Float32Array(cities.length * 3),
+        grid: new Map()
+    };
+
+    const matrix = new THREE.Matrix4();
+    const position = new THREE.Vector3();
+    cities.forEach((city, i) => {
+        markerPosition(city.longitude, city.latitude, position);
+        matrix.makeTranslation(position.x, position.y, position.z);
+        mesh.setMatrixAt(i, matrix);
+        mesh.setColorAt(i, city.daylight ? DAY_COLOR : NIGHT_COLOR);
+        position.toArray(layer.positions, i * 3);
+
+        layer.names.push(city.name);
+        layer.index.set(city.name, i);
+        const cell = hitCell(city.longitude, city.latitude);
+        if (!layer.grid.has(cell)) {
+            layer.grid.set(cell, []);
+        }
+        layer.grid.get(cell).push(i);
+    });
+    mesh.instanceMatrix.needsUpdate = true;
+    mesh.instanceColor.needsUpdate = true;
+    return layer;
+}
+
+function disposeMarkerLayer(layer) {
+    layer.mesh.parent && layer.mesh.parent.remove(layer.mesh);
+    layer.mesh.geometry.dispose();
+    layer.mesh.material.dispose();
+}
+
+// Switch one city between the day and night color
+function setMarkerDaylight(layer, name, daylight) {
+    const i = layer.index.get(name);
+    if (i !== undefined) {
+        layer.mesh.setColorAt(i, daylight ? DAY_COLOR : NIGHT_COLOR);
+        layer.mesh.instanceColor.needsUpdate = true;
+    }
+}
+
+// Advance the pulse; the only per-frame work the layer needs
+function animateMarkers(layer, seconds) {
+    layer.mesh.material.uniforms.time.value = seconds;
+}
+
+// Enlarge one city's marker, or none with null
+function highlightMarker(layer, name) {
+    const highlight = layer.mesh.material.uniforms.highlight.value;
+    const i = name === null ? undefined : layer.index.get(name);
+    if (i === undefined) {
+        highlight.copy(NO_HIGHLIGHT);
+    } else {
+        highlight.fromArray(layer.positions, i * 3);
+    }
+}
+
+// Name of the city whose marker the ray passes through, or null
+//
+// The ray is intersected with the marker shell analytically, the hit is turned
+// back into longitude/latitude on the (rotated) globe and only the markers in
+// the neighbouring grid cells are compared, whatever the number of cities.
+const hitSphere = new THREE.Sphere();
+const hitPoint = new THREE.Vector3();
+function markerAtRay(layer, ray, maxDistance = 0.08) {
+    const parent = layer.mesh.parent;
+    parent.getWorldPosition(hitSphere.center);
+    hitSphere.radius = MARKER_RADIUS;
+    if (ray.intersectSphere(hitSphere, hitPoint) === null) {
+        return null;
+    }
+    parent.worldToLocal(hitPoint);
+
+    const latitude = 90 - Math.acos(Math.max(-1, Math.min(1, hitPoint.y / MARKER_RADIUS))) * 180 / Math.PI;
+    const longitude = Math.atan2(hitPoint.z, -hitPoint.x) * 180 / Math.PI - 180;
+
+    // Neighbouring cells; rows near the poles span more columns for the same distance
+    const reach = maxDistance / MARKER_RADIUS * 180 / Math.PI;
+    const rows = 180 / HIT_CELL_DEGREES;
+    const columns = 360 / HIT_CELL_DEGREES;
+    const cosLatitude = Math.max(Math.cos(latitude * Math.PI / 180), 1e-3);
+    const columnReach = Math.min(Math.ceil(reach / cosLatitude / HIT_CELL_DEGREES) + 1, columns / 2);
+    const center = hitCell(longitude, latitude);
+    const centerRow = Math.floor(center / columns);
+    const centerColumn = center % columns;
+
+    let best = null;
+    let bestDistance = maxDistance * maxDistance;
+    for (let row = Math.max(centerRow - 1, 0); row <= Math.min(centerRow + 1, rows - 1); row++) {
+        for (let offset = -columnReach; offset <= columnReach; offset++) {
+            const column = ((centerColumn + offset) % columns + columns) % columns;
+            const bucket = layer.grid.get(row * columns + column);
+            if (!bucket) {
+                continue;
+            }
+            for (const i of bucket) {
+                const dx = layer.positions[i * 3] - hitPoint.x;
+                const dy = layer.positions[i * 3 + 1] - hitPoint.y;
+                const dz = layer.positions[i * 3 + 2] - hitPoint.z;
+                const distance = dx * dx + dy * dy + dz * dz;
+                if (distance < bestDistance) {
+                    bestDistance = distance;
+                    best = layer.names[i];
+                }
+            }
+        }
+    }
+    return best;
+}
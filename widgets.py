@@ -0,0 +1,238 @@
+import math
+
+
+def _ring_point(cx, cy, length, angle):
+    """Return the (x, y) point `length` away from the center at `angle` radians"""
+    return cx + length * math.cos(angle), cy - length * math.sin(angle)
+
+
+class ClockCard:
+    """Widgets of one city's clock in the clock row"""
+
+    __slots__ = ("city_id", "canvas", "face", "time_label", "timezone")
+
+    def __init__(self, city_id, canvas, face, time_label, timezone):
+        self.city_id = city_id
+        self.canvas = canvas
+        self.face = face
+        self.time_label = time_label
+        self.timezone = timezone
+
+
+class GlobeMarker:
+    """Canvas items of one city on the globe and the terms to place them"""
+
+    __slots__ = ("dot", "label", "sin_lon", "cos_lon", "x_scale", "y", "visible")
+
+    def __init__(self, dot, label, sin_lon, cos_lon, x_scale, y):
+        self.dot = dot
+        self.label = label
+        self.sin_lon = sin_lon
+        self.cos_lon = cos_lon
+        self.x_scale = x_scale
+        self.y = y
+        self.visible = False
+
+
+class ClockFace:
+    """Analog clock drawn once on a canvas and updated in place
+
+    The dial, hour markers and center dot are static canvas items created when
+    the face is built. Only the three hands are kept by item ID and moved with
+    canvas.coords, and only when the displayed time actually changes.
+    """
+
+    def __init__(self, canvas, accent, highlight, text, secondary, size=100):
+        self.canvas = canvas
+        self.cx = self.cy = size / 2
+        self.radius = size / 2 - 5
+        self.displayed = None
+        self.hand_positions = (None, None, None)
+
+        cx, cy, radius = self.cx, self.cy, self.radius
+
+        # Hand endpoints for every position they can take
+        self.hour_points = [
+            _ring_point(cx, cy, 25, math.radians((i / 60) * 30)) for i in range(720)
+        ]
+        self.minute_points = [
+            _ring_point(cx, cy, 35, math.radians(i * 6)) for i in range(60)
+        ]
+        self.second_points = [
+            _ring_point(cx, cy, 40, math.radians(i * 6)) for i in range(60)
+        ]
+
+        # Draw outer circle
+        canvas.create_oval(
+            cx - radius, cy - radius,
+            cx + radius, cy + radius,
+            outline=accent,
+            width=2
+        )
+
+        # Draw inner circle
+        canvas.create_oval(
+            cx - radius + 10, cy - radius + 10,
+            cx + radius - 10, cy + radius - 10,
+            outline=highlight,
+            width=1
+        )
+
+        # Draw hour markers
+        for i in range(12):
+            angle = math.radians(i * 30)
+            x1, y1 = _ring_point(cx, cy, radius - 5, angle)
+            x2, y2 = _ring_point(cx, cy, radius - 15, angle)
+            if i % 3 == 0:
+                canvas.create_line(x1, y1, x2, y2, fill=secondary, width=2)
+            else:
+                canvas.create_line(x1, y1, x2, y2, fill=text, width=1)
+
+        # Hands start collapsed on the center until the first set_time
+        self.hour_hand = canvas.create_line(cx, cy, cx, cy, fill=highlight, width=3)
+        self.minute_hand = canvas.create_line(cx, cy, cx, cy, fill=text, width=2)
+        self.second_hand = canvas.create_line(cx, cy, cx, cy, fill=accent, width=1)
+
+        # Draw center dot above the hands
+        canvas.create_oval(cx - 3, cy - 3, cx + 3, cy + 3, fill=secondary)
+
+    def set_time(self, hour, minute, second):
+        """Move the hands to the given time, returns False if nothing changed"""
+        if self.displayed == (hour, minute, second):
+            return False
+
+        canvas = self.canvas
+        cx, cy = self.cx, self.cy
+        hour_index = (hour % 12) * 60 + minute
+        old_hour_index, old_minute, old_second = self.hand_positions
+
+        if hour_index != old_hour_index:
+            canvas.coords(self.hour_hand, cx, cy, *self.hour_points[hour_index])
+        if minute != old_minute:
+            canvas.coords(self.minute_hand, cx, cy, *self.minute_points[minute])
+        if second != old_second:
+            canvas.coords(self.second_hand, cx, cy, *self.second_points[second])
+
+        self.hand_positions = (hour_index, minute, second)
+        self.displayed = (hour, minute, second)
+        return True
+
+
+class GlobeView:
+    """Rotating wireframe globe with persistent canvas items
+
+    Rotation advances in fixed steps (0.5 degrees, 720 frames per turn), so the
+    sines and cosines for every frame are tabulated once. Each frame only moves
+    the existing meridian, marker and label items and toggles markers that
+    cross the limb; nothing is deleted or recreated.
+    """
+
+    STEPS_PER_DEGREE = 2
+    STEPS = 360 * STEPS_PER_DEGREE
+
+    def __init__(self, canvas, cities, city_ids, accent, highlight, text, secondary,
+                 globe_fill="#1E293B", size=300):
+        self.canvas = canvas
+        self.cx = self.cy = size / 2
+        self.radius = size / 3
+        self.step = None
+
+        cx, cy, radius = self.cx, self.cy, self.radius
+
+        angles = [math.radians(i / self.STEPS_PER_DEGREE) for i in range(self.STEPS)]
+        self.cos_table = [math.cos(angle) for angle in angles]
+        self.sin_table = [math.sin(angle) for angle in angles]
+
+        # Draw the globe background
+        canvas.create_oval(
+            cx - radius,
+            cy - radius,
+            cx + radius,
+            cy + radius,
+            fill=globe_fill,
+            outline=accent,
+            width=2
+        )
+
+        # Meridian lines, moved every frame
+        self.meridians = [
+            canvas.create_line(cx, cy, cx, cy, fill=highlight, width=1, dash=(4, 4))
+            for _ in range(12)
+        ]
+
+        # Draw equator
+        equator_radius = radius * 0.8
+        canvas.create_oval(
+            cx - equator_radius,
+            cy - equator_radius * 0.3,
+            cx + equator_radius,
+            cy + equator_radius * 0.3,
+            outline=accent,
+            width=1,
+            dash=(4, 2)
+        )
+
+        # Markers for the given ids of a cities.CityRegistry; longitude terms
+        # are kept for the angle-addition formula
+        self.cities = []
+        for city_id in city_ids:
+            position = cities.coords(city_id)
+            if position is None:
+                continue
+            lon, lat = position
+            lon_rad = math.radians(lon)
+            lat_rad = math.radians(lat)
+            dot = canvas.create_oval(0, 0, 0, 0, fill=secondary, outline=text, state="hidden")
+            label = canvas.create_text(
+                0, 0,
+                text=cities.name(city_id),
+                fill=text,
+                font=("Segoe UI", 8, "bold"),
+                state="hidden"
+            )
+            self.cities.append(GlobeMarker(
+                dot,
+                label,
+                math.sin(lon_rad),
+                math.cos(lon_rad),
+                radius * 0.8 * math.cos(lat_rad),
+                cy - radius * 0.8 * math.sin(lat_rad)
+            ))
+
+    def draw(self, rotation):
+        """Show the globe turned by `rotation` degrees"""
+        step = int(round(rotation * self.STEPS_PER_DEGREE)) % self.STEPS
+        if step == self.step:
+            return
+        self.step = step
+
+        canvas = self.canvas
+        cx, cy, radius = self.cx, self.cy, self.radius
+        cos_rot = self.cos_table[step]
+        sin_rot = self.sin_table[step]
+
+        # Meridians sit every 30 degrees, i.e. every 60 table steps
+        for i, line in enumerate(self.meridians):
+            index = (step + i * 30 * self.STEPS_PER_DEGREE) % self.STEPS
+            dx = radius * self.cos_table[index]
+            dy = radius * self.sin_table[index]
+            canvas.coords(line, cx + dx, cy - dy, cx - dx, cy + dy)
+
+        for city in self.cities:
+            # sin/cos of (lon + rotation) from the tabulated rotation terms
+            sin_adj = city.sin_lon * cos_rot + city.cos_lon * sin_rot
+            cos_adj = city.cos_lon * cos_rot - city.sin_lon * sin_rot
+
+            # Only show cities on the "visible" side of the globe
+            visible = cos_adj > -0.1
+            if visible != city.visible:
+                state = "normal" if visible else "hidden"
+                canvas.itemconfigure(city.dot, state=state)
+                canvas.itemconfigure(city.label, state=state)
+                city.visible = visible
+
+            if visible:
+                x = cx + city.x_scale * sin_adj
+                y = city.y
+                canvas.coords(city.dot, x - 4, y - 4, x + 4, y + 4)
+                canvas.coords(city.label, x, y - 12)
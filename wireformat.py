@@ -0,0 +1,86 @@
+"""Compact encodings of the /api/time-data payload
+
+    json      the default: {city: {"time": ..., "hour": ..., ...}}, the field
+              names repeated for every city
+    columns   the same fields as one JSON array each, cities in /api/cities
+              order: {"t": epoch second, "cities": [...], "time": [...], ...}
+    binary    a fixed little-endian layout for a DataView, no parsing:
+                  magic b"CETD", city count (uint32), epoch second (int64),
+                  city list id (8 bytes), then one int32 UTC offset in
+                  seconds per city in /api/cities order
+              Time, date and daylight all follow from the epoch second and
+              the offset. The city list id is the start of the /api/cities
+              ETag, so a client can tell that its city list still matches.
+
+Clients pick a format with ?format= or the Accept header; json stays the
+default.
+"""
+import hashlib
+import json
+import struct
+import sys
+from array import array
+
+# magic, city count, epoch second, city list id
+BINARY_HEADER = struct.Struct("<4sIq8s")
+BINARY_MAGIC = b"CETD"
+
+# Format names and the media types they are served as, and matched by in Accept
+FORMATS = {
+    "json": "application/json",
+    "columns": "application/vnd.chronoeye.columns+json",
+    "binary": "application/octet-stream",
+}
+
+
+def negotiate(requested, accept):
+    """Return the format for a ?format= value (or None) and an Accept header
+
+    An unknown ?format= gives None. Without one, the first compact media type
+    listed in Accept wins, else json.
+    """
+    if requested:
+        return requested if requested in FORMATS else None
+    for entry in (accept or "").split(","):
+        media_type, _, params = entry.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        for name, format_type in FORMATS.items():
+            if media_type.strip() == format_type and name != "json":
+                return name
+    return "json"
+
+
+def city_list_id(city_info_body):
+    """8-byte id of a /api/cities body, the first half of its ETag's SHA-1"""
+    return hashlib.sha1(city_info_body).digest()[:8]
+
+
+def encode_columns(second, time_data):
+    """Columnar JSON body for a get_time_data() result"""
+    entries = list(time_data.values())
+    columns = {"t": second, "cities": list(time_data)}
+    for field in (entries[0] if entries else ()):
+        columns[field] = [entry[field] for entry in entries]
+    return json.dumps(columns, separators=(",", ":")).encode()
+
+
+def encode_binary(second, offsets, list_id):
+    """Binary body for every city's UTC offset (an array('i') or iterable of ints)"""
+    offsets = offsets if isinstance(offsets, array) and offsets.typecode == "i" else array("i", offsets)
+    if sys.byteorder == "big":
+        offsets = array("i", offsets)
+        offsets.byteswap()
+    return BINARY_HEADER.pack(BINARY_MAGIC, len(offsets), second, list_id) + offsets.tobytes()
+
+
+def decode_binary(body):
+    """Return (epoch second, city list id, array('i') of offsets) of a binary body"""
+    magic, count, second, list_id = BINARY_HEADER.unpack_from(body)
+    if magic != BINARY_MAGIC:
+        raise ValueError("not a binary time-data body")
+    offsets = array("i")
+    offsets.frombytes(body[BINARY_HEADER.size:BINARY_HEADER.size + 4 * count])
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    return second, list_id, offsets